@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It compares validating normalized strings against a language context with the original validator.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# Usage: python benchmarks/bench_languages.py [-n NUMBER] [-q QUESTIONS] [-l LANGUAGES]
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import shutil
+import tempfile
+import timeit
+
+import helper
+from helper import LanguageContext, check_arg_type, deserialize_configuration_set, is_empty_string, is_language_code
+from task_presenter import are_questions, get_available_languages
+from generate_project import generate_project
+
+
+def legacy_is_normalized_string(normalized_string, language_codes=None):
+    """The normalized string validator as it was before language contexts, i.e. rebuilding the
+    list of missing translations and validating every language code on each call.
+    """
+    check_arg_type(legacy_is_normalized_string, "normalized_string", normalized_string, dict)
+    check_arg_type(legacy_is_normalized_string, "language_codes", language_codes, (list, type(None)))
+    try:
+        missing_translations = None if language_codes is None else [l for l in language_codes if l not in normalized_string]
+        if missing_translations:
+            print "The normalized string is missing the following translations: '{}'.".format("', '".join(missing_translations))
+            return False
+
+        return normalized_string and all(is_language_code(k) and not is_empty_string(v) for k, v in normalized_string.iteritems())
+    except TypeError:
+        return False
+
+
+def validate_legacy(questions, languages):
+    """Validates the specified questions with the original normalized string validator.
+    """
+    is_normalized_string = helper.is_normalized_string
+    helper.is_normalized_string = legacy_is_normalized_string
+    try:
+        return list(are_questions(questions, languages))
+    finally:
+        helper.is_normalized_string = is_normalized_string
+
+
+def validate(questions, languages):
+    """Validates the specified questions against a language context.
+    """
+    return list(are_questions(questions, LanguageContext(languages)))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Compare language contexts with the original normalized string validator.")
+    parser.add_argument("-n", "--number", type=int, default=5, help="The number of runs per measurement.")
+    parser.add_argument("-q", "--questions", type=int, default=500, help="The number of questions.")
+    parser.add_argument("-l", "--languages", type=int, default=40, help="The number of available languages.")
+    arguments = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        generate_project(directory, arguments.questions, arguments.languages, 0, 0.0)
+        task_presenter = deserialize_configuration_set(directory)["task_presenter"]
+    finally:
+        shutil.rmtree(directory)
+
+    questions = task_presenter["questionnaire"]["questions"]
+    languages = get_available_languages(task_presenter)
+    assert validate_legacy(questions, languages) == validate(questions, languages) == []
+
+    timings = []
+    for f in (validate_legacy, validate):
+        best = min(timeit.repeat(lambda: f(questions, languages), number=arguments.number, repeat=3))
+        timings.append(best / arguments.number * 1e3)
+    print "{:<12}{:>12}{:>16}{:>16}{:>10}".format("questions", "languages", "legacy (ms)", "context (ms)", "speedup")
+    print "{:<12}{:>12}{:>16.2f}{:>16.2f}{:>9.2f}x".format(arguments.questions, arguments.languages, timings[0], timings[1], timings[0] / timings[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It measures how the validator scales with the size of the projects it validates.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# Usage: python benchmarks/bench_macro.py [-n NUMBER] [--sizes SIZES] [-l LANGUAGES] [-s SUBJECTS]
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import shutil
+import subprocess
+import tempfile
+import timeit
+
+from core import is_configuration_set
+from helper import deserialize_configuration_set
+from generate_project import generate_project
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src", "__main__.py")
+"""The validator's entry point, which is run to measure the command-line interface end to end."""
+
+
+def measure(f, number):
+    """Returns the best time, in seconds, that a call to the specified function takes.
+    """
+    return min(timeit.repeat(f, number=number, repeat=3)) / number
+
+
+def run_cli(path):
+    """Validates the project located at the specified path with the command-line interface.
+    """
+    with open(os.devnull, "w") as devnull:
+        if subprocess.call([sys.executable, MAIN, "--no-cache", path], stdout=devnull) != 0:
+            raise RuntimeError("The project located at '{}' is invalid.".format(path))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Measure how the validator scales with project size.")
+    parser.add_argument("-n", "--number", type=int, default=5, help="The number of runs per measurement.")
+    parser.add_argument("--sizes", default="10,100,1000", help="A comma-separated list of questionnaire sizes.")
+    parser.add_argument("-l", "--languages", type=int, default=5, help="The number of available languages.")
+    parser.add_argument("-s", "--subjects", type=int, default=10, help="The number of tutorial subjects.")
+    parser.add_argument("--help-ratio", type=float, default=0.5, help="The proportion of questions that have a help page.")
+    arguments = parser.parse_args()
+
+    header = "{:>10}{:>10}{:>14}{:>16}{:>14}"
+    row = "{:>10}{:>10}{:>14.2f}{:>16.0f}{:>14.2f}"
+    print header.format("questions", "stage", "time (ms)", "questions/s", "projects/s")
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in [int(s) for s in arguments.sizes.split(",")]:
+            path = os.path.join(directory, "project-{}".format(size))
+            generate_project(path, size, arguments.languages, arguments.subjects, arguments.help_ratio)
+            configuration_set = deserialize_configuration_set(path)
+            valid, message = is_configuration_set(configuration_set)
+            if not valid:
+                raise RuntimeError("The generated project is invalid: {}".format(message))
+
+            stages = [
+                ("load", lambda: deserialize_configuration_set(path)),
+                ("validate", lambda: is_configuration_set(configuration_set)),
+                ("cli", lambda: run_cli(path)),
+            ]
+            for stage, f in stages:
+                seconds = measure(f, arguments.number)
+                print row.format(size, stage, seconds * 1e3, size / seconds, 1.0 / seconds)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It measures the per-call cost of the precompiled lexical matchers.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# Usage: python benchmarks/bench_matchers.py [-n NUMBER]
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import re
+import matchers
+
+
+def legacy_is_key(key):
+    """The key matcher as it was before patterns were precompiled and anchored.
+    """
+    matches = re.match("[a-zA-Z0-9-_]+", key)
+    return matches and matches.group() == key
+
+
+def legacy_is_iso_3166_1_alpha_2_code(code):
+    """The ISO 3166-1 alpha-2 code matcher as it was before its pattern was precompiled.
+    """
+    matches = re.match("[A-Z]{2}", code)
+    return matches and matches.group() == code
+
+
+def legacy_is_iso_15924_code(code):
+    """The ISO 15924 code matcher as it was before its pattern was precompiled.
+    """
+    matches = re.match("[A-Z]{1}[a-z]{3}", code)
+    return matches and matches.group() == code
+
+
+def generate(number, alphabet, length):
+    """Returns a list of pseudo-random strings drawn from the specified alphabet.
+    """
+    import random
+    random.seed(number)
+    choice = random.choice
+    return ["".join(choice(alphabet) for _ in xrange(length)) for _ in xrange(number)]
+
+
+def measure(f, values):
+    """Returns the time, in seconds, that the specified function takes to check every value.
+    """
+    from timeit import default_timer
+    start = default_timer()
+    for value in values:
+        f(value)
+    return default_timer() - start
+
+
+def main():
+    import argparse, string
+    parser = argparse.ArgumentParser(description="Measure the per-call cost of the lexical matchers.")
+    parser.add_argument("-n", "--number", type=int, default=1000000, help="The number of strings to match.")
+    arguments = parser.parse_args()
+
+    cases = [
+        ("key", legacy_is_key, matchers.is_key, generate(arguments.number, string.ascii_letters + string.digits + "-_", 12)),
+        ("iso-3166-1-alpha-2", legacy_is_iso_3166_1_alpha_2_code, matchers.is_iso_3166_1_alpha_2_code, generate(arguments.number, "ABCDEFGHIJKLMNOPQRSTUVWXYZab", 2)),
+        ("iso-15924", legacy_is_iso_15924_code, matchers.is_iso_15924_code, generate(arguments.number, "ABCDEabcde", 4)),
+    ]
+    print "{:<20}{:>16}{:>16}{:>10}".format("matcher", "legacy (ns)", "compiled (ns)", "speedup")
+    for name, legacy, compiled, values in cases:
+        legacy_time = measure(legacy, values) / len(values) * 1e9
+        compiled_time = measure(compiled, values) / len(values) * 1e9
+        print "{:<20}{:>16.0f}{:>16.0f}{:>9.2f}x".format(name, legacy_time, compiled_time, legacy_time / compiled_time)
+
+
+if __name__ == "__main__":
+    main()
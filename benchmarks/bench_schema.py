@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It compares the compiled configuration schemas with the original validators.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# Usage: python benchmarks/bench_schema.py [-n NUMBER]
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from helper import is_configuration
+from question import is_question, is_question_key, is_question_title, is_question_help, is_question_input, is_question_branch
+from tutorial import is_tutorial_subject, are_subject_assertions
+
+
+def legacy_is_question(question, available_languages=None):
+    """The question validator as it was before schemas were compiled, i.e. rebuilding its
+    field validators on every call.
+    """
+    return is_configuration(
+        question,
+        required_fields=frozenset(["key", "title", "input"]),
+        field_validators={
+            "key": is_question_key,
+            "title": lambda t: is_question_title(t, available_languages),
+            "hint": lambda h: is_question_help(h, available_languages),
+            "help": lambda h: is_question_help(h, available_languages),
+            "input": lambda i: is_question_input(i, available_languages),
+            "branch": is_question_branch,
+        },
+        missing_field_message="The question configuration is missing the following field(s): '{}'.",
+        unexpected_field_message="The question configuration key '{}' is not recognized."
+    )
+
+
+def legacy_is_tutorial_subject(tutorial_subject, languages=None):
+    """The tutorial subject validator as it was before schemas were compiled.
+    """
+    validators = is_tutorial_subject.SCHEMA.validators
+    return is_configuration(
+        tutorial_subject,
+        required_fields=frozenset(["source", "page", "assertions"]),
+        field_validators={
+            "source": validators["source"][0],
+            "page": validators["page"][0],
+            "attribution": validators["attribution"][0],
+            "assertions": lambda a: are_subject_assertions(a, languages),
+        },
+        missing_field_message="The tutorial's subject configuration is missing the following field(s): '{}'.",
+        unexpected_field_message="The tutorial's subject configuration key '{}' is not recognized."
+    )
+
+
+LANGUAGES = ["en", "fr"]
+
+QUESTION = {
+    "key": "isThereWater",
+    "title": {"en": "Is there water in the photo?", "fr": "Y a-t-il de l'eau sur la photo?"},
+    "hint": "Look closely.",
+    "input": {"type": "polar"},
+    "branch": "whereIsTheWater",
+}
+
+TUTORIAL_SUBJECT = {
+    "source": "http://www.example.com/photo.jpg",
+    "page": "http://www.example.com/",
+    "attribution": "Example",
+    "assertions": {
+        "isThereWater": {"expects": "yes"},
+    },
+}
+
+INVALID_QUESTION = {
+    "key": "isThereWater",
+    "input": {"type": "polar"},
+}
+
+
+def main():
+    import argparse, timeit
+    parser = argparse.ArgumentParser(description="Compare compiled schemas with the original validators.")
+    parser.add_argument("-n", "--number", type=int, default=100000, help="The number of calls per measurement.")
+    arguments = parser.parse_args()
+
+    cases = [
+        ("question", legacy_is_question, is_question, QUESTION, LANGUAGES),
+        ("invalid question", legacy_is_question, is_question, INVALID_QUESTION, LANGUAGES),
+        ("tutorial subject", legacy_is_tutorial_subject, is_tutorial_subject, TUTORIAL_SUBJECT, LANGUAGES),
+    ]
+    print "{:<20}{:>16}{:>16}{:>10}".format("case", "legacy (us)", "schema (us)", "speedup")
+    for name, legacy, compiled, configuration, languages in cases:
+        assert legacy(configuration, languages) == compiled(configuration, languages), name
+        timings = []
+        for f in (legacy, compiled):
+            best = min(timeit.repeat(lambda: f(configuration, languages), number=arguments.number, repeat=3))
+            timings.append(best / arguments.number * 1e6)
+        print "{:<20}{:>16.2f}{:>16.2f}{:>9.2f}x".format(name, timings[0], timings[1], timings[0] / timings[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It compares the cold start of the zipapp with that of the installed package.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# Usage: python benchmarks/bench_startup.py [-n NUMBER]
+import os, sys
+import shutil
+import subprocess
+import tempfile
+from timeit import default_timer
+
+from generate_project import generate_project
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+"""The repository's root directory."""
+
+ENTRY_POINT = "from geotagx_validator.__main__ import main; main()"
+"""The code run by the installed package's console script."""
+
+
+def install(directory, compile):
+    """Copies the validator package to the specified directory, as if it were installed there,
+    and optionally precompiles its bytecode.
+    """
+    import compileall
+    package = os.path.join(directory, "geotagx_validator")
+    shutil.copytree(os.path.join(ROOT, "src"), package, ignore=shutil.ignore_patterns("*.pyc"))
+    if compile:
+        compileall.compile_dir(package, quiet=True)
+
+
+def build_zipapp(filename):
+    """Builds the zipapp with the setup script's zipapp command.
+    """
+    with open(os.devnull, "w") as devnull:
+        subprocess.check_call([sys.executable, "setup.py", "zipapp", "--output", filename], cwd=ROOT, stdout=devnull)
+
+
+def measure(command, number, environment=None):
+    """Returns the best time, in seconds, that the specified command takes to complete.
+    """
+    times = []
+    with open(os.devnull, "w") as devnull:
+        for _ in xrange(number):
+            start = default_timer()
+            subprocess.check_call(command, stdout=devnull, stderr=devnull, env=environment)
+            times.append(default_timer() - start)
+    return min(times)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Compare the cold start of the zipapp with that of the installed package.")
+    parser.add_argument("-n", "--number", type=int, default=20, help="The number of runs per measurement.")
+    arguments = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        project = os.path.join(directory, "project")
+        generate_project(project, questions=20, languages=2, subjects=5, help_ratio=0.5)
+
+        source = os.path.join(directory, "source")
+        compiled = os.path.join(directory, "compiled")
+        install(source, False)
+        install(compiled, True)
+        zipapp = os.path.join(directory, "geotagx-validator.pyz")
+        build_zipapp(zipapp)
+
+        # The uncompiled package is run without writing bytecode, as in a read-only container.
+        environment = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+        targets = [
+            ("package (no bytecode)", [sys.executable, "-c", ENTRY_POINT], dict(environment, PYTHONPATH=source)),
+            ("package (bytecode)", [sys.executable, "-c", ENTRY_POINT], dict(environment, PYTHONPATH=compiled)),
+            ("zipapp", [sys.executable, zipapp], environment),
+        ]
+        commands = [
+            ("--help", ["--help"]),
+            ("--version", ["--version"]),
+            ("validate", ["--no-cache", project]),
+        ]
+
+        interpreter = measure([sys.executable, "-c", "pass"], arguments.number)
+        print "Interpreter startup: {:.2f} ms".format(interpreter * 1e3)
+        print ("{:<24}" + "{:>14}" * len(commands)).format("target", *[name for name, _ in commands])
+        for name, command, environment in targets:
+            times = [measure(command + options, arguments.number, environment) for _, options in commands]
+            print ("{:<24}" + "{:>11.2f} ms" * len(times)).format(name, *[t * 1e3 for t in times])
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It generates synthetic GeoTag-X projects of arbitrary size, for benchmarking purposes.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# Usage: python benchmarks/generate_project.py PATH [-q QUESTIONS] [-l LANGUAGES] [-s SUBJECTS]
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import json
+import random
+import string
+from itertools import product
+
+INPUT_TYPES = ["polar", "multiple-option", "text", "geotagging"]
+"""The input types used by generated questions. The remaining types are not implemented by the validator."""
+
+WORDS = "the a photo image water flood road building damage area river field crop smoke fire people shelter is there any visible".split()
+
+
+def get_language_codes(number):
+    """Returns a list of the specified number of distinct language codes, starting with English.
+    """
+    codes = ["en"] + ["".join(p) for p in product(string.ascii_lowercase, repeat=2) if p != ("e", "n")]
+    return codes[:number]
+
+
+def sentence(rng, words=8):
+    """Returns a pseudo-random sentence with the specified number of words.
+    """
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def normalized_string(rng, languages, words=8):
+    """Returns a pseudo-random normalized string with a translation for each language.
+    """
+    text = sentence(rng, words)
+    return dict((l, u"[{}] {}".format(l, text)) for l in languages)
+
+
+def generate_question(rng, index, count, languages):
+    """Returns the question at the specified index of a questionnaire with count questions.
+    """
+    key = "question{}".format(index)
+    next_key = "question{}".format(index + 1) if index + 1 < count else "_end"
+    input_type = INPUT_TYPES[index % len(INPUT_TYPES)]
+    question = {
+        "key": key,
+        "title": normalized_string(rng, languages),
+        "hint": normalized_string(rng, languages, 16),
+        "input": {"type": input_type},
+        "branch": next_key,
+    }
+    if input_type == "multiple-option":
+        values = ["option{}".format(i) for i in range(rng.randint(2, 6))]
+        question["input"].update({
+            "enable-multiple-choices": rng.random() < 0.5,
+            "enable-other-option": rng.random() < 0.5,
+            "options": [{"label": normalized_string(rng, languages, 3), "value": v} for v in values],
+        })
+        question["branch"] = dict((v, next_key) for v in values)
+    elif input_type == "text":
+        question["input"].update({
+            "placeholder": normalized_string(rng, languages, 4),
+            "enable-long-text": rng.random() < 0.5,
+            "min-length": 1,
+            "max-length": 256,
+        })
+    elif input_type == "geotagging":
+        question["input"]["location"] = "Geneva, Switzerland"
+
+    return question
+
+
+def generate_help(rng, paragraphs=10):
+    """Returns a pseudo-random help page.
+    """
+    body = "\n".join("    <p>\n        {}\n    </p>\n    <!-- Paragraph {} -->".format(sentence(rng, 40), i) for i in range(paragraphs))
+    return "<div class=\"help\">\n    <h1>{}</h1>\n{}\n</div>\n".format(sentence(rng, 4), body)
+
+
+def generate_project(path, questions=10, languages=2, subjects=5, help_ratio=0.5, seed=0):
+    """Writes a valid GeoTag-X project to the specified directory.
+
+    Args:
+        path (str): The directory where the project is written. It is created if it does not exist.
+        questions (int): The number of questions in the project's questionnaire.
+        languages (int): The number of available languages, i.e. of translations in each normalized string.
+        subjects (int): The number of tutorial subjects. If set to 0, the project has no tutorial.
+        help_ratio (float): The proportion of questions that have a help page.
+        seed (int): The seed of the pseudo-random number generator, so that projects are reproducible.
+    """
+    rng = random.Random(seed)
+    codes = get_language_codes(languages)
+    help_directory = os.path.join(path, "help")
+    if not os.path.isdir(help_directory):
+        os.makedirs(help_directory)
+
+    write_json(os.path.join(path, "project.json"), {
+        "name": "Synthetic project",
+        "short_name": "synthetic-project",
+        "description": sentence(rng, 20),
+        "repository": "https://github.com/geotagx/geotagx-project-synthetic.git",
+    })
+
+    configurations = [generate_question(rng, i, questions, codes) for i in range(questions)]
+    write_json(os.path.join(path, "task_presenter.json"), {
+        "language": {"default": codes[0], "available": codes},
+        "subject": {"type": "image"},
+        "questionnaire": {"questions": configurations},
+    })
+
+    for question in configurations:
+        if rng.random() < help_ratio:
+            with open(os.path.join(help_directory, "{}.html".format(question["key"])), "w") as file:
+                file.write(generate_help(rng))
+
+    if subjects > 0:
+        polar_keys = [q["key"] for q in configurations if q["input"]["type"] == "polar"]
+        write_json(os.path.join(path, "tutorial.json"), {
+            "enable-random-order": True,
+            "default-message": {
+                "on-wrong-answer": normalized_string(rng, codes),
+                "on-correct-answer": normalized_string(rng, codes),
+            },
+            "subjects": [{
+                "source": "http://www.example.com/images/{}.jpg".format(i),
+                "page": "http://www.example.com/pages/{}".format(i),
+                "attribution": "Example",
+                "assertions": dict((k, {
+                    "expects": rng.choice(["yes", "no"]),
+                    "messages": {"on-wrong-answer": normalized_string(rng, codes)},
+                }) for k in rng.sample(polar_keys, min(3, len(polar_keys)))),
+            } for i in range(subjects)],
+        })
+
+
+def write_json(filename, data):
+    """Writes the specified data to a JSON file.
+    """
+    with open(filename, "w") as file:
+        json.dump(data, file, indent=4, sort_keys=True)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate a synthetic GeoTag-X project.")
+    parser.add_argument("path", metavar="PATH", help="The directory where the project is written.")
+    parser.add_argument("-q", "--questions", type=int, default=100, help="The number of questions.")
+    parser.add_argument("-l", "--languages", type=int, default=2, help="The number of available languages.")
+    parser.add_argument("-s", "--subjects", type=int, default=5, help="The number of tutorial subjects.")
+    parser.add_argument("--help-ratio", type=float, default=0.5, help="The proportion of questions that have a help page.")
+    parser.add_argument("--seed", type=int, default=0, help="The seed of the pseudo-random number generator.")
+    arguments = parser.parse_args()
+    generate_project(arguments.path, arguments.questions, arguments.languages, arguments.subjects, arguments.help_ratio, arguments.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@
 # This setup script is inspired by code from the Pip setup.py found
 # here: https://github.com/pypa/pip/blob/develop/setup.py
 import os, re, codecs
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Command
 
 cwd = os.path.abspath(os.path.dirname(__file__))
 
@@ -22,6 +22,86 @@ def find_version(*file_paths):
     raise RuntimeError("Unable to find version string.")
 
 
+class BuildZipapp(Command):
+    """Builds a self-contained executable zip archive of the validator, with precompiled
+    bytecode and its pure-Python dependencies. The bytecode is compiled by the interpreter
+    that runs this command, so the archive should be run by the same version of Python:
+    other versions ignore the bytecode and compile the sources instead.
+
+    Usage: python setup.py zipapp [--output FILE] [--python INTERPRETER]
+    """
+    description = "build a self-contained executable zip archive"
+    user_options = [
+        ("output=", "o", "the archive's location [default: dist/geotagx-validator.pyz]"),
+        ("python=", "p", "the interpreter that runs the archive [default: /usr/bin/env python2]"),
+    ]
+
+    MAIN = "from geotagx_validator.__main__ import main\nmain()\n"
+    """The archive's entry point."""
+
+    VENDORED = ["htmlmin"]
+    """The pure-Python dependencies that are included in the archive."""
+
+    def initialize_options(self):
+        self.output = None
+        self.python = None
+
+    def finalize_options(self):
+        self.output = self.output or os.path.join(cwd, "dist", "geotagx-validator.pyz")
+        self.python = self.python or "/usr/bin/env python2"
+
+    def run(self):
+        import shutil, tempfile, zipfile
+
+        directory = os.path.dirname(os.path.abspath(self.output))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        packages = [("geotagx_validator", os.path.join(cwd, "src"))]
+        for name in self.VENDORED:
+            module = __import__(name)
+            packages.append((name, os.path.dirname(os.path.abspath(module.__file__))))
+
+        build_directory = tempfile.mkdtemp()
+        try:
+            main = os.path.join(build_directory, "__main__.py")
+            with open(main, "w") as file:
+                file.write(self.MAIN)
+
+            archive = os.path.join(build_directory, "archive.zip")
+            with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as output:
+                self.__write_module(output, main, "__main__.py", build_directory)
+                for name, path in packages:
+                    for root, _, filenames in os.walk(path):
+                        for filename in sorted(filenames):
+                            if filename.endswith(".py"):
+                                filename = os.path.join(root, filename)
+                                arcname = os.path.join(name, os.path.relpath(filename, path))
+                                self.__write_module(output, filename, arcname, build_directory)
+
+            with open(self.output, "wb") as file:
+                file.write("#!{}\n".format(self.python))
+                with open(archive, "rb") as input:
+                    shutil.copyfileobj(input, file)
+            os.chmod(self.output, 0755)
+        finally:
+            shutil.rmtree(build_directory)
+
+        print "The validator has been written to '{}'.".format(self.output)
+
+    def __write_module(self, output, filename, arcname, build_directory):
+        """Writes the specified module and its bytecode to the archive. The bytecode is
+        compiled with the source's modification time, which is the time the archive records
+        for the source, so that zipimport considers it up to date.
+        """
+        import py_compile
+        bytecode = os.path.join(build_directory, "module.pyc")
+        py_compile.compile(filename, cfile=bytecode, dfile=arcname, doraise=True)
+        output.write(filename, arcname)
+        output.write(bytecode, arcname + "c")
+        os.remove(bytecode)
+
+
 setup(
     name="geotagx-validator",
     version=find_version("src", "__init__.py"),
@@ -51,5 +131,8 @@ setup(
         "console_scripts":[
             "geotagx-validator=geotagx_validator.__main__:main"
         ]
+    },
+    cmdclass={
+        "zipapp": BuildZipapp
     }
 )
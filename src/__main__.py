@@ -40,23 +40,29 @@ def run(arguments):
     Returns:
         int: 0 if validation was successful, 1 otherwise.
     """
-    from helper import sanitize_paths, deserialize_configuration_set, print_exception
-    from core import is_configuration_set
+    from helper import print_exception
 
     exit_code = 0
     try:
-        if not arguments.quiet:
-            _setup_logging(arguments.verbose)
-
-        for path in sanitize_paths(arguments.paths):
-            configuration_set = deserialize_configuration_set(path)
-            valid, message = is_configuration_set(configuration_set)
-            if not valid:
-                print message
-                exit_code = 1
-                break
+        _setup_logging(arguments.verbose, arguments.quiet)
+        if arguments.serve:
+            exit_code = _serve(arguments)
+        elif arguments.changed_since is None and not arguments.staged and not arguments.paths:
+            raise ValueError("At least one project path must be specified.")
+        else:
+            paths = arguments.paths
+            if arguments.changed_since is not None or arguments.staged:
+                from vcs import get_changed_projects
+                paths = get_changed_projects(paths or ["."], arguments.changed_since, arguments.staged)
+                if not paths:
+                    print "No project has changed."
+
+            from locator import ProjectLocator
+            paths = ProjectLocator(arguments.max_depth, arguments.exclude).locate(paths)
+            if arguments.watch:
+                exit_code = _watch(paths, arguments)
             else:
-                print "The project located at '{}' is valid.".format(path)
+                exit_code = _validate(paths, arguments)
     except Exception as e:
         print_exception(e, arguments.verbose)
         exit_code = 1
@@ -64,6 +70,445 @@ def run(arguments):
         return exit_code
 
 
+def _validate(paths, arguments):
+    """Validates the projects located at the specified paths and prints the results.
+
+    Args:
+        paths (list): A list of paths to GeoTag-X project directories.
+        arguments (argparse.Namespace): A set of command-line arguments.
+
+    Returns:
+        int: 0 if every project is valid, 1 otherwise.
+    """
+    exit_code = 0
+    statistics = {True: 0, False: 0}
+    profile = {}
+    memory_summary = {}
+    coverage_summary = {}
+    for path, valid, messages, cached, profiles in _validate_paths(paths, arguments):
+        _print_result(path, valid, messages)
+        if not valid:
+            exit_code = 1
+        if cached is not None:
+            statistics[cached] += 1
+        if profiles is not None:
+            _print_profiles(path, profiles, profile, memory_summary, coverage_summary)
+
+    if len(paths) > 1:
+        if arguments.profile:
+            from profiler import format_statistics
+            print format_statistics(profile, "Profile of the batch:")
+        if arguments.memory_profile:
+            from profiler import format_memory_summary
+            print format_memory_summary(memory_summary, "Memory profile of the batch:")
+        if arguments.coverage:
+            from translation import format_translation_summary
+            print _encode(format_translation_summary(coverage_summary, "Translation coverage of the batch:"))
+
+    if _uses_cache(arguments):
+        removed = _get_cache(arguments).cache.prune()
+        if arguments.cache_stats:
+            message = "Cache statistics: {} hit(s), {} miss(es), {} entries evicted."
+            print message.format(statistics[True], statistics[False], removed)
+
+    return exit_code
+
+
+def _print_profiles(path, profiles, profile, memory_summary, coverage_summary):
+    """Prints the profiles of a project, as returned by _validate_path, and adds them to the
+    profile, memory summary and translation coverage summary of the batch.
+    """
+    from profiler import format_statistics, merge_statistics, format_memory_statistics, merge_memory_statistics
+
+    statistics = profiles.get("time")
+    if statistics is not None:
+        print format_statistics(statistics, "Profile of the project located at '{}':".format(path))
+        merge_statistics(profile, statistics)
+
+    statistics = profiles.get("memory")
+    if statistics is not None:
+        print format_memory_statistics(statistics, "Memory profile of the project located at '{}':".format(path))
+        merge_memory_statistics(memory_summary, statistics)
+
+    matrix = profiles.get("coverage")
+    if matrix is not None:
+        from translation import format_translation_matrix, merge_translation_statistics
+        print _encode(format_translation_matrix(matrix, "Translation coverage of the project located at '{}':".format(path)))
+        merge_translation_statistics(coverage_summary, matrix)
+
+
+def _validate_paths(paths, arguments):
+    """Validates the projects located at the specified paths.
+
+    Results are always produced in the same order as the paths, regardless of the
+    number of jobs used to validate them.
+
+    Args:
+        paths (list): A list of paths to GeoTag-X project directories.
+        arguments (argparse.Namespace): A set of command-line arguments. The number of
+            worker processes is given by arguments.jobs: if set to 1, the projects are
+            validated in the current process. If arguments.fail_fast is set to True,
+            validation stops after the first invalid project and any outstanding work
+            is cancelled.
+
+    Returns:
+        generator: A generator of results as returned by _validate_path.
+    """
+    from functools import partial
+
+    # The validation daemon neither profiles, streams nor reports translation coverage.
+    remote = not arguments.profile and not arguments.memory_profile and not arguments.stream and not arguments.coverage
+    if arguments.connect and remote:
+        client = _connect(arguments)
+        if client is not None:
+            try:
+                results = (_validate_path_remotely(client, p, arguments) for p in paths)
+                for result in _until_failure(results, arguments.fail_fast):
+                    yield result
+            finally:
+                client.close()
+            return
+
+    if arguments.jobs == 1 or len(paths) < 2:
+        # Since there is no pool of workers, the help files are minified in parallel instead.
+        validate = partial(_validate_path, arguments=arguments, help_jobs=arguments.jobs)
+        for result in _until_failure((validate(p) for p in paths), arguments.fail_fast):
+            yield result
+    else:
+        from multiprocessing import Pool
+        validate = partial(_validate_path, arguments=arguments)
+        pool = Pool(min(arguments.jobs, len(paths)))
+        try:
+            for result in _until_failure(pool.imap(validate, paths), arguments.fail_fast):
+                yield result
+            pool.close()
+        finally:
+            # If validation was cut short, outstanding work is simply discarded.
+            pool.terminate()
+            pool.join()
+
+
+def _connect(arguments):
+    """Returns a connection to the validation daemon described by the specified command-line
+    arguments, or None if no daemon is running.
+    """
+    import logging, socket
+    from daemon import ValidationClient, get_default_socket_path
+
+    address = arguments.socket or get_default_socket_path()
+    try:
+        return ValidationClient(address)
+    except socket.error:
+        logging.info("No validation daemon is listening on '%s', so projects are validated in this process.", address)
+        return None
+
+
+def _validate_path_remotely(client, path, arguments):
+    """Validates the project located at the specified path with the validation daemon, and
+    returns the same tuple as _validate_path. The daemon only watches project directories, so
+    an archived project is validated in this process instead.
+    """
+    import os
+    if not os.path.isdir(path):
+        return _validate_path(path, arguments, arguments.jobs)
+
+    response = client.validate_path(path, arguments.max_errors)
+    return (path, response["valid"], response["errors"], None, None)
+
+
+def _until_failure(results, fail_fast):
+    """Yields the specified validation results, stopping after the first invalid result
+    if fail_fast is set to True.
+    """
+    for result in results:
+        yield result
+        if fail_fast and not result[1]:
+            break
+
+
+def _validate_path(path, arguments, help_jobs=1):
+    """Validates the project located at the specified path.
+
+    This function is executed by worker processes, so any error raised while the project is
+    being loaded or validated is reported as a validation failure instead of being propagated.
+
+    Args:
+        path (str): A path to a GeoTag-X project directory.
+        arguments (argparse.Namespace): A set of command-line arguments. At most
+            arguments.max_errors errors are reported, or every error if it is set to 0,
+            and validation stops as soon as this many errors have been found. If
+            arguments.verbose is set to True, the stack trace is included in error messages.
+        help_jobs (int): The number of worker processes used to minify the project's help files.
+
+    Returns:
+        <str, bool, list, bool|None, dict|None>: A tuple containing the project's path, the
+            value True if the project is valid, False otherwise; a list of error messages in
+            case it is invalid, whether the result was found in the validation cache, or None
+            if the cache is disabled; and the project's profiles, or None if it is neither
+            profiled nor covered. The profiles map 'time' to the time spent in each validator
+            if arguments.profile is set to True, 'memory' to the memory used by each stage of
+            the validation if arguments.memory_profile is set to True, and 'coverage' to the
+            project's translation matrix if arguments.coverage is set to True.
+    """
+    profiles = {}
+    if not arguments.profile and not arguments.memory_profile:
+        return _validate_path_unprofiled(path, arguments, help_jobs, profiles=profiles) + (profiles or None,)
+
+    profiler = _get_profiler() if arguments.profile else None
+    memory_profiler = _get_memory_profiler() if arguments.memory_profile else None
+    if profiler is not None:
+        profiler.enable()
+        profiler.reset()
+
+    measure = memory_profiler.measure if memory_profiler is not None else _measure
+    result = _validate_path_unprofiled(path, arguments, help_jobs, measure, profiles)
+
+    if profiler is not None:
+        profiles["time"] = profiler.reset()
+    if memory_profiler is not None:
+        profiles["memory"] = memory_profiler.reset()
+
+    return result + (profiles,)
+
+
+def _validate_path_unprofiled(path, arguments, help_jobs, measure=None, profiles=None):
+    """Validates the project located at the specified path, and returns the first four items
+    of the tuple returned by _validate_path.
+
+    Each stage of the validation is performed with measure(stage, f, *args), which is how
+    the memory profiler observes them. The cache is not used while a project is being
+    profiled, so that the profile accounts for all of the work. If arguments.coverage is set
+    to True, the project's translation matrix is added to the specified profiles; since the
+    matrix is built from the configuration set, the project is neither streamed nor looked
+    up in the cache.
+    """
+    from helper import deserialize_configuration_set, take_errors, format_exception
+    from core import iter_configuration_set_errors
+
+    measure = measure or _measure
+    use_cache = _uses_cache(arguments)
+    try:
+        archive = _get_archive(path)
+
+        # Results are not cached for archived projects, since the cache identifies a project's
+        # files by their modification time, but minified help is cached alongside results.
+        cache = _get_cache(arguments) if use_cache and archive is None else None
+        if cache is not None:
+            content_key, result = cache.get(path)
+            if result is not None:
+                return (path, result[0], result[1], True)
+
+        help_cache = _get_cache(arguments).cache if use_cache else None
+        if archive is not None:
+            configuration_set = measure("load", archive.deserialize_configuration_set, path, help_cache)
+            validate = lambda: take_errors(iter_configuration_set_errors(configuration_set), arguments.max_errors)
+            messages = measure("validation", validate)
+        elif arguments.stream and not arguments.coverage:
+            from stream import iter_configuration_set_errors as iter_streamed_errors
+            validate = lambda: take_errors(iter_streamed_errors(path, help_cache), arguments.max_errors)
+            messages = measure("stream", validate)
+        else:
+            # The path was found by a project locator, so it is known to lead to a project.
+            configuration_set = measure("load", deserialize_configuration_set, path, help_cache, help_jobs, True)
+            validate = lambda: take_errors(iter_configuration_set_errors(configuration_set), arguments.max_errors)
+            messages = measure("validation", validate)
+
+        if cache is not None:
+            cache.set(content_key, not messages, messages)
+    except Exception as e:
+        return (path, False, [format_exception(e, arguments.verbose)], None)
+
+    # A failure to measure the translation coverage does not affect the project's result.
+    if arguments.coverage and profiles is not None:
+        from translation import get_translation_matrix
+        try:
+            profiles["coverage"] = measure("coverage", get_translation_matrix, configuration_set)
+        except Exception as e:
+            import logging
+            message = "The translation coverage of the project located at '%s' could not be measured: %s"
+            logging.warning(message, path, format_exception(e, arguments.verbose))
+
+    return (path, not messages, messages, False if cache is not None else None)
+
+
+def _get_archive(path):
+    """Returns the archive that contains the project located at the specified path, or None
+    if the project is not in an archive.
+    """
+    import os
+    if os.path.isdir(path):
+        return None
+
+    from archive import split_archive_path, get_archive
+    location = split_archive_path(path)
+    return get_archive(location[0]) if location is not None else None
+
+
+def _measure(stage, f, *args):
+    """Performs a stage of a validation without measuring it.
+    """
+    return f(*args)
+
+
+def _print_result(path, valid, messages):
+    """Prints the result of a project's validation.
+    """
+    if not valid:
+        print "The project located at '{}' is invalid:".format(path)
+        for message in messages:
+            print "  - {}".format(_encode(message))
+    else:
+        print "The project located at '{}' is valid.".format(path)
+
+
+def _encode(text):
+    """Returns the specified text as a byte string that can be written to the standard output.
+    A unicode string is encoded with the output's encoding, or UTF-8 if the output is not a
+    terminal, which is also the encoding of the messages stored in the validation cache.
+    """
+    if isinstance(text, unicode):
+        import sys
+        return text.encode(sys.stdout.encoding or "utf-8", "replace")
+    return text
+
+
+def _watch(paths, arguments):
+    """Validates the projects located at the specified paths, then validates a project again
+    whenever one of its files is modified, until the user interrupts the application.
+
+    Projects are kept in memory between validations: only the files that have been modified
+    are loaded again, and only the configurations that depend on them are validated again.
+
+    Args:
+        paths (list): A list of paths to GeoTag-X project directories.
+        arguments (argparse.Namespace): A set of command-line arguments.
+
+    Returns:
+        int: 0 if every project was valid when the application was interrupted, 1 otherwise.
+    """
+    import sys, time
+    from helper import take_errors, format_exception
+    from watch import ProjectWatcher
+
+    help_cache = _get_cache(arguments).cache if arguments.cache else None
+    watchers = [ProjectWatcher(p, arguments.max_errors, help_cache) for p in paths]
+    results = {}
+    try:
+        while True:
+            for watcher in watchers:
+                if not watcher.poll():
+                    continue
+                try:
+                    messages = take_errors(watcher.iter_errors(), arguments.max_errors)
+                except Exception as e:
+                    messages = [format_exception(e, arguments.verbose)]
+                results[watcher.path] = not messages
+                _print_result(watcher.path, not messages, messages)
+                sys.stdout.flush()
+            time.sleep(_watch.INTERVAL)
+    except KeyboardInterrupt:
+        pass
+
+    return 0 if all(results.itervalues()) else 1
+
+
+_watch.INTERVAL = 0.05
+"""The number of seconds between two checks for modified files."""
+
+
+def _serve(arguments):
+    """Runs a validation daemon until the user interrupts the application.
+
+    Args:
+        arguments (argparse.Namespace): A set of command-line arguments.
+
+    Returns:
+        int: 0 once the daemon has stopped.
+    """
+    import signal, sys
+    from daemon import ValidationServer, get_default_socket_path
+
+    help_cache = _get_cache(arguments).cache if arguments.cache else None
+    server = ValidationServer(arguments.socket or get_default_socket_path(), arguments.max_errors, help_cache)
+    print "The validation daemon is listening on '{}'.".format(server.server_address)
+    sys.stdout.flush()
+    try:
+        # A daemon stopped by a service manager cleans up after itself as if it were interrupted.
+        signal.signal(signal.SIGTERM, _interrupt)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if help_cache is not None:
+            help_cache.prune()
+
+    return 0
+
+
+def _interrupt(signum, frame):
+    """Handles a signal by interrupting the application.
+    """
+    raise KeyboardInterrupt()
+
+
+def _uses_cache(arguments):
+    """Returns True if the validation cache is used with the specified command-line arguments,
+    False otherwise. The cache is bypassed while projects are profiled or checked for translation
+    coverage, so that all of the work is measured and reported.
+    """
+    return arguments.cache and not arguments.profile and not arguments.memory_profile and not arguments.coverage
+
+
+def _get_cache(arguments):
+    """Returns the validation cache described by the specified command-line arguments.
+    The cache is created once per process.
+    """
+    cache = _get_cache.INSTANCE
+    if cache is None:
+        from cache import ValidationCache, get_default_cache_directory
+        salt = "max-errors={};stream={}".format(arguments.max_errors, arguments.stream)
+        directory = arguments.cache_dir or get_default_cache_directory()
+        cache = ValidationCache(directory, arguments.cache_size * 1024 * 1024, salt)
+        _get_cache.INSTANCE = cache
+
+    return cache
+
+
+_get_cache.INSTANCE = None
+"""The process's validation cache."""
+
+
+def _get_profiler():
+    """Returns the process's profiler, which is created the first time it is needed.
+    """
+    profiler = _get_profiler.INSTANCE
+    if profiler is None:
+        from profiler import Profiler
+        profiler = _get_profiler.INSTANCE = Profiler()
+
+    return profiler
+
+
+_get_profiler.INSTANCE = None
+"""The process's profiler."""
+
+
+def _get_memory_profiler():
+    """Returns the process's memory profiler, which is created the first time it is needed.
+    """
+    profiler = _get_memory_profiler.INSTANCE
+    if profiler is None:
+        from profiler import MemoryProfiler
+        profiler = _get_memory_profiler.INSTANCE = MemoryProfiler()
+
+    return profiler
+
+
+_get_memory_profiler.INSTANCE = None
+"""The process's memory profiler."""
+
+
 def get_argparser(subparsers=None):
     """Constructs the application's command-line argument parser. The validator tool
     is a standalone program but also a part of the GeoTag-X toolkit which means
@@ -82,6 +527,8 @@ def get_argparser(subparsers=None):
     """
     import argparse
 
+    # Validator modules are only imported once a command is run, so registering the
+    # validate command does not slow down the rest of the toolkit.
     parser = None
     parser_arguments = {
         "description": "Validate your GeoTag-X projects.",
@@ -100,12 +547,79 @@ def get_argparser(subparsers=None):
     options.add_argument("-q", "--quiet", action="store_true", help="Suppress all warnings.")
     options.add_argument("-v", "--verbose", action="store_true", help="Detail the actions being performed.")
     options.add_argument("-V", "--version", action="version", help="Display version information and exit.", version=_version())
+    options.add_argument("-j", "--jobs", type=_jobs, default=1, metavar="N", help="Validate projects with N worker processes. If N is 0, one worker per CPU is used.")
+    options.add_argument("--fail-fast", action="store_true", help="Stop validating after the first invalid project.")
+    options.add_argument("--max-errors", type=_max_errors, default=1, metavar="K", help="Report at most K errors per project. If K is 0, every error is reported.")
+    options.add_argument("--stream", action="store_true", help="Validate questions while the task presenter configuration is being read, which bounds memory use by the size of the largest question.")
+    options.add_argument("--watch", action="store_true", help="Validate the projects again whenever their files are modified, until interrupted.")
+    options.add_argument("--max-depth", type=_max_depth, metavar="N", help="Search for projects at most N directories below each path. If N is 0, only the paths themselves are checked. By default, the directory trees are searched in full.")
+    options.add_argument("--exclude", action="append", metavar="GLOB", help="Do not search the directories whose name, or path relative to the searched path, matches GLOB. Hidden directories are never searched. This option may be repeated.")
+    options.add_argument("--changed-since", metavar="REV", help="Only validate the projects in the specified paths, or the current directory, that contain files changed since the git revision REV.")
+    options.add_argument("--staged", action="store_true", help="Only validate the projects in the specified paths, or the current directory, that contain files staged for the next git commit.")
+    options.add_argument("--serve", action="store_true", help="Run a validation daemon that keeps projects in memory between requests, until interrupted.")
+    options.add_argument("--connect", action="store_true", help="Validate the projects with the validation daemon, or in this process if no daemon is running or the projects are profiled, streamed or checked for translation coverage.")
+    options.add_argument("--socket", metavar="PATH", help="The location of the validation daemon's socket. Defaults to 'daemon.sock' in the cache directory.")
+    options.add_argument("--no-cache", dest="cache", action="store_false", help="Do not use or update the validation cache.")
+    options.add_argument("--cache-dir", metavar="DIR", help="The location of the validation cache. Defaults to '$XDG_CACHE_HOME/geotagx-validator', or '~/.cache/geotagx-validator' if XDG_CACHE_HOME is not set.")
+    options.add_argument("--cache-size", type=int, default=64, metavar="MB", help="The maximum size of the validation cache, in megabytes. Defaults to %(default)s.")
+    options.add_argument("--cache-stats", action="store_true", help="Display validation cache statistics.")
+    options.add_argument("--profile", action="store_true", help="Display the time spent in each validator, for each project and for the whole batch. The cache is not used.")
+    options.add_argument("--memory-profile", action="store_true", help="Display the memory used to load and validate each project, and a summary for the whole batch. The cache is not used. Without tracemalloc (e.g. on Python 2.7), each stage is also performed in a forked process to measure its peak, and allocations are not broken down by source location.")
+    options.add_argument("--coverage", action="store_true", help="Display the translation coverage of each project's titles, hints, help, placeholders, option labels and tutorial messages, and a summary for the whole batch. Projects are not streamed and the cache is not used.")
 
-    parser.add_argument("paths", metavar="PATH", nargs="+")
+    parser.add_argument("paths", metavar="PATH", nargs="*")
 
     return parser
 
 
+def _jobs(value):
+    """Converts the specified --jobs argument into a number of worker processes.
+    """
+    import argparse
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid number of jobs: '{}'".format(value))
+
+    if jobs < 0:
+        raise argparse.ArgumentTypeError("the number of jobs must be a positive integer or 0")
+    elif jobs == 0:
+        from multiprocessing import cpu_count
+        jobs = cpu_count()
+
+    return jobs
+
+
+def _max_errors(value):
+    """Converts the specified --max-errors argument into a maximum number of errors.
+    """
+    import argparse
+    try:
+        max_errors = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid maximum number of errors: '{}'".format(value))
+
+    if max_errors < 0:
+        raise argparse.ArgumentTypeError("the maximum number of errors must be a positive integer or 0")
+
+    return max_errors
+
+
+def _max_depth(value):
+    """Converts the specified --max-depth argument into a maximum search depth.
+    """
+    import argparse
+    try:
+        max_depth = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid maximum depth: '{}'".format(value))
+
+    if max_depth < 0:
+        raise argparse.ArgumentTypeError("the maximum depth must be a positive integer or 0")
+
+    return max_depth
+
+
 def _version():
     """Returns the tool's version string.
     """
@@ -113,16 +627,20 @@ def _version():
     return "GeoTag-X Project Validator v%s, Copyright (C) 2016 UNITAR/UNOSAT." % __version__
 
 
-def _setup_logging(verbose=False):
+def _setup_logging(verbose=False, quiet=False):
     """Sets up logging.
 
     Args:
         verbose (bool): If set to True, the validator will log most of its operations,
             even the most mundane.
+        quiet (bool): If set to True, warnings are suppressed.
     """
     import logging
-    logging_level = logging.INFO if verbose else logging.WARNING
-    logging.basicConfig(format="[%(levelname)s] %(message)s", level=logging_level)
+    if quiet:
+        logging.disable(logging.WARNING)
+    else:
+        logging_level = logging.INFO if verbose else logging.WARNING
+        logging.basicConfig(format="[%(levelname)s] %(message)s", level=logging_level)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains functions that read GeoTag-X projects directly from zip and tar archives.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+import posixpath
+from helper import check_arg_type
+
+class Archive(object):
+    """A zip or tar archive that contains one or more GeoTag-X projects.
+
+    The archive is read once, when it is opened. The members of a zip archive are then read on
+    demand since it supports random access, whereas the configurations and help files found in
+    a (possibly compressed) tar archive are read in a single sequential pass and kept in memory.
+    No file is extracted to disk.
+
+    A project is identified by a path made of the archive's filename followed by the project's
+    directory in the archive, e.g. '/path/to/submission.zip/projects/demo'.
+    """
+    def __init__(self, filename):
+        """Opens the specified archive.
+
+        Args:
+            filename (str): The archive's filename.
+
+        Raises:
+            IOError: If the archive could not be opened or is not a zip or tar archive.
+        """
+        import tarfile, zipfile
+
+        self.filename = filename
+        self.__zip = None
+        self.__members = {}
+        try:
+            if zipfile.is_zipfile(filename):
+                self.__zip = zipfile.ZipFile(filename)
+                for info in self.__zip.infolist():
+                    name = _normalize(info.filename)
+                    if not info.filename.endswith("/") and _is_project_file(name):
+                        self.__members[name] = info
+            else:
+                with tarfile.open(filename) as archive:
+                    for member in archive:
+                        name = _normalize(member.name)
+                        if member.isfile() and _is_project_file(name):
+                            self.__members[name] = archive.extractfile(member).read()
+        except (tarfile.TarError, zipfile.BadZipfile) as e:
+            raise IOError("The file '{}' is not a valid archive: {}".format(filename, e))
+
+    def close(self):
+        """Closes the archive.
+        """
+        if self.__zip is not None:
+            self.__zip.close()
+        self.__members = {}
+
+    def open(self, name):
+        """Opens the archive member with the specified name.
+
+        Args:
+            name (str): The member's name, relative to the archive's root.
+
+        Returns:
+            file: A file object opened in binary mode.
+
+        Raises:
+            IOError: If the archive does not contain the member.
+        """
+        member = self.__members.get(_normalize(name))
+        if member is None:
+            raise IOError("The archive '{}' does not contain the file '{}'.".format(self.filename, name))
+        elif self.__zip is not None:
+            return self.__zip.open(member)
+        else:
+            from cStringIO import StringIO
+            return StringIO(member)
+
+    def listdir(self, directory):
+        """Returns the names of the project files in the specified directory of the archive.
+        """
+        directory = _normalize(directory)
+        return [posixpath.basename(n) for n in self.__members if posixpath.dirname(n) == directory]
+
+    def is_project_directory(self, directory):
+        """Checks if the specified directory of the archive contains a GeoTag-X project.
+        """
+        directory = _normalize(directory)
+        return all(posixpath.join(directory, f) in self.__members for f in ["project.json", "task_presenter.json"])
+
+    def find_projects(self, directory=""):
+        """Returns the directories of the projects located in the specified directory of the archive.
+
+        Args:
+            directory (str): A directory of the archive, or its root if empty.
+
+        Returns:
+            list: The sorted paths of the project directories, including the archive's filename.
+        """
+        directory = _normalize(directory)
+        directories = set(posixpath.dirname(n) for n in self.__members if posixpath.basename(n) == "project.json")
+        projects = [
+            d for d in directories
+            if self.is_project_directory(d) and (not directory or d == directory or d.startswith(directory + "/"))
+        ]
+        return sorted(self.get_path(d) for d in projects)
+
+    def get_path(self, directory):
+        """Returns the path of the specified directory of the archive, including the archive's filename.
+        """
+        return os.path.join(self.filename, *directory.split("/")) if directory else self.filename
+
+    def get_directory(self, path):
+        """Returns the directory of the archive at the specified path, which includes the archive's filename.
+        """
+        return _normalize(os.path.relpath(path, self.filename).replace(os.sep, "/"))
+
+    def deserialize_configuration_set(self, path, help_cache=None):
+        """Deserializes the set of configuration files for the GeoTag-X project at the specified path.
+
+        Args:
+            path (str): The path to a project directory in the archive, including the archive's filename.
+            help_cache (cache.DiskCache): An optional cache of minified help.
+
+        Returns:
+            dict|None: A dictionary containing deserialized JSON configurations if the archive
+                contains a GeoTag-X project at the specified path, None otherwise.
+
+        Raises:
+            IOError: If a required configuration could not be read.
+        """
+        from helper import deserialize_project_files
+
+        directory = self.get_directory(path)
+        if not self.is_project_directory(directory):
+            return None
+
+        help_directory = posixpath.join(directory, "help")
+        help_keys = set(f[:-5] for f in self.listdir(help_directory) if f.endswith(".html"))
+        deserialize_help_files = lambda filenames: [self.__deserialize_help(f, help_cache) for f in filenames]
+        return deserialize_project_files(path, self.__deserialize_json, help_keys, deserialize_help_files)
+
+    def __deserialize_json(self, filename):
+        """Returns the JSON object from the archive member at the specified path.
+        """
+        import json
+        from collections import OrderedDict
+        with self.__open_path(filename) as file:
+            return json.loads(file.read(), object_pairs_hook=OrderedDict)
+
+    def __deserialize_help(self, filename, cache):
+        """Returns the minified HTML from the archive member at the specified path, or None if
+        it could not be read.
+        """
+        from helper import deserialize_help_file
+        try:
+            with self.__open_path(filename) as file:
+                return deserialize_help_file(file, cache)
+        except IOError:
+            return None
+
+    def __open_path(self, filename):
+        """Opens the archive member at the specified path, which includes the archive's filename.
+        """
+        from contextlib import closing
+        return closing(self.open(self.get_directory(filename)))
+
+
+Archive.EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2")
+"""The extensions of the archive files that may contain projects."""
+
+
+def get_archive(filename):
+    """Returns the archive with the specified filename, which is opened once per process so that
+    archives containing several projects are only read once.
+
+    Args:
+        filename (str): The archive's filename.
+
+    Returns:
+        Archive: The opened archive.
+
+    Raises:
+        IOError: If the archive could not be opened.
+    """
+    # A forked worker process does not share the archives opened by its parent, since reading
+    # a zip archive from several processes at once would corrupt their shared file offset.
+    pid = os.getpid()
+    if get_archive.PID != pid:
+        get_archive.ARCHIVES = {}
+        get_archive.PID = pid
+
+    archive = get_archive.ARCHIVES.get(filename)
+    if archive is None:
+        archive = get_archive.ARCHIVES[filename] = Archive(filename)
+    return archive
+
+
+get_archive.ARCHIVES = {}
+"""The archives opened by the current process, indexed by filename."""
+
+get_archive.PID = None
+"""The identifier of the process that opened the archives."""
+
+
+def split_archive_path(path):
+    """Splits the specified path into an archive's filename and a directory in the archive.
+
+    Args:
+        path (str): A path to an archive, or to a directory in an archive, e.g.
+            '/path/to/submission.zip/projects/demo'.
+
+    Returns:
+        <str, str>|None: A pair containing the archive's filename and the directory in the
+            archive, which is empty for the archive's root; or None if the path does not
+            lead to an archive.
+
+    Raises:
+        TypeError: If the path argument is not a string.
+    """
+    check_arg_type(split_archive_path, "path", path, basestring)
+
+    filename = os.path.normpath(path)
+    directories = []
+    while filename and filename != os.path.dirname(filename):
+        if filename.lower().endswith(Archive.EXTENSIONS) and os.path.isfile(filename):
+            return (filename, "/".join(reversed(directories)))
+        filename, directory = os.path.split(filename)
+        directories.append(directory)
+
+    return None
+
+
+def _normalize(name):
+    """Returns the normalized form of the specified member name, without leading './' or '/'.
+    """
+    name = posixpath.normpath(name.replace("\\", "/")).lstrip("/")
+    return "" if name == "." else name
+
+
+def _is_project_file(name):
+    """Checks if the archive member with the specified name is a configuration or help file.
+    """
+    directory, filename = posixpath.split(name)
+    return filename in {"project.json", "task_presenter.json", "tutorial.json"} or (
+        filename.endswith(".html") and posixpath.basename(directory) == "help"
+    )
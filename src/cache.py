@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains the persistent caches used to skip redundant work across runs.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+
+class DiskCache(object):
+    """A persistent cache of byte strings, where each entry is stored in its own file.
+
+    Entries are written atomically so that several processes may share the same cache.
+    The cache's size is bounded by prune, which removes the least recently used entries
+    until the total size of the remaining entries fits the limit.
+    """
+    def __init__(self, directory, max_size):
+        """Initializes the cache.
+
+        Args:
+            directory (str): The directory where the cache's entries are stored. It is
+                created when the first entry is written.
+            max_size (int): The maximum number of bytes taken up by the cache's entries.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def __filename(self, key):
+        """Returns the name of the file that stores the entry with the specified key.
+        """
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, key):
+        """Returns the data stored under the specified key.
+
+        Args:
+            key (str): A hexadecimal key.
+
+        Returns:
+            str|None: The stored data, or None if the key is not in the cache.
+        """
+        filename = self.__filename(key)
+        try:
+            with open(filename, "rb") as file:
+                data = file.read()
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+
+        try:
+            # Refresh the entry's modification time, which prune uses to find the least
+            # recently used entries.
+            os.utime(filename, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return data
+
+    def set(self, key, data):
+        """Stores the specified data under the specified key.
+
+        Args:
+            key (str): A hexadecimal key.
+            data (str): The data to store.
+        """
+        import tempfile
+        filename = self.__filename(key)
+        directory = os.path.dirname(filename)
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            descriptor, temporary = tempfile.mkstemp(dir=directory)
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.rename(temporary, filename)
+            self.writes += 1
+        except (IOError, OSError):
+            # The cache is an optimization: failing to write to it is not an error.
+            pass
+
+    def prune(self):
+        """Removes the least recently used entries until the cache fits its size limit.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        entries = []
+        total_size = 0
+        for root, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                filename = os.path.join(root, name)
+                try:
+                    status = os.stat(filename)
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, filename))
+                total_size += status.st_size
+
+        removed = 0
+        if total_size > self.max_size:
+            entries.sort()
+            for _, size, filename in entries:
+                try:
+                    os.remove(filename)
+                except OSError:
+                    continue
+                removed += 1
+                total_size -= size
+                if total_size <= self.max_size:
+                    break
+
+        return removed
+
+
+class ValidationCache(object):
+    """A persistent cache of project validation results.
+
+    A result is keyed by a hash of the project's configuration and help files, the validator's
+    version and the options that affect validation. To avoid hashing unchanged projects, the
+    cache also records the modification time and size of each file the last time the project
+    was hashed: if none of them has changed, the previous hash is reused.
+
+    Results are stored in a plain text format so that a cache hit requires no JSON decoding.
+    """
+    FILENAMES = ("project.json", "task_presenter.json", "tutorial.json")
+    """The configuration files that a result depends on, in addition to the help files."""
+
+    def __init__(self, directory, max_size, salt=""):
+        """Initializes the cache.
+
+        Args:
+            directory (str): The directory where the cache is stored.
+            max_size (int): The maximum number of bytes taken up by the cache.
+            salt (str): A string that identifies the options used to validate projects.
+        """
+        from __init__ import __version__
+        self.cache = DiskCache(directory, max_size)
+        self.salt = "{}\0{}\0{}".format(__version__, get_rules_signature(), salt)
+        self.hits = 0
+        self.misses = 0
+        self.hashed = 0
+
+    def get(self, path):
+        """Returns the cached validation result for the project located at the specified path.
+
+        Args:
+            path (str): A path to a GeoTag-X project directory.
+
+        Returns:
+            <str, <bool, list>|None>: A pair containing the project's content key, which is
+                needed to store a new result, and the cached <valid, messages> pair if there
+                is one, or None otherwise.
+        """
+        filenames = self.__files(path)
+        signature = self.__signature(filenames)
+        signature_key = get_key(self.salt, path)
+        content_key = None
+
+        entry = self.cache.get(signature_key)
+        if entry is not None:
+            cached_signature, _, content_key = entry.rpartition("\0")
+            if cached_signature != signature:
+                content_key = None
+        if content_key is None:
+            content_key = self.__content_key(path, filenames)
+            self.cache.set(signature_key, "{}\0{}".format(signature, content_key))
+            self.hashed += 1
+
+        result = self.cache.get(content_key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            messages = result[1:].split("\0") if len(result) > 1 else []
+            result = (result[0] == "1", messages)
+
+        return (content_key, result)
+
+    def set(self, content_key, valid, messages):
+        """Stores the specified validation result.
+
+        Args:
+            content_key (str): The content key returned by get.
+            valid (bool): True if the project is valid, False otherwise.
+            messages (list): The list of error messages reported for the project.
+        """
+        self.cache.set(content_key, ("1" if valid else "0") + "\0".join(m.encode("UTF-8") if isinstance(m, unicode) else m for m in messages))
+
+    def __files(self, path):
+        """Returns the sorted list of files that the validation of a project depends on.
+        """
+        filenames = [os.path.join(path, f) for f in ValidationCache.FILENAMES]
+        help_directory = os.path.join(path, "help")
+        try:
+            filenames.extend(sorted(os.path.join(help_directory, f) for f in os.listdir(help_directory) if f.endswith(".html")))
+        except OSError:
+            pass
+
+        return filenames
+
+    def __signature(self, filenames):
+        """Returns a string that describes the modification time and size of each of the
+        specified files.
+        """
+        signature = []
+        for filename in filenames:
+            try:
+                status = os.stat(filename)
+                signature.append("{}:{!r}:{}".format(filename, status.st_mtime, status.st_size))
+            except OSError:
+                signature.append("{}:-".format(filename))
+
+        return "\n".join(signature)
+
+    def __content_key(self, path, filenames):
+        """Returns the hash of the content of the specified files from the project located at
+        the specified path.
+        """
+        import hashlib
+        digest = hashlib.sha1(self.salt)
+        for filename in filenames:
+            digest.update("\0{}\0".format(os.path.relpath(filename, path)))
+            try:
+                with open(filename, "rb") as file:
+                    for block in iter(lambda: file.read(65536), ""):
+                        digest.update(block)
+            except IOError:
+                digest.update("\0missing")
+
+        return digest.hexdigest()
+
+
+def get_rules_signature():
+    """Returns a string that identifies the validation rules, i.e. a digest of the sources of the
+    validator modules, so that results cached by a different version of the rules are ignored
+    even if the validator's version number has not changed. The signature is computed once.
+
+    Returns:
+        str: The hexadecimal SHA-1 digest of the validator modules' sources. If the sources
+            cannot be read, e.g. when the validator is run from a zip archive, the digest only
+            covers the modules' names.
+    """
+    signature = get_rules_signature.SIGNATURE
+    if signature is None:
+        import hashlib
+        digest = hashlib.sha1()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in get_rules_signature.MODULES:
+            digest.update(name + "\0")
+            try:
+                with open(os.path.join(directory, name + ".py"), "rb") as file:
+                    digest.update(file.read())
+            except IOError:
+                pass
+        signature = get_rules_signature.SIGNATURE = digest.hexdigest()
+
+    return signature
+
+
+get_rules_signature.MODULES = ["core", "helper", "matchers", "project", "question", "schema", "stream", "task_presenter", "tutorial"]
+"""The modules that define the validation rules."""
+
+get_rules_signature.SIGNATURE = None
+"""The signature of the validation rules, which is computed once."""
+
+
+def get_key(*parts):
+    """Returns a cache key for the specified strings.
+
+    Args:
+        *parts (str): The strings that identify a cache entry.
+
+    Returns:
+        str: The hexadecimal SHA-1 digest of the strings.
+    """
+    import hashlib
+    return hashlib.sha1("\0".join(p.encode("UTF-8") if isinstance(p, unicode) else p for p in parts)).hexdigest()
+
+
+def get_default_cache_directory():
+    """Returns the default location of the validator's caches.
+
+    Returns:
+        str: The geotagx-validator directory in $XDG_CACHE_HOME, or ~/.cache if it is not set.
+    """
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "geotagx-validator")
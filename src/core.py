@@ -24,10 +24,10 @@
 # DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
 # OR OTHER DEALINGS IN THE SOFTWARE.
-from project import is_project_configuration
-from task_presenter import is_task_presenter_configuration
-from tutorial import is_tutorial_configuration
-from helper import check_arg_type
+from project import iter_project_configuration_errors
+from task_presenter import iter_task_presenter_configuration_errors
+from tutorial import iter_tutorial_configuration_errors
+from helper import check_arg_type, first_error
 
 def is_configuration_set(configurations):
     """Validates the specified set of configurations.
@@ -46,6 +46,28 @@ def is_configuration_set(configurations):
         <bool, str|None>: A pair containing the value True if the specified configuration
             set is valid, False otherwise; and an error message in case the set is invalid.
 
+    Raises:
+        TypeError: If the configurations argument is not a dictionary.
+        ValueError: If a required configuration is missing from the configuration set.
+    """
+    return first_error(iter_configuration_set_errors(configurations))
+
+
+def iter_configuration_set_errors(configurations, keys=None):
+    """Returns a generator of every error found in the specified set of configurations.
+
+    Errors are produced lazily so validation only proceeds as far as the caller iterates,
+    e.g. itertools.islice(iter_configuration_set_errors(configurations), 10) stops as soon
+    as ten errors have been found.
+
+    Args:
+        configurations (dict): A dictionary containing a set of configurations to validate.
+        keys (list|None): The keys of the configurations to validate. If set to None, every
+            configuration in the set is validated.
+
+    Returns:
+        generator: A generator of error messages.
+
     Raises:
         TypeError: If the configurations argument is not a dictionary.
         ValueError: If a required configuration is missing from the configuration set.
@@ -56,16 +78,33 @@ def is_configuration_set(configurations):
     if not all(is_nonempty_dictionary(configurations.get(k)) for k in ["project", "task_presenter"]):
         raise ValueError("A required configuration is missing from the specified configuration set.")
 
-    from collections import OrderedDict
-    validators = OrderedDict({
-        "project": is_project_configuration,
-        "task_presenter": is_task_presenter_configuration,
-        "tutorial": lambda t: is_tutorial_configuration(t, configurations["task_presenter"], False),
-    })
-    for key, configuration in configurations.iteritems():
-        validator = validators[key]
-        valid, message = validator(configuration)
-        if not valid:
-            return (False, message)
-
-    return (True, None)
+    return _iter_configuration_set_errors(configurations, iter_configuration_set_errors.KEYS if keys is None else keys)
+
+
+def _iter_configuration_set_errors(configurations, keys):
+    """Generates the errors found in each configuration of the specified set.
+    """
+    for key in keys:
+        configuration = configurations.get(key)
+        if configuration is not None:
+            for message in iter_configuration_set_errors.VALIDATORS[key](configuration, configurations):
+                yield message
+
+
+iter_configuration_set_errors.KEYS = ["project", "task_presenter", "tutorial"]
+"""The keys of a configuration set, in the order in which the configurations are validated.
+The order is fixed so that errors are reported deterministically."""
+
+iter_configuration_set_errors.VALIDATORS = {
+    "project": lambda c, _: iter_project_configuration_errors(c),
+    "task_presenter": lambda c, _: iter_task_presenter_configuration_errors(c),
+    "tutorial": lambda c, configurations: iter_tutorial_configuration_errors(c, configurations["task_presenter"], False),
+}
+"""The validator of each configuration in a set. A validator is passed the configuration and the set it belongs to."""
+
+iter_configuration_set_errors.DEPENDENCIES = {
+    "project": {"project"},
+    "task_presenter": {"task_presenter"},
+    "tutorial": {"tutorial", "task_presenter"},
+}
+"""The configurations that the validation of each configuration in a set depends on."""
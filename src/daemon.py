@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains the validation daemon, which keeps projects in memory between requests, and its client.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import os
+import socket
+import SocketServer
+import threading
+from collections import OrderedDict
+
+class ValidationServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+    """A daemon that validates GeoTag-X projects on behalf of clients connected to a Unix socket.
+
+    A client sends requests and receives responses as JSON objects, one per line. A request
+    contains either the path to a project directory, e.g. {"path": "/path/to/project"}, or a set
+    of configurations, e.g. {"configurations": {"project": {...}, "task_presenter": {...}}}. It
+    may also contain the maximum number of errors to report, e.g. {"max_errors": 0}. The response
+    contains the value true if the project is valid, false otherwise, as well as a list of error
+    messages, e.g. {"path": "/path/to/project", "valid": false, "errors": ["..."]}. An illegal
+    request is answered with an error message, e.g. {"error": "..."}.
+
+    Projects are kept in memory between requests by a watcher, so only the files that have been
+    modified since the previous request are loaded again, and only the configurations that
+    depend on them are validated again.
+
+    Each connection is served by its own thread, so a client that keeps its connection open
+    does not block the others. Requests are answered one at a time since the watchers are
+    shared by every connection.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, max_errors=1, help_cache=None, max_projects=None):
+        """Creates a daemon that listens on the specified socket.
+
+        Args:
+            address (str): The path to the Unix socket.
+            max_errors (int): The maximum number of errors reported when a request does not
+                specify it, or 0 to report every error.
+            help_cache (cache.DiskCache): An optional cache of minified help.
+            max_projects (int|None): The maximum number of projects kept in memory. If set
+                to None, ValidationServer.MAX_PROJECTS is used.
+
+        Raises:
+            IOError: If another daemon is already listening on the socket.
+        """
+        self.max_errors = max_errors
+        self.help_cache = help_cache
+        self.max_projects = max_projects or ValidationServer.MAX_PROJECTS
+        self.watchers = OrderedDict()
+        self.lock = threading.Lock()
+
+        _remove_stale_socket(address)
+        directory = os.path.dirname(os.path.abspath(address))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        SocketServer.UnixStreamServer.__init__(self, address, _RequestHandler)
+
+    def server_close(self):
+        """Closes the daemon's socket and removes it from the file system.
+        """
+        SocketServer.UnixStreamServer.server_close(self)
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+    def respond(self, request):
+        """Returns the response to the specified request.
+
+        Args:
+            request: A deserialized request.
+
+        Returns:
+            dict: A response.
+        """
+        if not isinstance(request, dict):
+            return {"error": "A request must be a JSON object."}
+
+        max_errors = request.get("max_errors", self.max_errors)
+        if not isinstance(max_errors, int) or isinstance(max_errors, bool) or max_errors < 0:
+            return {"error": "The maximum number of errors must be a positive integer or 0."}
+
+        if "path" in request:
+            path = request["path"]
+            if not isinstance(path, basestring):
+                return {"error": "A project path must be a string."}
+            with self.lock:
+                return self.validate_path(path, max_errors)
+        elif "configurations" in request:
+            with self.lock:
+                return self.validate_configurations(request["configurations"], max_errors)
+        else:
+            return {"error": "A request must contain either a project path or a set of configurations."}
+
+    def validate_path(self, path, max_errors):
+        """Validates the project located at the specified path.
+
+        Args:
+            path (str): A path to a GeoTag-X project directory.
+            max_errors (int): The maximum number of errors to report, or 0 to report every error.
+
+        Returns:
+            dict: A response containing the project's path, whether it is valid and its errors.
+        """
+        import sys
+        from helper import take_errors, format_exception
+
+        # A path deserialized from JSON is a unicode string, while the watchers expect a byte string.
+        if isinstance(path, unicode):
+            path = path.encode(sys.getfilesystemencoding() or "utf-8")
+        path = os.path.realpath(path)
+        watcher = self.__get_watcher(path, max_errors)
+        try:
+            watcher.poll()
+            messages = take_errors(watcher.iter_errors(), max_errors)
+        except Exception as e:
+            messages = [format_exception(e, False)]
+
+        return {"path": path, "valid": not messages, "errors": messages}
+
+    def validate_configurations(self, configurations, max_errors):
+        """Validates the specified configuration set.
+
+        Args:
+            configurations (dict): A set of configurations, where any help is inlined.
+            max_errors (int): The maximum number of errors to report, or 0 to report every error.
+
+        Returns:
+            dict: A response containing whether the set is valid and its errors.
+        """
+        from core import iter_configuration_set_errors
+        from helper import take_errors, format_exception
+        try:
+            messages = take_errors(iter_configuration_set_errors(configurations), max_errors)
+        except Exception as e:
+            messages = [format_exception(e, False)]
+
+        return {"valid": not messages, "errors": messages}
+
+    def __get_watcher(self, path, max_errors):
+        """Returns the watcher of the project located at the specified path, evicting the least
+        recently used project if too many projects are kept in memory.
+        """
+        from watch import ProjectWatcher
+
+        key = (path, max_errors)
+        watcher = self.watchers.pop(key, None)
+        if watcher is None:
+            watcher = ProjectWatcher(path, max_errors, self.help_cache)
+            while len(self.watchers) >= self.max_projects:
+                self.watchers.popitem(last=False)
+        self.watchers[key] = watcher
+        return watcher
+
+
+ValidationServer.MAX_PROJECTS = 64
+"""The default maximum number of projects kept in memory by a daemon."""
+
+
+class _RequestHandler(SocketServer.StreamRequestHandler):
+    """Answers the requests sent over a client's connection, until the client disconnects.
+    """
+    def handle(self):
+        for line in iter(self.rfile.readline, ""):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line, object_pairs_hook=OrderedDict)
+            except ValueError:
+                response = {"error": "A request must be a JSON object."}
+            else:
+                response = self.server.respond(request)
+
+            self.wfile.write(json.dumps(response) + "\n")
+            self.wfile.flush()
+
+
+class ValidationClient(object):
+    """A connection to a validation daemon.
+    """
+    def __init__(self, address):
+        """Connects to the daemon listening on the specified socket.
+
+        Args:
+            address (str): The path to the daemon's Unix socket.
+
+        Raises:
+            socket.error: If no daemon is listening on the socket.
+        """
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.socket.connect(address)
+        except socket.error:
+            self.socket.close()
+            raise
+        self.file = self.socket.makefile("rb")
+
+    def close(self):
+        """Closes the connection.
+        """
+        self.file.close()
+        self.socket.close()
+
+    def request(self, request):
+        """Sends the specified request to the daemon and returns its response.
+
+        Args:
+            request (dict): A request.
+
+        Returns:
+            dict: The daemon's response.
+
+        Raises:
+            IOError: If the daemon closed the connection.
+            ValueError: If the daemon could not answer the request.
+        """
+        self.socket.sendall(json.dumps(request) + "\n")
+        line = self.file.readline()
+        if not line:
+            raise IOError("The validation daemon closed the connection.")
+
+        response = json.loads(line)
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response
+
+    def validate_path(self, path, max_errors=1):
+        """Validates the project located at the specified path.
+
+        Args:
+            path (str): A path to a GeoTag-X project directory.
+            max_errors (int): The maximum number of errors to report, or 0 to report every error.
+
+        Returns:
+            dict: A response containing the project's path, whether it is valid and its errors.
+        """
+        return self.request({"path": path, "max_errors": max_errors})
+
+    def validate_configurations(self, configurations, max_errors=1):
+        """Validates the specified configuration set.
+
+        Args:
+            configurations (dict): A set of configurations, where any help is inlined.
+            max_errors (int): The maximum number of errors to report, or 0 to report every error.
+
+        Returns:
+            dict: A response containing whether the set is valid and its errors.
+        """
+        return self.request({"configurations": configurations, "max_errors": max_errors})
+
+
+def get_default_socket_path():
+    """Returns the default location of the validation daemon's socket.
+
+    Returns:
+        str: The daemon.sock file in the validator's cache directory.
+    """
+    from cache import get_default_cache_directory
+    return os.path.join(get_default_cache_directory(), "daemon.sock")
+
+
+def _remove_stale_socket(address):
+    """Removes the socket at the specified address if no daemon is listening on it anymore.
+
+    Raises:
+        IOError: If a daemon is listening on the socket.
+    """
+    if not os.path.exists(address):
+        return
+
+    try:
+        ValidationClient(address).close()
+    except socket.error:
+        os.remove(address)
+    else:
+        raise IOError("A validation daemon is already listening on '{}'.".format(address))
+
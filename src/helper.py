@@ -26,7 +26,7 @@
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
 # OR OTHER DEALINGS IN THE SOFTWARE.
 import os
-import re
+import matchers
 
 def check_arg_type(f, arg_name, arg_value, expected_type): # pragma: no cover
     """Checks the specified argument's type.
@@ -62,7 +62,59 @@ def is_configuration(
     missing_field_message=None,
     unexpected_field_message=None
 ):
-    """TODO Document me.
+    """Validates the specified configuration.
+
+    This function is a thin wrapper around iter_configuration_errors that stops at the
+    first error.
+
+    Args:
+        configuration (dict): A configuration to validate.
+        required_fields (frozenset): A set of fields that the configuration must contain.
+        field_validators (dict): A dictionary that maps each recognized field to its validator.
+        missing_field_message (str): A message used to report missing required fields.
+        unexpected_field_message (str): A message used to report unrecognized fields.
+
+    Returns:
+        <bool, str|None>: A pair containing the value True if the specified configuration
+            is valid, False otherwise; and an error message in case it is invalid.
+
+    Raises:
+        TypeError: If one of the arguments is not of the expected type.
+    """
+    return first_error(iter_configuration_errors(
+        configuration,
+        required_fields,
+        field_validators,
+        missing_field_message,
+        unexpected_field_message
+    ))
+
+
+def iter_configuration_errors(
+    configuration,
+    required_fields=None,
+    field_validators=None,
+    missing_field_message=None,
+    unexpected_field_message=None
+):
+    """Returns a generator of every error found in the specified configuration.
+
+    Errors are produced lazily, in the order in which they are found, so a caller that
+    only needs a few of them may stop iterating at any time. A field validator may either
+    return a <bool, str|None> pair, or an iterable of error messages.
+
+    Args:
+        configuration (dict): A configuration to validate.
+        required_fields (frozenset): A set of fields that the configuration must contain.
+        field_validators (dict): A dictionary that maps each recognized field to its validator.
+        missing_field_message (str): A message used to report missing required fields.
+        unexpected_field_message (str): A message used to report unrecognized fields.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If one of the arguments is not of the expected type.
     """
     check_arg_type(is_configuration, "configuration", configuration, dict)
     check_arg_type(is_configuration, "required_fields", required_fields, (frozenset, type(None)))
@@ -70,27 +122,91 @@ def is_configuration(
     check_arg_type(is_configuration, "missing_field_message", missing_field_message, (basestring, type(None)))
     check_arg_type(is_configuration, "unexpected_field_message", unexpected_field_message, (basestring, type(None)))
 
+    return _iter_configuration_errors(
+        configuration,
+        required_fields,
+        field_validators,
+        missing_field_message or "The configuration is missing the following field(s): '{}'.",
+        unexpected_field_message or "The configuration key '{}' is not recognized."
+    )
+
+
+def _iter_configuration_errors(
+    configuration,
+    required_fields,
+    field_validators,
+    missing_field_message,
+    unexpected_field_message
+):
+    """Generates the errors found in the specified configuration. The arguments are
+    assumed to have been checked by iter_configuration_errors.
+    """
     if required_fields:
         missing_fields = [k for k in required_fields if k not in configuration or configuration[k] is None]
         if missing_fields:
-            if not missing_field_message:
-                missing_field_message = "The configuration is missing the following field(s): '{}'."
-            return (False, missing_field_message.format("', '".join(missing_fields)))
+            yield missing_field_message.format("', '".join(missing_fields))
 
     if field_validators:
         for key, value in configuration.iteritems():
             validator = field_validators.get(key)
             if not validator:
-                if not unexpected_field_message:
-                    unexpected_field_message = "The configuration key '{}' is not recognized."
-                return (False, unexpected_field_message.format(key))
-            valid, message = validator(value)
-            if not valid:
-                return (False, message)
+                yield unexpected_field_message.format(key)
+            elif value is None and required_fields and key in required_fields:
+                # The field has already been reported as missing.
+                continue
+            else:
+                for message in iter_errors(validator(value)):
+                    yield message
+
+
+def iter_errors(result):
+    """Returns a generator of error messages from the specified validation result.
+
+    Args:
+        result (tuple|iterable): A <bool, str|None> pair returned by a validator, or an
+            iterable of error messages.
+
+    Returns:
+        generator: A generator of error messages.
+    """
+    if isinstance(result, tuple):
+        if not result[0]:
+            yield result[1]
+    else:
+        for message in result:
+            yield message
+
+
+def first_error(errors):
+    """Returns the first error produced by the specified stream of errors.
+
+    Args:
+        errors (iterable): An iterable of error messages.
+
+    Returns:
+        <bool, str|None>: A pair containing the value True if the stream contains no
+            errors, False otherwise; and the first error message in case there is one.
+    """
+    for message in errors:
+        return (False, message)
 
     return (True, None)
 
 
+def take_errors(errors, max_errors):
+    """Returns at most the specified number of errors from a stream of errors.
+
+    Args:
+        errors (iterable): An iterable of error messages.
+        max_errors (int): The maximum number of errors to return, or 0 to return every error.
+
+    Returns:
+        list: A list of error messages. The stream is not consumed past the last error returned.
+    """
+    from itertools import islice
+    return list(islice(errors, max_errors) if max_errors > 0 else errors)
+
+
 def is_empty_string(empty_string):
     """Checks if the specified string is empty.
 
@@ -119,31 +235,24 @@ def is_normalized_string(normalized_string, language_codes=None):
 
     Args:
         normalized_string (dict): A normalized string to validate.
-        language_codes (list): A list of language codes that the normalized string dictionary must contain.
-            If unspecified, the function only verifies that the dictionary keys are indeed valid language codes.
+        language_codes (list|LanguageContext): A list of language codes that the normalized string dictionary
+            must contain, or a language context that holds them. If unspecified, the function only verifies
+            that the dictionary keys are indeed valid language codes.
 
     Returns:
         bool: True if the specified string is normalized, False otherwise.
 
     Raises:
         TypeError: If the normalized_string argument is not a dictionary or if the language_codes argument is
-            not a list or a NoneType.
+            not a list, LanguageContext or NoneType.
     """
     check_arg_type(is_normalized_string, "normalized_string", normalized_string, dict)
-    check_arg_type(is_normalized_string, "language_codes", language_codes, (list, type(None)))
+    check_arg_type(is_normalized_string, "language_codes", language_codes, (list, LanguageContext, type(None)))
 
-    try:
-        missing_translations = None if language_codes is None else [l for l in language_codes if l not in normalized_string]
-        if missing_translations:
-            print "The normalized string is missing the following translations: '{}'.".format("', '".join(missing_translations))
-            return False
+    if not isinstance(language_codes, LanguageContext):
+        language_codes = LanguageContext(language_codes)
 
-        return normalized_string and all(is_language_code(k) and not is_empty_string(v) for k, v in normalized_string.iteritems())
-    except TypeError:
-        # Both the is_language_code and is_empty_string functions will raise a TypeError if
-        # their respective arguments are not strings. Therefore, if an argument is not a string,
-        # it is neither a valid ISO code or a (drum roll) string.
-        return False
+    return language_codes.is_normalized_string(normalized_string)
 
 
 def is_configuration_string(configuration_string, language_codes=None):
@@ -154,16 +263,17 @@ def is_configuration_string(configuration_string, language_codes=None):
 
     Args:
         configuration_string (basestring|dict): A string or dictionary to validate.
-        language_codes (list): A list of languages that the normalized string dictionary must
-            contain, where each item of the list is a language code. Note that this argument
-            is used if and only if the string argument a dictionary (i.e., a normalized string).
+        language_codes (list|LanguageContext): A list of languages that the normalized string
+            dictionary must contain, where each item of the list is a language code, or a language
+            context that holds them. Note that this argument is used if and only if the string
+            argument a dictionary (i.e., a normalized string).
 
     Returns:
         bool: True if the specified configuration string is valid, False otherwise.
 
     Raises:
         TypeError: If the configuration_string argument is not a string or dictionary,
-            or if the language_codes argument is not a list or NoneType.
+            or if the language_codes argument is not a list, LanguageContext or NoneType.
     """
     check_arg_type(is_configuration_string, "configuration_string", configuration_string, (basestring, dict))
 
@@ -173,9 +283,117 @@ def is_configuration_string(configuration_string, language_codes=None):
         return is_normalized_string(configuration_string, language_codes)
 
 
+class LanguageContext(object):
+    """The languages that a task presenter's normalized strings are validated against.
+
+    A context is created once per task presenter and passed to its validators in place of the
+    list of available languages. It holds the available languages as a frozenset, the validity
+    of each language code it has come across, and the result of each normalized string it has
+    already checked, so that strings repeated throughout a configuration, e.g. the labels of
+    common options, are only validated once.
+    """
+    __slots__ = (
+        "languages",
+        "__required_languages",
+        "__language_codes",
+        "__normalized_strings",
+    )
+
+    def __init__(self, languages=None):
+        """Initializes the context.
+
+        Args:
+            languages (list): A list of language codes that every normalized string must contain.
+                If unspecified, normalized strings are not required to contain any language.
+
+        Raises:
+            TypeError: If the languages argument is not a list or NoneType.
+        """
+        check_arg_type(self.__init__, "languages", languages, (list, type(None)))
+
+        self.__required_languages = () if languages is None else tuple(languages)
+        try:
+            self.languages = None if languages is None else frozenset(languages)
+        except TypeError:
+            # A language that cannot be hashed can not be a key of a normalized string either.
+            self.languages = None
+
+        self.__language_codes = dict((c, is_language_code(c)) for c in self.languages or ())
+        self.__normalized_strings = {}
+
+    def is_normalized_string(self, normalized_string):
+        """Checks if the specified string is normalized. The result is memoized for as long
+        as the context exists.
+
+        Args:
+            normalized_string (dict): A normalized string to validate.
+
+        Returns:
+            bool: True if the specified string is normalized, False otherwise.
+        """
+        # Normalized strings are usually deserialized as ordered dictionaries, whose iterators
+        # are much slower than those of the dict type. The order of the items does not matter.
+        try:
+            key = frozenset(dict.iteritems(normalized_string))
+        except TypeError:
+            # A normalized string whose values cannot be hashed is not memoized.
+            key = None
+
+        entry = self.__normalized_strings.get(key) if key is not None else None
+        if entry is None:
+            entry = self.__check(normalized_string)
+            if key is not None:
+                self.__normalized_strings[key] = entry
+
+        valid, message = entry
+        if message is not None:
+            print message
+        return valid
+
+    def __check(self, normalized_string):
+        """Checks if the specified string is normalized.
+
+        Returns:
+            <bool, str|None>: A pair containing the value True if the specified string is
+                normalized, False otherwise; and a message that reports missing translations.
+        """
+        try:
+            languages = self.languages
+            if languages is None and self.__required_languages:
+                # Some of the languages cannot be hashed so no dictionary can contain them all.
+                return (False, None)
+            elif languages and not languages.issubset(dict.viewkeys(normalized_string)):
+                missing_translations = [l for l in self.__required_languages if l not in normalized_string]
+                message = "The normalized string is missing the following translations: '{}'."
+                return (False, message.format("', '".join(missing_translations)))
+
+            language_codes = self.__language_codes
+            for code, string in dict.iteritems(normalized_string):
+                valid = language_codes.get(code)
+                if valid is None:
+                    valid = language_codes[code] = is_language_code(code)
+                # A value that is not a string is not a (drum roll) string.
+                if not valid or not isinstance(string, basestring) or not string or string.isspace():
+                    return (False, None)
+
+            return (len(normalized_string) > 0, None)
+        except TypeError:
+            # The list of missing translations can not be reported if it contains a language
+            # that is not a string.
+            return (False, None)
+
+
 def is_url(url):
     """Checks if the specified URL is valid.
 
+    A valid URL has a scheme and a host, and may include user information, a port, a path,
+    a query and a fragment. The host is either a domain name, which may be internationalized
+    (e.g. http://bücher.example), an IPv4 address, or an IPv6 address enclosed in square
+    brackets (e.g. http://[::1]:8080).
+
+    The URL is split into its components by a single precompiled matcher and each component
+    is then checked separately, so validation takes linear time regardless of the input.
+
     Args:
         url (str): A URL to check.
 
@@ -187,15 +405,129 @@ def is_url(url):
     """
     if is_empty_string(url):
         return False
+
+    matches = matchers.URL.match(url)
+    if not matches:
+        return False
+
+    _, host, port = matches.groups()
+    if port is not None and not is_port(port):
+        return False
+    elif host.startswith("["):
+        return is_ipv6_address(host[1:-1])
+    elif host[-1:].isdigit():
+        # A hostname always ends with an alphabetic top-level domain.
+        return is_ipv4_address(host)
+    else:
+        return is_hostname(host)
+
+
+def is_port(port):
+    """Checks if the specified string is a valid port number.
+
+    Args:
+        port (str): A port number to check.
+
+    Returns:
+        bool: True if the specified string is a port number between 0 and 65535, False otherwise.
+    """
+    return bool(matchers.PORT.match(port)) and int(port) <= 65535
+
+
+def is_ipv4_address(address):
+    """Checks if the specified string is an IPv4 address in dotted-decimal notation.
+
+    Args:
+        address (str): An address to check.
+
+    Returns:
+        bool: True if the specified string is a valid IPv4 address, False otherwise.
+    """
+    matches = matchers.IPV4_ADDRESS.match(address)
+    return bool(matches) and all(int(octet) <= 255 for octet in matches.groups())
+
+
+def is_ipv6_address(address):
+    """Checks if the specified string is an IPv6 address, e.g. 2001:db8::1 or ::ffff:192.0.2.1.
+
+    Args:
+        address (str): An address to check.
+
+    Returns:
+        bool: True if the specified string is a valid IPv6 address, False otherwise.
+    """
+    # An IPv6 address contains at most 39 characters, or 45 with an embedded IPv4 address.
+    if len(address) > 45:
+        return False
+
+    if "::" in address:
+        # The '::' shorthand replaces one or more groups of zeros and may only be used once.
+        if address.count("::") > 1 or ":::" in address:
+            return False
+        head, tail = address.split("::")
+        head = head.split(":") if head else []
+        tail = __expand_ipv4_suffix(tail.split(":") if tail else [])
+        if tail is None or len(head) + len(tail) > 7:
+            return False
+        groups = head + tail
     else:
-        # The following code is inspired by the validators package from Konsta Vesterinen. Please
-        # refer to https://github.com/kvesteri/validators/blob/master/validators/url.py for more
-        # information.
-        regex = (
-            r'^[a-z]+://([^/:]+\.[a-z]{2,10}|([0-9]{{1,3}}\.)'
-            r'{{3}}[0-9]{{1,3}})(:[0-9]+)?(\/.*)?$'
-        )
-        return re.compile(regex).match(url)
+        groups = __expand_ipv4_suffix(address.split(":"))
+        if groups is None or len(groups) != 8:
+            return False
+
+    return all(matchers.IPV6_GROUP.match(g) for g in groups)
+
+
+def __expand_ipv4_suffix(groups):
+    """Replaces the IPv4 address that may end the specified IPv6 address groups (e.g. the
+    groups of ::ffff:192.0.2.1) with the two groups it takes up.
+
+    Args:
+        groups (list): A list of IPv6 address groups.
+
+    Returns:
+        list|None: The list of groups, or None if the groups end with an invalid IPv4 address.
+    """
+    if groups and "." in groups[-1]:
+        if not is_ipv4_address(groups[-1]):
+            return None
+        groups = groups[:-1] + ["0", "0"]
+
+    return groups
+
+
+def is_hostname(hostname):
+    """Checks if the specified string is a fully qualified domain name.
+
+    The name must contain at least two labels, e.g. example.com. Internationalized names
+    (e.g. bücher.example) are converted to their ASCII-compatible encoding before they are
+    checked.
+
+    Args:
+        hostname (str|unicode): A hostname to check.
+
+    Returns:
+        bool: True if the specified string is a valid hostname, False otherwise.
+    """
+    if len(hostname) <= 254 and matchers.HOSTNAME.match(hostname):
+        return True
+
+    # The name may still be an internationalized domain name, in which case it is checked
+    # once it has been converted to its ASCII-compatible encoding.
+    try:
+        if isinstance(hostname, str):
+            hostname = hostname.decode("UTF-8")
+        hostname.encode("ascii")
+    except UnicodeEncodeError:
+        try:
+            hostname = hostname.encode("idna")
+        except UnicodeError:
+            return False
+        return len(hostname) <= 254 and matchers.HOSTNAME.match(hostname) is not None
+    except UnicodeDecodeError:
+        return False
+
+    return False
 
 
 def is_iso_3166_1_alpha_2_code(code):
@@ -211,16 +543,10 @@ def is_iso_3166_1_alpha_2_code(code):
         bool: True if the specified code is a valid ISO 3166-1 alpha-2 code, False otherwise.
     """
     try:
-        if is_empty_string(code):
-            return False
-        else:
-            # TODO Optimize this: Regular expressions are a bit of an overkill.
-            matches = re.match("[A-Z]{2}", code)
-            return matches and matches.group() == code
+        return matchers.is_iso_3166_1_alpha_2_code(code)
     except TypeError:
-        # The is_empty_string function will raise a TypeError if the code argument is not a
-        # string. So if the argument is not a string, it stands to reason that it's not a
-        # valid ISO code.
+        # The matcher will raise a TypeError if the code argument is not a string. So if
+        # the argument is not a string, it stands to reason that it's not a valid ISO code.
         return False
 
 
@@ -237,15 +563,10 @@ def is_iso_15924_code(code):
         bool: True if the specified code is a valid ISO 15924 code, False otherwise.
     """
     try:
-        if is_empty_string(code):
-            return False
-        else:
-            matches = re.match("[A-Z]{1}[a-z]{3}", code)
-            return matches and matches.group() == code
+        return matchers.is_iso_15924_code(code)
     except TypeError:
-        # The is_empty_string function will raise a TypeError if the code argument is not a
-        # string. So if the argument is not a string, it stands to reason that it's not a
-        # valid ISO code.
+        # The matcher will raise a TypeError if the code argument is not a string. So if
+        # the argument is not a string, it stands to reason that it's not a valid ISO code.
         return False
 
 
@@ -271,13 +592,12 @@ def is_language_code(code):
         elif code in is_language_code.KNOWN_LANGUAGE_CODES:
             return True
         else:
-            matches = re.match(r"([a-z]{2,3})(-[a-zA-Z]{2,4})?", code)
-            if matches and matches.group() == code:
+            matches = matchers.LANGUAGE_CODE.match(code)
+            if matches:
                 valid = True
                 variety = matches.group(2)
                 if variety:
-                    variety = variety[1:] # Skip the hyphen separator.
-                    valid = is_iso_3166_1_alpha_2_code(variety) or is_iso_15924_code(variety)
+                    valid = matchers.is_iso_3166_1_alpha_2_code(variety) or matchers.is_iso_15924_code(variety)
 
                 if valid:
                     is_language_code.KNOWN_LANGUAGE_CODES.add(code)
@@ -351,13 +671,17 @@ def is_project_directory(path, check_writable=True): #pragma: no cover
 def sanitize_paths(paths): #pragma: no cover
     """Removes duplicates as well as paths that do not lead to a valid GeoTag-X project directory.
 
+    A path may also lead to a zip or tar archive, or to a directory in an archive, in which case
+    it is replaced by the paths of the projects found there (see archive.Archive). Note that
+    directories are not searched for projects: use a locator.ProjectLocator to do so.
+
     Args:
         paths (list): A list of paths to sanitize.
 
     Returns:
         list: A list of paths that contains no duplicates as well as directories that are
-            guaranteed to contain GeoTag-X configuration files. Note that the returned
-            list may be empty.
+            guaranteed to contain GeoTag-X configuration files. The paths retain the order in
+            which they were specified. Note that the returned list may be empty.
 
     Raises:
         TypeError: If the paths argument is not a list or one of its elements is not a string.
@@ -365,7 +689,8 @@ def sanitize_paths(paths): #pragma: no cover
     """
     check_arg_type(sanitize_paths, "paths", paths, list)
 
-    return filter(is_project_directory, set([os.path.realpath(p) for p in paths]))
+    from locator import ProjectLocator
+    return ProjectLocator(max_depth=0).locate(paths)
 
 
 def deserialize_json(filename): #pragma: no cover
@@ -385,11 +710,16 @@ def deserialize_json(filename): #pragma: no cover
         return json.loads(file.read(), object_pairs_hook=collections.OrderedDict)
 
 
-def deserialize_configuration_set(path): #pragma: no cover
+def deserialize_configuration_set(path, help_cache=None, help_jobs=1, located=False): #pragma: no cover
     """Deserializes the set of configuration files for GeoTag-X project located at the specified path.
 
     Args:
         path (str): A path to a directory containing a GeoTag-X project.
+        help_cache (cache.DiskCache): An optional cache of minified help.
+        help_jobs (int): The number of worker processes used to minify help files. Note that
+            a worker process cannot create its own pool of workers.
+        located (bool): If set to True, the path is known to lead to a project directory, e.g.
+            because it was found by a locator.ProjectLocator, so it is not checked again.
 
     Returns:
         dict|None: A dictionary containing deserialized JSON configurations if the specified
@@ -400,9 +730,29 @@ def deserialize_configuration_set(path): #pragma: no cover
         IOError: If the specified path is inaccessible or not a directory, or if a required
             configuration in the directory at the specified path is inaccessible.
     """
-    if not is_project_directory(path):
+    if not located and not is_project_directory(path):
         return None
 
+    deserialize_help_files = lambda filenames: _deserialize_help_files(filenames, help_cache, help_jobs)
+    return deserialize_project_files(path, deserialize_json, get_help_keys(path), deserialize_help_files)
+
+
+def deserialize_project_files(path, deserialize_json, help_keys, deserialize_help_files):
+    """Deserializes the set of configuration files for the GeoTag-X project located at the specified
+    path, where files are read by the specified functions. This allows projects to be read from
+    other locations than directories, e.g. archives.
+
+    Args:
+        path (str): A path to a GeoTag-X project.
+        deserialize_json (function): A function that deserializes the JSON file with a given
+            filename, or raises an IOError if it does not exist.
+        help_keys (set): The keys of the questions that have a help file.
+        deserialize_help_files (function): A function that deserializes a list of help files,
+            returning None for each file that could not be opened.
+
+    Returns:
+        dict: A dictionary containing deserialized JSON configurations.
+    """
     configurations = {}
     filepath = os.path.join(path, "{}.json")
     for key in ["project", "task_presenter", "tutorial"]:
@@ -413,23 +763,210 @@ def deserialize_configuration_set(path): #pragma: no cover
             if key in {"project", "task_presenter"}:
                 raise
 
-    # Add the questionnaire help.
+    # Add the questionnaire help. Only the help files found in the help directory are opened.
+    question_keys = set()
+    questions = []
     filepath = os.path.join(path, "help", "{}.html")
-    for question in configurations["task_presenter"]["questionnaire"]["questions"]:
-        key = question["key"]
-        filename = filepath.format(key)
+    # A questionnaire that is missing or malformed is left for the validator to report.
+    task_presenter = configurations["task_presenter"]
+    questionnaire = task_presenter.get("questionnaire") if isinstance(task_presenter, dict) else None
+    configuration = questionnaire.get("questions") if isinstance(questionnaire, dict) else None
+    for question in configuration if isinstance(configuration, list) else []:
+        key = get_help_key(question["key"])
+        question_keys.add(key)
+        if key in help_keys:
+            questions.append((question, filepath.format(key)))
+
+    filenames = [f for _, f in questions]
+    for (question, _), help in zip(questions, deserialize_help_files(filenames)):
+        # A help file may have been removed since the directory was scanned.
+        if help is not None:
+            question["help"] = help
+
+    warn_orphan_help_files(path, help_keys - question_keys)
+
+    return configurations
+
+
+def _deserialize_help_files(filenames, cache=None, jobs=1):
+    """Deserializes the specified help files, using a pool of worker processes if jobs is
+    greater than 1. The results are returned in the same order as the filenames, where None
+    denotes a file that could not be opened.
+    """
+    from functools import partial
+    deserialize = partial(_deserialize_help_file, cache=cache)
+    if jobs > 1 and len(filenames) > 1:
+        from multiprocessing import Pool
+        jobs = min(jobs, len(filenames))
+        pool = Pool(jobs)
         try:
-            file = open(filename)
-        except IOError:
-            # A help file is not always guaranteed to exist so if an IOError occurs, ignore it.
+            # Files are dispatched in batches to reduce the cost of communicating with the workers.
+            return pool.map(deserialize, filenames, max(1, len(filenames) // (jobs * 4)))
+        finally:
+            pool.terminate()
+            pool.join()
+
+    return map(deserialize, filenames)
+
+
+def _deserialize_help_file(filename, cache=None):
+    """Returns the minified HTML from the specified help file, or None if it could not be opened.
+    """
+    try:
+        return deserialize_help(filename, cache)
+    except IOError:
+        return None
+
+
+def get_help_keys(path): #pragma: no cover
+    """Returns the keys of the questions that have a help file in the GeoTag-X project located
+    at the specified path.
+
+    The help directory is scanned once, which is much cheaper than trying to open a help file
+    for each question, especially on network file systems. The os.scandir function (or the
+    scandir package) is used when available since it also tells files from directories.
+
+    Args:
+        path (str): A path to a directory containing a GeoTag-X project.
+
+    Returns:
+        set: The keys of the questions that have a help file, which is empty if the project
+            has no help directory.
+    """
+    directory = os.path.join(path, "help")
+    scandir = getattr(os, "scandir", None)
+    if scandir is None:
+        try:
+            from scandir import scandir
+        except ImportError:
             pass
+
+    try:
+        if scandir is not None:
+            filenames = [entry.name for entry in scandir(directory) if entry.is_file()]
         else:
-            with file:
-                from htmlmin import minify
-                filedata = file.read().decode("UTF-8").strip()
-                question["help"] = minify(filedata, remove_comments=True, remove_empty_space=True)
+            filenames = os.listdir(directory)
+    except OSError:
+        return set()
 
-    return configurations
+    return set(f[:-5] for f in filenames if f.endswith(".html"))
+
+
+def get_help_key(question_key):
+    """Returns the name, without its extension, of the help file of the question with the
+    specified key.
+
+    Args:
+        question_key: A question key, which may be of any type if the question is invalid.
+
+    Returns:
+        str: A byte string that can be compared to the names returned by get_help_keys. A
+            unicode key is encoded in UTF-8.
+    """
+    if isinstance(question_key, unicode):
+        return question_key.encode("utf-8")
+    return "{}".format(question_key)
+
+
+def warn_orphan_help_files(path, keys): #pragma: no cover
+    """Logs a warning about help files that do not match any question.
+
+    Args:
+        path (str): A path to a directory containing a GeoTag-X project.
+        keys (set): The keys of the orphan help files.
+    """
+    if keys:
+        import logging
+        filenames = sorted("{}.html".format(k) for k in keys)
+        logging.warning("The following help files in '%s' do not match any question: '%s'.", os.path.join(path, "help"), "', '".join(filenames))
+
+
+def deserialize_help(filename, cache=None): #pragma: no cover
+    """Returns the minified HTML from the help file with the specified filename.
+
+    Minification is a large share of the time it takes to deserialize a configuration set, so the
+    minified HTML may be stored in a persistent cache, keyed by the hash of the file's content and
+    the minifier's options.
+
+    Args:
+        filename: The name of the help file to deserialize.
+        cache (cache.DiskCache): An optional cache of minified help.
+
+    Returns:
+        unicode: The file's minified HTML.
+
+    Raises:
+        IOError: If the file with the specified filename could not be opened.
+    """
+    with open(filename, "rb") as file:
+        return deserialize_help_file(file, cache)
+
+
+def deserialize_help_file(file, cache=None):
+    """Returns the minified HTML read from the specified help file object.
+
+    Args:
+        file (file): A file object opened in binary mode.
+        cache (cache.DiskCache): An optional cache of minified help.
+
+    Returns:
+        unicode: The file's minified HTML.
+    """
+    import codecs
+    decoder = codecs.getincrementaldecoder("UTF-8")()
+    digest = None
+    if cache is not None:
+        import hashlib
+        # The key is the same as cache.get_key(signature, filedata), computed as the file is read.
+        digest = hashlib.sha1(_get_minifier_signature() + "\0")
+
+    # The file is read in chunks so that its raw content and decoded text are never both held in full.
+    parts = []
+    for chunk in iter(lambda: file.read(deserialize_help.CHUNK_SIZE), ""):
+        if digest is not None:
+            digest.update(chunk)
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode("", final=True))
+
+    if cache is not None:
+        key = digest.hexdigest()
+        minified = cache.get(key)
+        if minified is not None:
+            return minified.decode("UTF-8")
+
+    from htmlmin import minify
+    minified = minify(u"".join(parts).strip(), **deserialize_help.MINIFY_OPTIONS)
+    if cache is not None:
+        cache.set(key, minified.encode("UTF-8"))
+
+    return minified
+
+
+deserialize_help.CHUNK_SIZE = 65536
+"""The number of bytes read from a help file at a time."""
+
+deserialize_help.MINIFY_OPTIONS = {
+    "remove_comments": True,
+    "remove_empty_space": True,
+}
+"""The options passed to htmlmin.minify."""
+
+
+def _get_minifier_signature():
+    """Returns a string that identifies the minifier's version and options.
+    """
+    signature = _get_minifier_signature.SIGNATURE
+    if signature is None:
+        import htmlmin
+        options = sorted(deserialize_help.MINIFY_OPTIONS.iteritems())
+        signature = "htmlmin-{}\0{!r}".format(getattr(htmlmin, "__version__", ""), options)
+        _get_minifier_signature.SIGNATURE = signature
+
+    return signature
+
+
+_get_minifier_signature.SIGNATURE = None
+"""The minifier's signature, which is computed once."""
 
 
 def print_exception(exception, verbose=True):
@@ -446,3 +983,22 @@ def print_exception(exception, verbose=True):
         traceback.print_exc()
     else:
         print "{0}: {1}".format(exception.__class__.__name__, exception)
+
+
+def format_exception(exception, verbose=True):
+    """Returns an error message that describes the specified exception, which must be the
+    exception that is being handled. If the exception does not contain a message, the stack
+    trace is returned by default.
+
+    Args:
+        exception (Exception): The exception to describe.
+        verbose (bool): If set to True, the entire stack trace is returned.
+
+    Returns:
+        str: An error message.
+    """
+    if not str(exception) or verbose:
+        import traceback
+        return traceback.format_exc().rstrip()
+    else:
+        return "{0}: {1}".format(exception.__class__.__name__, exception)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains the locator used to discover GeoTag-X projects in directory trees.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+import stat
+from fnmatch import fnmatch
+from helper import check_arg_type
+
+class ProjectLocator(object):
+    """Discovers the GeoTag-X project directories located under a set of root directories.
+
+    Each directory is scanned once with os.scandir (or the scandir package, if available), and
+    each entry is stat'ed at most once. A directory that contains a project is not searched any
+    further, and a directory that can be reached from several paths (e.g. through symbolic links
+    or overlapping roots) is only searched once, since directories are identified by their device
+    and inode numbers.
+
+    A root may also be a zip or tar archive, or a directory in an archive, in which case the
+    projects are found in the archive (see archive.Archive).
+    """
+    def __init__(self, max_depth=None, exclude=None):
+        """Creates a project locator.
+
+        Args:
+            max_depth (int|None): The maximum depth of the directories searched below a root,
+                where 0 means that only the roots themselves are checked. If set to None, the
+                directory trees are searched in full.
+            exclude (list|None): A list of glob patterns. A directory is not searched if its name,
+                or its path relative to its root, matches a pattern. The patterns in
+                ProjectLocator.EXCLUDE are always applied.
+
+        Raises:
+            TypeError: If max_depth is not an integer or NoneType, or exclude is not a list or NoneType.
+        """
+        check_arg_type(self.__init__, "max_depth", max_depth, (int, type(None)))
+        check_arg_type(self.__init__, "exclude", exclude, (list, type(None)))
+
+        self.max_depth = max_depth
+        self.exclude = list(ProjectLocator.EXCLUDE) + (exclude or [])
+        self.__scandir = _get_scandir()
+
+    def locate(self, roots):
+        """Returns the paths of the projects located under the specified roots.
+
+        Args:
+            roots (list): A list of paths to directories or archives.
+
+        Returns:
+            list: A list of absolute paths to project directories, without duplicates. The projects
+                found under each root are sorted, and the roots retain the order in which they were
+                specified. Note that the returned list may be empty.
+
+        Raises:
+            TypeError: If the roots argument is not a list or one of its elements is not a string.
+            IOError: If a root is inaccessible, or neither a directory nor an archive.
+        """
+        check_arg_type(self.locate, "roots", roots, list)
+
+        projects = []
+        seen = set()
+        for root in roots:
+            check_arg_type(self.locate, "root", root, basestring)
+            root = os.path.abspath(root)
+            try:
+                status = os.stat(root)
+            except OSError:
+                status = None
+
+            if status is not None and stat.S_ISDIR(status.st_mode):
+                self.__search(root, root, status, 0, seen, projects)
+            else:
+                projects.extend(p for p in self.__locate_archived_projects(root) if p not in projects)
+
+        return projects
+
+    def __search(self, root, path, status, depth, seen, projects):
+        """Searches the directory at the specified path, which has the specified status, for projects.
+        """
+        identifier = (status.st_dev, status.st_ino)
+        if identifier in seen:
+            return
+        seen.add(identifier)
+
+        try:
+            entries = sorted(self.__scandir(path), key=lambda entry: entry.name)
+        except OSError:
+            if depth == 0:
+                raise IOError("The path '{}' is not a directory or you may not have the appropriate access permissions.".format(path))
+            return
+
+        files = set(e.name for e in entries if e.name in ProjectLocator.REQUIRED_FILES and _is_file(e))
+        if len(files) == len(ProjectLocator.REQUIRED_FILES):
+            projects.append(path)
+            return
+
+        if self.max_depth is not None and depth >= self.max_depth:
+            return
+
+        for entry in entries:
+            if _is_directory(entry) and not self.__is_excluded(root, entry):
+                try:
+                    status = entry.stat()
+                except OSError:
+                    continue
+                self.__search(root, entry.path, status, depth + 1, seen, projects)
+
+    def __is_excluded(self, root, entry):
+        """Checks if the specified directory entry matches an exclusion pattern.
+        """
+        relative_path = os.path.relpath(entry.path, root)
+        return any(fnmatch(entry.name, p) or fnmatch(relative_path, p) for p in self.exclude)
+
+    def __locate_archived_projects(self, path):
+        """Returns the projects in the archive at the specified path.
+        """
+        from archive import split_archive_path, get_archive
+        location = split_archive_path(path)
+        if location is None:
+            raise IOError("The path '{}' is not a directory or you may not have the appropriate access permissions.".format(path))
+
+        return get_archive(location[0]).find_projects(location[1])
+
+
+ProjectLocator.REQUIRED_FILES = frozenset(["project.json", "task_presenter.json"])
+"""The files that a directory must contain to be a project directory."""
+
+ProjectLocator.EXCLUDE = (".*",)
+"""The glob patterns of the directories that are never searched, e.g. .git directories."""
+
+
+def _get_scandir():
+    """Returns the os.scandir function, or the scandir package's implementation if it is not
+    available. If neither is available, an equivalent based on os.listdir is returned.
+    """
+    scandir = getattr(os, "scandir", None)
+    if scandir is None:
+        try:
+            from scandir import scandir
+        except ImportError:
+            scandir = lambda path: [_DirEntry(path, name) for name in os.listdir(path)]
+
+    return scandir
+
+
+class _DirEntry(object):
+    """A minimal equivalent of os.DirEntry, used when os.scandir is not available. Like os.DirEntry,
+    it stats its file at most once, and its is_dir and is_file methods may raise an OSError.
+    """
+    __slots__ = ("name", "path", "__status")
+
+    def __init__(self, directory, name):
+        self.name = name
+        self.path = os.path.join(directory, name)
+        self.__status = None
+
+    def stat(self):
+        if self.__status is None:
+            self.__status = os.stat(self.path)
+        return self.__status
+
+    def is_dir(self):
+        return stat.S_ISDIR(self.stat().st_mode)
+
+    def is_file(self):
+        return stat.S_ISREG(self.stat().st_mode)
+
+
+def _is_file(entry):
+    """Checks if the specified directory entry is a file or a symbolic link to a file.
+    """
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def _is_directory(entry):
+    """Checks if the specified directory entry is a directory or a symbolic link to a directory.
+    """
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains the precompiled lexical matchers shared by the key and code validators.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import re
+
+# Each pattern is anchored at the end of the string with \Z so that a match is a full match,
+# and compiled once when the module is imported. Note that re.match implicitly anchors the
+# pattern at the beginning of the string.
+
+KEY = re.compile(r"[a-zA-Z0-9_-]+\Z")
+"""Matches a key, i.e. a non-empty string of alphanumeric characters, hyphens or underscores."""
+
+ISO_3166_1_ALPHA_2_CODE = re.compile(r"[A-Z]{2}\Z")
+"""Matches an ISO 3166-1 alpha-2 code, e.g. GB, US or CH."""
+
+ISO_15924_CODE = re.compile(r"[A-Z][a-z]{3}\Z")
+"""Matches an ISO 15924 code, e.g. Latn, Cyrl or Arab."""
+
+LANGUAGE_CODE = re.compile(r"([a-z]{2,3})(?:-([a-zA-Z]{2,4}))?\Z")
+"""Matches a language code with an optional variety code, e.g. en, haw, en-GB or zh-Hans.
+The variety code, if any, is captured by the second group without its hyphen separator."""
+
+
+def is_key(key):
+    """Checks if the specified string is a key.
+
+    Args:
+        key (basestring): A string to check.
+
+    Returns:
+        bool: True if the specified string is a key, False otherwise.
+
+    Raises:
+        TypeError: If the key argument is not a string.
+    """
+    return KEY.match(key) is not None
+
+
+def is_iso_3166_1_alpha_2_code(code):
+    """Checks if the specified string is an ISO 3166-1 alpha-2 code.
+
+    Args:
+        code (basestring): A string to check.
+
+    Returns:
+        bool: True if the specified string is an ISO 3166-1 alpha-2 code, False otherwise.
+
+    Raises:
+        TypeError: If the code argument is not a string.
+    """
+    return ISO_3166_1_ALPHA_2_CODE.match(code) is not None
+
+
+def is_iso_15924_code(code):
+    """Checks if the specified string is an ISO 15924 code.
+
+    Args:
+        code (basestring): A string to check.
+
+    Returns:
+        bool: True if the specified string is an ISO 15924 code, False otherwise.
+
+    Raises:
+        TypeError: If the code argument is not a string.
+    """
+    return ISO_15924_CODE.match(code) is not None
+
+
+# The following matchers are used to validate URLs. Each part of a URL is delimited by characters
+# that the preceding part cannot contain and none of the patterns contains nested quantifiers over
+# overlapping character classes, so matching takes linear time regardless of the input.
+
+URL = re.compile(
+    r"([a-zA-Z][a-zA-Z0-9+.-]*)://"                  # The scheme,
+    r"(?:[^\x00-\x20\x7f/?#@\[\]]*@)?"                # the optional user information,
+    r"(\[[^\x00-\x20\x7f/?#@\[\]]*\]|[^\x00-\x20\x7f:/?#@\[\]]*)" # the host,
+    r"(?::([^\x00-\x20\x7f/?#]*))?"                   # the optional port,
+    r"(?:[/?#][^\x00-\x20\x7f]*)?\Z"                  # and the optional path, query and fragment.
+)
+"""Splits a URL into its scheme, host and port. The host of an IPv6 address includes its brackets.
+Note that a URL may never contain whitespace or control characters."""
+
+PORT = re.compile(r"[0-9]{1,5}\Z")
+"""Matches a port number with at most five digits."""
+
+IPV4_ADDRESS = re.compile(r"([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3})\Z")
+"""Matches a dotted-decimal IPv4 address. Each captured octet must still be checked for range."""
+
+IPV6_GROUP = re.compile(r"[0-9a-fA-F]{1,4}\Z")
+"""Matches a group of an IPv6 address."""
+
+HOSTNAME = re.compile(
+    r"(?:[a-zA-Z0-9_](?:[a-zA-Z0-9_-]{0,61}[a-zA-Z0-9_])?\.)+"
+    r"(?:[a-zA-Z]{2,63}|xn--[a-zA-Z0-9-]{0,58}[a-zA-Z0-9])\.?\Z"
+)
+"""Matches an ASCII hostname with at least two labels, where the last label is an alphabetic or
+punycode-encoded (internationalized) top-level domain. Each label contains at most 63 characters
+and neither begins nor ends with a hyphen. Since labels are delimited by dots that they cannot
+contain, backtracking is bounded by the length of a label."""
@@ -0,0 +1,541 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains the profilers used to measure the time and memory spent validating projects.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import sys
+from types import FunctionType, GeneratorType
+from timeit import default_timer
+
+class Profiler(object):
+    """A profiler that measures the time spent in each validator.
+
+    Profiling has no cost until the profiler is enabled: enabling it replaces every validator
+    function with a timed wrapper, wherever the function is referenced (module namespaces,
+    schemas and dispatch tables), and disabling it restores the original functions.
+
+    The statistics map a validator's name, e.g. 'helper.is_normalized_string', to a list
+    containing its number of calls, its cumulative time and its self time, i.e. the time
+    spent in the validator itself and not in the validators it calls. If a validator returns
+    a generator, the time spent producing each of its values is attributed to it.
+    """
+    def __init__(self, modules=None):
+        """Creates a profiler.
+
+        Args:
+            modules (list|None): The names of the modules whose validators are profiled.
+                If set to None, Profiler.MODULES is used.
+        """
+        self.modules = Profiler.MODULES if modules is None else modules
+        self.statistics = {}
+        self.__stack = []
+        self.__depth = {}
+        self.__patches = None
+
+    @property
+    def enabled(self):
+        """Checks if the profiler is enabled.
+        """
+        return self.__patches is not None
+
+    def enable(self):
+        """Instruments the validators. This has no effect if the profiler is already enabled.
+        """
+        if self.enabled:
+            return
+
+        wrappers = {}
+        for name in self.modules:
+            __import__(name)
+            for key, value in vars(sys.modules[name]).items():
+                if _is_profiled(value, name):
+                    wrappers[value] = self.__wrap(value, "{}.{}".format(name, key))
+
+        try:
+            import htmlmin
+            wrappers[htmlmin.minify] = self.__wrap(htmlmin.minify, "htmlmin.minify")
+        except ImportError:
+            pass
+
+        # Replace every reference to an instrumented function, and record how to restore it.
+        patches = []
+        for module in sys.modules.values():
+            if module is not None:
+                patches.extend(_patch(vars(module), wrappers))
+        for f in wrappers:
+            for value in vars(f).itervalues():
+                if isinstance(value, dict):
+                    patches.extend(_patch(value, wrappers))
+                elif isinstance(getattr(value, "validators", None), dict):
+                    patches.extend(_patch_schema(value.validators, wrappers))
+
+        self.__patches = patches
+
+    def disable(self):
+        """Restores the original validators. This has no effect if the profiler is not enabled.
+        """
+        if not self.enabled:
+            return
+
+        for namespace, key, value in reversed(self.__patches):
+            namespace[key] = value
+        self.__patches = None
+
+    def reset(self):
+        """Clears the profiler's statistics and returns them.
+        """
+        statistics = self.statistics
+        self.statistics = {}
+        return statistics
+
+    def __wrap(self, f, name):
+        """Returns a timed wrapper of the specified function.
+        """
+        from functools import wraps
+
+        @wraps(f, updated=())
+        def wrapper(*args, **kwargs):
+            self.__enter(name)
+            start = default_timer()
+            try:
+                result = f(*args, **kwargs)
+            finally:
+                self.__exit(name, start, 1)
+
+            return self.__iter(result, name) if isinstance(result, GeneratorType) else result
+
+        # Function attributes are shared so that tables such as X.SCHEMA remain the same objects.
+        wrapper.__dict__ = f.__dict__
+        return wrapper
+
+    def __iter(self, generator, name):
+        """Generates the values of the specified generator, timing the production of each value.
+        """
+        while True:
+            self.__enter(name)
+            start = default_timer()
+            try:
+                value = next(generator)
+            except StopIteration:
+                self.__exit(name, start, 0)
+                return
+            except:
+                self.__exit(name, start, 0)
+                raise
+
+            self.__exit(name, start, 0)
+            yield value
+
+    def __enter(self, name):
+        """Records that the validator with the specified name is being executed.
+        """
+        self.__stack.append(0.0)
+        self.__depth[name] = self.__depth.get(name, 0) + 1
+
+    def __exit(self, name, start, calls):
+        """Records that the validator with the specified name, which started executing at the
+        specified time, has returned.
+        """
+        elapsed = default_timer() - start
+        children = self.__stack.pop()
+        if self.__stack:
+            self.__stack[-1] += elapsed
+
+        depth = self.__depth[name] - 1
+        self.__depth[name] = depth
+
+        entry = self.statistics.get(name)
+        if entry is None:
+            entry = self.statistics[name] = [0, 0.0, 0.0]
+        entry[0] += calls
+        entry[2] += elapsed - children
+        # The time spent in recursive calls is already part of the outermost call.
+        if depth == 0:
+            entry[1] += elapsed
+
+
+Profiler.MODULES = [
+    "helper",
+    "project",
+    "question",
+    "task_presenter",
+    "tutorial",
+    "core",
+    "stream",
+    "watch",
+]
+"""The modules whose validators are profiled by default."""
+
+Profiler.PREFIXES = ("is_", "are_", "iter_", "deserialize_")
+"""The name prefixes of the functions that are profiled, disregarding leading underscores."""
+
+
+def _is_profiled(value, module):
+    """Checks if the specified module member is a validator that should be profiled.
+    """
+    return (
+        isinstance(value, FunctionType) and
+        value.__module__ == module and
+        value.__name__.lstrip("_").startswith(Profiler.PREFIXES)
+    )
+
+
+def _patch(namespace, wrappers):
+    """Replaces every function in the specified namespace that has a wrapper, and returns
+    a list of (namespace, key, original value) tuples.
+    """
+    patches = []
+    for key, value in namespace.items():
+        try:
+            wrapper = wrappers.get(value)
+        except TypeError:
+            # The value is not hashable, so it cannot be a function.
+            continue
+        if wrapper is not None:
+            patches.append((namespace, key, value))
+            namespace[key] = wrapper
+
+    return patches
+
+
+def _patch_schema(validators, wrappers):
+    """Replaces every field validator in the specified schema validators that has a wrapper,
+    and returns a list of (namespace, key, original value) tuples.
+    """
+    patches = []
+    for key, entry in validators.items():
+        wrapper = wrappers.get(entry[0])
+        if wrapper is not None:
+            patches.append((validators, key, entry))
+            validators[key] = (wrapper, entry[1])
+
+    return patches
+
+
+def merge_statistics(statistics, other):
+    """Adds the specified statistics to another set of statistics.
+
+    Args:
+        statistics (dict): The statistics to update.
+        other (dict): The statistics to add.
+    """
+    for name, (calls, cumulative, self_time) in other.iteritems():
+        entry = statistics.setdefault(name, [0, 0.0, 0.0])
+        entry[0] += calls
+        entry[1] += cumulative
+        entry[2] += self_time
+
+
+def format_statistics(statistics, title):
+    """Returns a table of the specified statistics, sorted by decreasing self time.
+
+    Args:
+        statistics (dict): A set of statistics, as collected by a Profiler.
+        title (str): The table's title.
+
+    Returns:
+        str: The formatted table.
+    """
+    width = max([len(name) for name in statistics] + [len("validator")])
+    row = "  {:<%d}  {:>9}  {:>12}  {:>12}" % width
+    lines = [title, row.format("validator", "calls", "cumul. (ms)", "self (ms)")]
+    for name, (calls, cumulative, self_time) in sorted(statistics.iteritems(), key=lambda item: (-item[1][2], item[0])):
+        lines.append(row.format(name, calls, "{:.3f}".format(cumulative * 1e3), "{:.3f}".format(self_time * 1e3)))
+
+    return "\n".join(lines)
+
+
+class MemoryProfiler(object):
+    """A profiler that measures the memory allocated while each stage of a validation is performed.
+
+    For each stage, the profiler records the peak memory allocated during the stage and the
+    memory still allocated once it has completed (i.e. retained by the stage's result). If the
+    tracemalloc module is available, the retained memory is also broken down by the source
+    location that allocated it. Otherwise, the stage is first performed in a forked process whose
+    peak resident set size, less its resident set size before the stage, is the stage's peak, and
+    the retained memory is the size of the stage's result. The peak is None if the platform cannot
+    fork, or if the stage raises an exception in the forked process.
+    """
+    def __init__(self, limit=None):
+        """Creates a memory profiler.
+
+        Args:
+            limit (int|None): The number of source locations reported for each stage. If set
+                to None, MemoryProfiler.LIMIT is used.
+        """
+        try:
+            import tracemalloc
+        except ImportError:
+            tracemalloc = None
+
+        self.tracemalloc = tracemalloc
+        self.limit = MemoryProfiler.LIMIT if limit is None else limit
+        self.statistics = {}
+
+    def measure(self, stage, f, *args):
+        """Calls the specified function with the specified arguments and records the memory it
+        allocates as the specified stage.
+
+        Args:
+            stage (str): The name of the stage.
+            f (function): The function that performs the stage.
+            *args: The arguments passed to f.
+
+        Returns:
+            The value returned by f.
+        """
+        if self.tracemalloc is not None:
+            return self.__measure_traces(stage, f, args)
+        else:
+            return self.__measure_sizes(stage, f, args)
+
+    def reset(self):
+        """Clears the profiler's statistics and returns them.
+        """
+        statistics = self.statistics
+        self.statistics = {}
+        return statistics
+
+    def __measure_traces(self, stage, f, args):
+        """Measures a stage with tracemalloc.
+        """
+        tracemalloc = self.tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        # Memory allocated before the stage is no longer traced, so releasing it does not
+        # offset the stage's own allocations.
+        tracemalloc.clear_traces()
+        result = f(*args)
+        retained, peak = tracemalloc.get_traced_memory()
+
+        locations = []
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        for statistic in snapshot.statistics("lineno")[:self.limit]:
+            frame = statistic.traceback[0]
+            location = "{}:{}".format(frame.filename, frame.lineno)
+            locations.append((location, statistic.size, statistic.count))
+
+        self.statistics[stage] = (peak, retained, locations)
+        return result
+
+    def __measure_sizes(self, stage, f, args):
+        """Measures a stage without tracemalloc.
+        """
+        peak = _measure_peak_resident_size(f, args)
+        result = f(*args)
+        self.statistics[stage] = (peak, _get_deep_size(result), None)
+        return result
+
+
+MemoryProfiler.LIMIT = 10
+"""The default number of source locations reported for each stage."""
+
+MemoryProfiler.STAGES = ["load", "validation", "stream", "coverage", "total"]
+"""The stages of a validation, in the order in which they are performed. The 'stream' stage
+loads and validates a project at once, and 'total' only appears in a summary of a batch."""
+
+
+def _measure_peak_resident_size(f, args):
+    """Calls the specified function with the specified arguments in a forked process, and returns
+    the peak memory it allocated in bytes, or None if it cannot be measured.
+
+    A forked process starts with a peak resident set size close to its resident set size, so its
+    peak is not hidden by the memory that the parent process, or an earlier stage, once used.
+    """
+    import os
+    if not hasattr(os, "fork"):
+        return None
+
+    # Buffered output would otherwise be written by both processes.
+    sys.stdout.flush()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            size = _get_resident_size()
+            if size is None:
+                size = _get_peak_resident_size()
+            f(*args)
+            os.write(write_fd, str(max(_get_peak_resident_size() - size, 0)))
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as file:
+        data = file.read()
+    os.waitpid(pid, 0)
+    return int(data) if data else None
+
+
+def _get_peak_resident_size():
+    """Returns the peak resident set size of the current process, in bytes.
+    """
+    import resource
+    size = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # The peak resident set size is expressed in bytes on macOS, and in kibibytes elsewhere.
+    return size if sys.platform == "darwin" else size * 1024
+
+
+def _get_resident_size():
+    """Returns the resident set size of the current process in bytes, or None if it cannot be read.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+    except (IOError, IndexError, ValueError):
+        return None
+
+    import resource
+    return pages * resource.getpagesize()
+
+
+def _get_deep_size(value):
+    """Returns the size, in bytes, of the specified value and every object it contains.
+    """
+    size = 0
+    seen = set()
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(value)
+
+    return size
+
+
+def merge_memory_statistics(summary, statistics):
+    """Adds the memory statistics of a project to a summary of a batch of projects.
+
+    A summary maps each stage to a list containing the number of projects, the largest peak,
+    the largest retained memory and the total retained memory. The 'total' stage records the
+    largest amount of memory that was allocated at once while a project was validated, i.e.
+    the peak of the last stage plus the memory retained by the stages before it. Peaks that
+    are unknown are ignored, and the largest peak is None if every peak is unknown.
+
+    Args:
+        summary (dict): The summary to update.
+        statistics (dict): A project's memory statistics, as collected by a MemoryProfiler.
+    """
+    total = None
+    retained = 0
+    for stage in _sort_stages(statistics):
+        peak, stage_retained, _ = statistics[stage]
+        entry = summary.setdefault(stage, [0, None, 0, 0])
+        entry[0] += 1
+        entry[1] = _max_peak(entry[1], peak)
+        entry[2] = max(entry[2], stage_retained)
+        entry[3] += stage_retained
+        total = _max_peak(total, retained + peak if peak is not None else None)
+        retained += stage_retained
+
+    entry = summary.setdefault("total", [0, None, 0, 0])
+    entry[0] += 1
+    entry[1] = _max_peak(entry[1], total)
+    entry[2] = max(entry[2], retained)
+    entry[3] += retained
+
+
+def format_memory_statistics(statistics, title):
+    """Returns a report of the specified memory statistics.
+
+    Args:
+        statistics (dict): A project's memory statistics, as collected by a MemoryProfiler.
+        title (str): The report's title.
+
+    Returns:
+        str: The formatted report.
+    """
+    lines = [title]
+    if any(locations is None for _, _, locations in statistics.itervalues()):
+        lines.append("  (tracemalloc is not available: each peak is measured in a forked process, and the retained memory is the size of the stage's result)")
+    for stage in _sort_stages(statistics):
+        peak, retained, locations = statistics[stage]
+        lines.append("  {}: {}, {} retained".format(stage, _format_peak(peak), _format_size(retained)))
+        for location, size, count in locations or []:
+            lines.append("    {:>10}  {:>8} block(s)  {}".format(_format_size(size), count, location))
+
+    return "\n".join(lines)
+
+
+def format_memory_summary(summary, title):
+    """Returns a table of the specified summary of memory statistics.
+
+    Args:
+        summary (dict): A summary of memory statistics, as built by merge_memory_statistics.
+        title (str): The table's title.
+
+    Returns:
+        str: The formatted table.
+    """
+    row = "  {:<12}  {:>8}  {:>12}  {:>14}  {:>14}"
+    lines = [title, row.format("stage", "projects", "max. peak", "max. retained", "mean retained")]
+    for stage in _sort_stages(summary):
+        projects, peak, retained, total = summary[stage]
+        peak = _format_size(peak) if peak is not None else "unavailable"
+        lines.append(row.format(stage, projects, peak, _format_size(retained), _format_size(total // projects)))
+
+    return "\n".join(lines)
+
+
+def _sort_stages(statistics):
+    """Returns the stages of the specified statistics in the order in which they are performed.
+    """
+    order = MemoryProfiler.STAGES
+    return sorted(statistics, key=lambda stage: order.index(stage) if stage in order else len(order))
+
+
+def _max_peak(peak, other):
+    """Returns the larger of the specified peaks, where None is an unknown peak.
+    """
+    return other if peak is None else peak if other is None else max(peak, other)
+
+
+def _format_peak(peak):
+    """Returns a human-readable representation of the specified peak, which may be unknown.
+    """
+    return "{} peak".format(_format_size(peak)) if peak is not None else "peak unavailable"
+
+
+def _format_size(size):
+    """Returns a human-readable representation of the specified number of bytes.
+    """
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(size) < 1024:
+            return "{:.1f} {}".format(size, unit) if unit != "B" else "{} {}".format(size, unit)
+        size /= 1024.0
+
+    return "{:.1f} GiB".format(size)
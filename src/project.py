@@ -25,7 +25,9 @@
 # DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
 # OR OTHER DEALINGS IN THE SOFTWARE.
-from helper import check_arg_type, is_configuration, is_empty_string, is_url
+from helper import check_arg_type, is_empty_string, is_url
+from schema import Schema
+from matchers import is_key
 
 def is_project_configuration(configuration):
     """Validates the specified project configuration.
@@ -40,19 +42,22 @@ def is_project_configuration(configuration):
     Raises:
         TypeError: If the configuration argument is not a dictionary.
     """
-    return is_configuration(
-        configuration,
-        required_fields=frozenset(["name", "short_name", "description"]),
-        field_validators={
-            "name": is_project_name,
-            "short_name": is_project_short_name,
-            "description": is_project_description,
-            "repository": is_project_repository,
-            "track": is_project_track,
-        },
-        missing_field_message="The project configuration is missing the following field(s): '{}'.",
-        unexpected_field_message="The project configuration key '{}' is not recognized."
-    )
+    return is_project_configuration.SCHEMA.validate(configuration)
+
+
+def iter_project_configuration_errors(configuration):
+    """Returns a generator of every error found in the specified project configuration.
+
+    Args:
+        configuration (dict): A project configuration to validate.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If the configuration argument is not a dictionary.
+    """
+    return is_project_configuration.SCHEMA.iter_errors(configuration)
 
 
 def is_project_name(name):
@@ -88,13 +93,7 @@ def is_project_short_name(short_name):
     """
     ERROR_MESSAGE = "A short name must be a non-empty string containing only of alphanumeric characters (a-z, A-Z, 0-9), hyphens (-) and underscores (_)."
     try:
-        if is_empty_string(short_name):
-            return (False, ERROR_MESSAGE)
-        else:
-            from re import match
-            matches = match(r"[a-zA-Z0-9-_]+", short_name)
-            matched = matches and (matches.group() == short_name)
-            return (True, None) if matched else (False, ERROR_MESSAGE)
+        return (True, None) if is_key(short_name) else (False, ERROR_MESSAGE)
     except TypeError:
         return (False, "The 'short_name' argument must be a string.")
 
@@ -150,3 +149,18 @@ def is_project_track(track):
     """
     ERROR_MESSAGE = "The 'track' argument must be a boolean."
     return (True, None) if isinstance(track, bool) else (False, ERROR_MESSAGE)
+
+
+is_project_configuration.SCHEMA = Schema(
+    required_fields=frozenset(["name", "short_name", "description"]),
+    field_validators={
+        "name": is_project_name,
+        "short_name": is_project_short_name,
+        "description": is_project_description,
+        "repository": is_project_repository,
+        "track": is_project_track,
+    },
+    missing_field_message="The project configuration is missing the following field(s): '{}'.",
+    unexpected_field_message="The project configuration key '{}' is not recognized."
+)
+"""The project configuration schema."""
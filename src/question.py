@@ -25,7 +25,9 @@
 # DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
 # OR OTHER DEALINGS IN THE SOFTWARE.
-from helper import check_arg_type, is_configuration, is_empty_string, is_configuration_string
+from helper import check_arg_type, is_empty_string, is_configuration_string, LanguageContext
+from schema import Schema
+from matchers import is_key
 
 def is_question(question, available_languages=None):
     """Validates the specified question configuration.
@@ -41,7 +43,7 @@ def is_question(question, available_languages=None):
 
     Args:
         question (dict): A question configuration to validate.
-        available_languages (list): A list of available languages.
+        available_languages (list|LanguageContext): A list of available languages, or a language context.
 
     Returns:
         <bool, str|None>: A pair containing the value True if the specified configuration
@@ -49,22 +51,26 @@ def is_question(question, available_languages=None):
 
     Raises:
         TypeError: If the question argument is not a dictionary or available_languages is
-        not a list or NoneType.
+        not a list, LanguageContext or NoneType.
     """
-    return is_configuration(
-        question,
-        required_fields=frozenset(["key", "title", "input"]),
-        field_validators={
-            "key": is_question_key,
-            "title": lambda t: is_question_title(t, available_languages),
-            "hint": lambda h: is_question_help(h, available_languages),
-            "help": lambda h: is_question_help(h, available_languages),
-            "input": lambda i: is_question_input(i, available_languages),
-            "branch": is_question_branch,
-        },
-        missing_field_message="The question configuration is missing the following field(s): '{}'.",
-        unexpected_field_message="The question configuration key '{}' is not recognized."
-    )
+    return is_question.SCHEMA.validate(question, available_languages)
+
+
+def iter_question_errors(question, available_languages=None):
+    """Returns a generator of every error found in the specified question configuration.
+
+    Args:
+        question (dict): A question configuration to validate.
+        available_languages (list|LanguageContext): A list of available languages, or a language context.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If the question argument is not a dictionary or available_languages is
+        not a list, LanguageContext or NoneType.
+    """
+    return is_question.SCHEMA.iter_errors(question, available_languages)
 
 
 def __is_key(key):
@@ -82,12 +88,10 @@ def __is_key(key):
     Raises:
         TypeError: If the key argument is not a string.
     """
-    if is_empty_string(key):
-        return False
-    else:
-        from re import match
-        matches = match("[a-zA-Z0-9-_]+", key)
-        return matches and matches.group() == key
+    if not isinstance(key, basestring):
+        check_arg_type(is_empty_string, "empty_string", key, basestring)
+
+    return is_key(key)
 
 
 def is_question_key(key):
@@ -153,7 +157,7 @@ def is_question_title(question_title, languages=None):
 
     Raises:
         TypeError: If the question_title argument is not a string or dictionary, or if
-            languages is not a list or NoneType.
+            languages is not a list, LanguageContext or NoneType.
     """
     if not is_configuration_string(question_title, languages):
         return (False, "A question title must be a non-empty or normalized string.")
@@ -177,7 +181,7 @@ def is_question_help(question_help, languages=None):
 
     Raises:
         TypeError: If the question_help argument is not a string or dictionary, or if
-            languages is not a list or NoneType.
+            languages is not a list, LanguageContext or NoneType.
     """
     if not is_configuration_string(question_help, languages):
         return (False, "A question help field must be a non-empty or normalized string.")
@@ -216,6 +220,46 @@ def is_question_branch(question_branch):
     return (True, None)
 
 
+def get_branch_targets(question_branch):
+    """Returns the keys that the specified question branch leads to.
+
+    Args:
+        question_branch (str|dict): A question branch.
+
+    Returns:
+        list: The keys that the branch leads to, in no particular order. If the branch is
+            neither a string nor a dictionary, the list is empty.
+    """
+    if isinstance(question_branch, basestring):
+        return [question_branch]
+    elif isinstance(question_branch, dict):
+        return question_branch.values()
+    return []
+
+
+def iter_branch_target_errors(question_key, question_branch, question_keys):
+    """Returns a generator of every target of the specified question branch that does not
+    resolve to a question or a reserved key.
+
+    Any valid reserved key, e.g. '_end', is accepted since a reserved key leads out of the
+    questionnaire, and is_question_branch has never restricted which reserved keys may be used.
+    Targets that are not valid keys are ignored since they are reported by is_question_branch.
+
+    Args:
+        question_key (str): The key of the question that the branch belongs to.
+        question_branch (str|dict): The question branch to resolve.
+        question_keys (dict|set): An index of the questionnaire's question keys.
+
+    Returns:
+        generator: A generator of error messages.
+    """
+    for target in get_branch_targets(question_branch):
+        if not isinstance(target, basestring) or not is_key(target) or target[0] == '_':
+            continue
+        elif target not in question_keys:
+            yield u"The question '{}' branches to the unknown question '{}'.".format(question_key, target)
+
+
 def is_question_input_type(input_type):
     """Validates the specified question input type.
 
@@ -288,7 +332,9 @@ def __is_multiple_option_input(question_input, languages=None):
         if not isinstance(options, list) or len(options) < 1:
             return (False, "The 'options' field must be a non-empty list.")
         else:
-            for option in options:
+            positions = {}
+            duplicates = []
+            for position, option in enumerate(options):
                 label = option.get("label")
                 error = (False, "An option label must be a non-empty or normalized string.")
                 try:
@@ -301,6 +347,11 @@ def __is_multiple_option_input(question_input, languages=None):
                 if value is None or not isinstance(value, basestring):
                     return (False, "An option value must be a string.")
 
+                value_positions = positions.setdefault(value, [])
+                value_positions.append(position)
+                if len(value_positions) == 2:
+                    duplicates.append(value)
+
                 # If the 'enable-illustrations' flag is set to True, validate illustrations.
                 illustration = option.get("illustration") if enable_illustrations else None
                 if illustration is not None:
@@ -316,6 +367,11 @@ def __is_multiple_option_input(question_input, languages=None):
                                 return (False, "An illustration's '{}' field must be a non-empty string.".format(key))
                         except:
                             return (False, "An illustration's '{}' field must be a string.".format(key))
+
+            if duplicates:
+                format_positions = lambda v: ", ".join(str(p + 1) for p in positions[v])
+                duplicates = u", ".join(u"'{}' (positions {})".format(v, format_positions(v)) for v in duplicates)
+                return (False, u"The following option values are not unique: {}.".format(duplicates))
     else:
         return (False, "The 'options' field must be a non-empty list.")
 
@@ -453,10 +509,10 @@ def is_question_input(question_input, languages=None):
 
     Raises:
         TypeError: If the question_input argument is not a dictionary, or if languages
-            is not a list or NoneType.
+            is not a list, LanguageContext or NoneType.
     """
     check_arg_type(is_question_input, "question_input", question_input, dict)
-    check_arg_type(is_question_input, "languages", languages, (list, type(None)))
+    check_arg_type(is_question_input, "languages", languages, (list, LanguageContext, type(None)))
 
     missing_fields = [k for k in is_question_input.REQUIRED_FIELDS if k not in question_input or question_input[k] is None]
     if missing_fields:
@@ -544,3 +600,20 @@ is_question_input.VALIDATORS = {
     "geotagging": __is_geotagging_input,
 }
 """A collection of question input validators."""
+
+
+is_question.SCHEMA = Schema(
+    required_fields=frozenset(["key", "title", "input"]),
+    field_validators={
+        "key": is_question_key,
+        "title": is_question_title,
+        "hint": is_question_help,
+        "help": is_question_help,
+        "input": is_question_input,
+        "branch": is_question_branch,
+    },
+    missing_field_message="The question configuration is missing the following field(s): '{}'.",
+    unexpected_field_message="The question configuration key '{}' is not recognized.",
+    contextual_fields=frozenset(["title", "hint", "help", "input"])
+)
+"""The question configuration schema. Its contextual fields expect a list of available languages."""
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains the compiled configuration schemas used by the validators.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+from helper import check_arg_type, is_configuration
+
+class Schema(object):
+    """A compiled configuration schema.
+
+    A schema holds the same information as the arguments to helper.is_configuration, i.e. a set
+    of required fields, a validator for each recognized field and the messages used to report
+    missing and unrecognized fields. It is meant to be created once, when a module is imported,
+    so that validating a configuration does not rebuild any of that information.
+
+    A field validator is called with the field's value. If the field is contextual, the validator
+    is also passed the context given to the validate and iter_errors methods, e.g. a list of
+    available languages. A field validator may either return a <bool, str|None> pair or an
+    iterable of error messages.
+    """
+    __slots__ = (
+        "required_fields",
+        "validators",
+        "missing_field_message",
+        "unexpected_field_message",
+    )
+
+    def __init__(
+        self,
+        required_fields=None,
+        field_validators=None,
+        missing_field_message=None,
+        unexpected_field_message=None,
+        contextual_fields=None
+    ):
+        """Compiles the specified schema.
+
+        Args:
+            required_fields (frozenset): A set of fields that a configuration must contain.
+            field_validators (dict): A dictionary that maps each recognized field to its validator.
+            missing_field_message (str): A message used to report missing required fields.
+            unexpected_field_message (str): A message used to report unrecognized fields.
+            contextual_fields (frozenset): A set of fields whose validators expect a context.
+        """
+        contextual_fields = contextual_fields or frozenset()
+        self.required_fields = required_fields or frozenset()
+        self.validators = None
+        if field_validators:
+            self.validators = dict((k, (v, k in contextual_fields)) for k, v in field_validators.iteritems())
+        self.missing_field_message = missing_field_message or "The configuration is missing the following field(s): '{}'."
+        self.unexpected_field_message = unexpected_field_message or "The configuration key '{}' is not recognized."
+
+    def validate(self, configuration, context=None):
+        """Validates the specified configuration, stopping at the first error.
+
+        Args:
+            configuration (dict): A configuration to validate.
+            context: A value passed to the validators of contextual fields.
+
+        Returns:
+            <bool, str|None>: A pair containing the value True if the specified configuration
+                is valid, False otherwise; and an error message in case it is invalid.
+
+        Raises:
+            TypeError: If the configuration argument is not a dictionary.
+        """
+        if not isinstance(configuration, dict):
+            check_arg_type(is_configuration, "configuration", configuration, dict)
+
+        for key in self.required_fields:
+            if configuration.get(key) is None:
+                return (False, self.get_missing_fields_message(configuration))
+
+        validators = self.validators
+        if validators is not None:
+            for key, value in configuration.iteritems():
+                entry = validators.get(key)
+                if entry is None:
+                    return (False, self.unexpected_field_message.format(key))
+
+                validator, contextual = entry
+                result = validator(value, context) if contextual else validator(value)
+                if isinstance(result, tuple):
+                    if not result[0]:
+                        return (False, result[1])
+                else:
+                    for message in result:
+                        return (False, message)
+
+        return (True, None)
+
+    def iter_errors(self, configuration, context=None):
+        """Returns a generator of every error found in the specified configuration.
+
+        Args:
+            configuration (dict): A configuration to validate.
+            context: A value passed to the validators of contextual fields.
+
+        Returns:
+            generator: A generator of error messages.
+
+        Raises:
+            TypeError: If the configuration argument is not a dictionary.
+        """
+        if not isinstance(configuration, dict):
+            check_arg_type(is_configuration, "configuration", configuration, dict)
+
+        return self.__iter_errors(configuration, context)
+
+    def __iter_errors(self, configuration, context):
+        """Generates the errors found in the specified configuration.
+        """
+        message = self.get_missing_fields_message(configuration)
+        if message is not None:
+            yield message
+
+        if self.validators is not None:
+            for key, value in configuration.iteritems():
+                for message in self.__iter_field_errors(key, value, context):
+                    yield message
+
+    def iter_field_errors(self, key, value, context=None):
+        """Returns a generator of the errors found in a single field of a configuration.
+
+        This allows a configuration to be validated one field at a time, e.g. while it is being
+        deserialized. Note that missing fields are not reported.
+
+        Args:
+            key (str): The field's key.
+            value: The field's value.
+            context: A value passed to the field's validator if the field is contextual.
+
+        Returns:
+            generator: A generator of error messages.
+        """
+        return self.__iter_field_errors(key, value, context)
+
+    def __iter_field_errors(self, key, value, context):
+        """Generates the errors found in the specified field.
+        """
+        if self.validators is None:
+            # Any field is accepted.
+            return
+
+        entry = self.validators.get(key)
+        if entry is None:
+            yield self.unexpected_field_message.format(key)
+        elif value is None and key in self.required_fields:
+            # The field is reported as missing.
+            return
+        else:
+            validator, contextual = entry
+            result = validator(value, context) if contextual else validator(value)
+            if isinstance(result, tuple):
+                if not result[0]:
+                    yield result[1]
+            else:
+                for message in result:
+                    yield message
+
+    def is_contextual(self, key):
+        """Checks if the validator of the field with the specified key expects a context.
+        """
+        entry = self.validators.get(key) if self.validators is not None else None
+        return entry is not None and entry[1]
+
+    def get_missing_fields_message(self, configuration):
+        """Returns the message that reports the required fields missing from the specified configuration.
+
+        Args:
+            configuration (dict): A configuration.
+
+        Returns:
+            str|None: The message, or None if the configuration contains every required field.
+        """
+        missing_fields = [k for k in self.required_fields if configuration.get(k) is None]
+        return self.missing_field_message.format("', '".join(missing_fields)) if missing_fields else None
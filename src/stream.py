@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains an incremental JSON reader and the validation of projects whose questionnaires are
+# deserialized one question at a time.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+import re
+from collections import OrderedDict
+
+class JSONReader(object):
+    """An incremental JSON reader.
+
+    The reader allows a document's objects and arrays to be traversed one member at a time,
+    while any other value is deserialized as a whole. Data is read from the file as it is
+    needed, so the reader's memory use is bounded by the largest value it deserializes rather
+    than the size of the document.
+    """
+    NUMBER_CHARACTERS = re.compile(r"[-+.0-9eE]*")
+    """Matches the characters that may belong to a number."""
+
+    def __init__(self, file, chunk_size=65536):
+        """Initializes the reader.
+
+        Args:
+            file (file): The file containing the JSON document to read.
+            chunk_size (int): The number of bytes read from the file at a time.
+        """
+        import json
+        self.__file = file
+        self.__chunk_size = chunk_size
+        self.__buffer = ""
+        self.__position = 0
+        self.__eof = False
+        self.__decoder = json.JSONDecoder(object_pairs_hook=OrderedDict)
+
+    def __fill(self, size):
+        """Reads at most size bytes from the file into the buffer, discarding the consumed data.
+
+        Returns:
+            bool: True if data was read, False if the end of the file was reached.
+        """
+        data = self.__file.read(size)
+        self.__buffer = self.__buffer[self.__position:] + data
+        self.__position = 0
+        self.__eof = not data
+        return not self.__eof
+
+    def peek(self):
+        """Skips whitespace and returns the next character without consuming it.
+
+        Returns:
+            str: The next character, or an empty string if the end of the document was reached.
+        """
+        while True:
+            buffer, position = self.__buffer, self.__position
+            length = len(buffer)
+            while position < length and buffer[position] in " \t\n\r":
+                position += 1
+            self.__position = position
+            if position < length or not self.__fill(self.__chunk_size):
+                return buffer[position] if position < length else ""
+
+    def expect(self, character):
+        """Consumes the specified character, skipping any whitespace that precedes it.
+
+        Raises:
+            ValueError: If the next character is not the specified character.
+        """
+        if self.peek() != character:
+            raise ValueError("Expecting '{}' at byte {} of the current chunk.".format(character, self.__position))
+        self.__position += 1
+
+    def read_value(self):
+        """Deserializes the next value.
+
+        Returns:
+            The deserialized value.
+
+        Raises:
+            ValueError: If the next value is not valid JSON.
+        """
+        self.peek()
+        size = self.__chunk_size
+        while True:
+            buffer, position = self.__buffer, self.__position
+            # A number at the end of the buffer may be continued by data that has not been read yet.
+            if self.__eof or JSONReader.NUMBER_CHARACTERS.match(buffer, position).end() < len(buffer):
+                try:
+                    value, self.__position = self.__decoder.raw_decode(buffer, position)
+                    return value
+                except ValueError:
+                    if self.__eof:
+                        raise
+
+            # The value is incomplete. Read exponentially larger chunks to keep the cost of
+            # decoding the value again linear in its size.
+            self.__fill(size)
+            size *= 2
+
+    def iter_object(self):
+        """Returns a generator of the keys of the object at the reader's position. The value of
+        each key must be consumed before the next key is generated.
+
+        Raises:
+            ValueError: If the next value is not a valid object.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.__position += 1
+            return
+
+        while True:
+            if self.peek() != "\"":
+                raise ValueError("Expecting a property name at byte {} of the current chunk.".format(self.__position))
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            if self.peek() == "}":
+                self.__position += 1
+                return
+            self.expect(",")
+
+    def iter_array(self):
+        """Returns a generator of the indices of the array at the reader's position. Each element
+        must be consumed before the next index is generated.
+
+        Raises:
+            ValueError: If the next value is not a valid array.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.__position += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.peek() == "]":
+                self.__position += 1
+                return
+            self.expect(",")
+
+    def expect_end(self):
+        """Makes sure nothing but whitespace follows the document.
+
+        Raises:
+            ValueError: If the document is followed by extra data.
+        """
+        if self.peek():
+            raise ValueError("Extra data at byte {} of the current chunk.".format(self.__position))
+
+
+def iter_configuration_set_errors(path, help_cache=None):
+    """Returns a generator of every error found in the set of configurations for the GeoTag-X
+    project located at the specified path.
+
+    Unlike core.iter_configuration_set_errors, the task presenter configuration is deserialized
+    while it is being validated and each question is discarded once it has been validated, so
+    the first errors are found before the whole configuration has been read, and memory use is
+    bounded by the size of the largest question. Errors are reported in the same order, but
+    questions can only be validated as they are read if the task presenter's language
+    configuration precedes its questionnaire; otherwise the rest of the configuration is read
+    before it is validated.
+
+    Args:
+        path (str): A path to a directory containing a GeoTag-X project.
+        help_cache (cache.DiskCache): An optional cache of minified help.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        IOError: If a required configuration is inaccessible.
+        ValueError: If a configuration is not valid JSON, or a required configuration is missing
+            from the configuration set.
+    """
+    from helper import deserialize_json
+
+    project = deserialize_json(os.path.join(path, "project.json"))
+    file = open(os.path.join(path, "task_presenter.json"))
+    try:
+        try:
+            tutorial = deserialize_json(os.path.join(path, "tutorial.json"))
+        except IOError:
+            tutorial = None
+
+        reader = JSONReader(file)
+        if not isinstance(project, dict) or not project or reader.peek() != "{":
+            raise ValueError("A required configuration is missing from the specified configuration set.")
+    except:
+        file.close()
+        raise
+
+    return _iter_configuration_set_errors(path, project, reader, file, tutorial, help_cache)
+
+
+def _iter_configuration_set_errors(path, project, reader, file, tutorial, help_cache):
+    """Generates the errors found in each configuration of the specified set.
+    """
+    from core import iter_configuration_set_errors
+    from task_presenter import is_task_presenter_configuration, get_available_languages
+
+    validators = iter_configuration_set_errors.VALIDATORS
+    configurations = {"project": project}
+    for message in validators["project"](project, configurations):
+        yield message
+
+    with file:
+        task_presenter = OrderedDict()
+        question_keys = {}
+        errors = _iter_object_errors(
+            reader,
+            is_task_presenter_configuration.SCHEMA,
+            lambda c: ("language" in c, get_available_languages(c)),
+            {"questionnaire": ("{", lambda r, languages: _iter_questionnaire_errors(r, languages, path, help_cache, question_keys))},
+            task_presenter
+        )
+        for message in errors:
+            yield message
+        if not task_presenter:
+            raise ValueError("A required configuration is missing from the specified configuration set.")
+        reader.expect_end()
+
+    if tutorial is not None:
+        from tutorial import iter_tutorial_configuration_errors
+        # A streamed questionnaire is not stored, so its key index is used instead.
+        if task_presenter.get("questionnaire") is not _STREAMED:
+            question_keys = None
+        for message in iter_tutorial_configuration_errors(tutorial, task_presenter, False, question_keys):
+            yield message
+
+
+def _iter_questionnaire_errors(reader, languages, path, help_cache, question_keys):
+    """Generates the errors found in the questionnaire at the reader's position. The keys of
+    the questionnaire's questions are added to the question_keys index.
+    """
+    from task_presenter import is_task_presenter_questionnaire
+
+    errors = _iter_object_errors(
+        reader,
+        is_task_presenter_questionnaire.SCHEMA,
+        lambda _: (True, languages),
+        {"questions": ("[", lambda r, l: _iter_question_errors(r, l, path, help_cache, question_keys))}
+    )
+    for message in errors:
+        yield message
+
+
+def _iter_question_errors(reader, languages, path, help_cache, question_keys):
+    """Generates the errors found in the questions at the reader's position. Each question's
+    help is deserialized before the question is validated. Duplicate keys are reported, branch
+    targets resolved and the branch graph analysed once every question has been read since a
+    branch may lead to a question that follows it.
+    """
+    from helper import LanguageContext, deserialize_help, get_help_key, get_help_keys, warn_orphan_help_files
+    from question import is_question, iter_branch_target_errors
+    from task_presenter import are_questions, iter_branch_graph_errors, iter_duplicate_question_key_errors
+
+    if not isinstance(languages, LanguageContext):
+        languages = LanguageContext(languages)
+
+    help_keys = get_help_keys(path)
+    help_file_keys = set()
+    branches = []
+    iter_errors = is_question.SCHEMA.iter_errors
+    filepath = os.path.join(path, "help", "{}.html")
+    for position in reader.iter_array():
+        question = reader.read_value()
+        key = get_help_key(question["key"])
+        help_file_keys.add(key)
+        if isinstance(question["key"], basestring):
+            question_keys.setdefault(question["key"], []).append(position)
+        branches.append((question["key"], question.get("branch")))
+        if key in help_keys:
+            try:
+                question["help"] = deserialize_help(filepath.format(key), help_cache)
+            except IOError:
+                # The file may have been removed since the directory was scanned.
+                pass
+
+        for message in iter_errors(question, languages):
+            yield message
+
+    if not help_file_keys:
+        for message in are_questions([], languages):
+            yield message
+
+    for message in iter_duplicate_question_key_errors(question_keys):
+        yield message
+
+    for key, branch in branches:
+        if branch is not None:
+            for message in iter_branch_target_errors(key, branch, question_keys):
+                yield message
+
+    for message in iter_branch_graph_errors(branches):
+        yield message
+
+    warn_orphan_help_files(path, help_keys - help_file_keys)
+
+
+def _iter_object_errors(reader, schema, get_context, streamers, configuration=None):
+    """Generates the errors found in the object at the reader's position.
+
+    The object's fields are validated as they are read, in the order in which they appear,
+    with the exception of the message that reports missing fields, which is always reported
+    first. A field whose validator expects a context is only validated as it is read if the
+    context is known; otherwise it is validated, along with every field that follows it, once
+    the whole object has been read.
+
+    Args:
+        reader (JSONReader): The reader.
+        schema (Schema): The object's schema.
+        get_context (function): A function that returns a pair containing the value True if
+            the context can be derived from the fields read so far, and the context itself.
+        streamers (dict): A dictionary that maps a field to a pair containing the character that
+            opens the field's value, and a function that validates the field while it is being
+            read. Such a function is passed the reader and the context. A value that does not
+            start with the expected character is deserialized and validated by the schema, so
+            that it is reported with the same message as when it is not streamed.
+        configuration (dict): If specified, the dictionary that receives the object's fields.
+            The value of a field that is validated while it is being read is not stored: a
+            placeholder is stored instead.
+    """
+    if reader.peek() != "{":
+        # The object is not a dictionary: deserialize it so the schema reports the error.
+        for message in schema.iter_errors(reader.read_value()):
+            yield message
+        return
+
+    if configuration is None:
+        configuration = OrderedDict()
+
+    unresolved_fields = set(schema.required_fields)
+    pending = []
+    deferred = []
+    for key in reader.iter_object():
+        ready, context = get_context(configuration)
+        opening, streamer = streamers.get(key, (None, None))
+        if streamer is not None and ready and not deferred and reader.peek() == opening:
+            configuration[key] = _STREAMED
+            errors = streamer(reader, context)
+        else:
+            value = reader.read_value()
+            configuration[key] = value
+            if deferred or (not ready and schema.is_contextual(key)):
+                deferred.append(key)
+                errors = ()
+            else:
+                errors = schema.iter_field_errors(key, value, context)
+
+        unresolved_fields.discard(key)
+        if unresolved_fields:
+            # The missing fields are not known yet, and they must be reported first.
+            pending.extend(errors)
+        else:
+            if pending is not None:
+                for message in _iter_missing_fields_and_pending_errors(schema, configuration, pending):
+                    yield message
+                pending = None
+            for message in errors:
+                yield message
+
+    if pending is not None:
+        for message in _iter_missing_fields_and_pending_errors(schema, configuration, pending):
+            yield message
+
+    if deferred:
+        context = get_context(configuration)[1]
+        for key in deferred:
+            for message in schema.iter_field_errors(key, configuration[key], context):
+                yield message
+
+
+def _iter_missing_fields_and_pending_errors(schema, configuration, pending):
+    """Generates the message that reports missing fields, if any, followed by the pending errors.
+    """
+    message = schema.get_missing_fields_message(configuration)
+    if message is not None:
+        yield message
+    for message in pending:
+        yield message
+
+
+_STREAMED = object()
+"""A placeholder for a field that was validated while it was being read, and not stored."""
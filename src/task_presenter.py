@@ -25,7 +25,8 @@
 # DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
 # OR OTHER DEALINGS IN THE SOFTWARE.
-from helper import check_arg_type, is_configuration, is_language_code, is_empty_string
+from helper import check_arg_type, is_language_code, is_empty_string, LanguageContext
+from schema import Schema
 
 def is_task_presenter_configuration(configuration):
     """Validates the specified task presenter configuration.
@@ -40,18 +41,105 @@ def is_task_presenter_configuration(configuration):
     Raises:
         TypeError: If the configuration argument is not a dictionary.
     """
-    from collections import  OrderedDict
-    return is_configuration(
-        configuration,
-        required_fields=frozenset(["questionnaire"]),
-        field_validators=OrderedDict({
-            "language": is_task_presenter_language, # This field should be validated before it is used below so an OrderedDict is used.
-            "subject": is_task_presenter_subject,
-            "questionnaire": lambda q: is_task_presenter_questionnaire(q, configuration["language"]["available"]),
-        }),
-        missing_field_message="The task presenter configuration is missing the following field(s): '{}'.",
-        unexpected_field_message="The task presenter configuration key '{}' is not recognized."
-    )
+    return is_task_presenter_configuration.SCHEMA.validate(configuration, get_language_context(configuration))
+
+
+def iter_task_presenter_configuration_errors(configuration):
+    """Returns a generator of every error found in the specified task presenter configuration.
+
+    Args:
+        configuration (dict): A task presenter configuration to validate.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If the configuration argument is not a dictionary.
+    """
+    return is_task_presenter_configuration.SCHEMA.iter_errors(configuration, get_language_context(configuration))
+
+
+def get_available_languages(configuration):
+    """Returns the list of available languages from the specified task presenter configuration.
+
+    Args:
+        configuration (dict): A task presenter configuration.
+
+    Returns:
+        list|None: The list of available languages, or None if the configuration does not
+            contain a language configuration with a list of available languages.
+    """
+    language = configuration.get("language") if isinstance(configuration, dict) else None
+    available_languages = language.get("available") if isinstance(language, dict) else None
+    return available_languages if isinstance(available_languages, list) else None
+
+
+def get_language_context(configuration):
+    """Returns a language context for the specified task presenter configuration.
+
+    The context is meant to be created once per validation of the task presenter and passed to
+    the validators of its normalized strings in place of the list of available languages.
+
+    Args:
+        configuration (dict): A task presenter configuration.
+
+    Returns:
+        LanguageContext: A context holding the configuration's available languages, if any.
+    """
+    return LanguageContext(get_available_languages(configuration))
+
+
+def get_questions(configuration):
+    """Returns the list of questions from the specified task presenter configuration.
+
+    Args:
+        configuration (dict): A task presenter configuration.
+
+    Returns:
+        list|None: The list of questions, or None if the configuration does not contain
+            a questionnaire with a list of questions.
+    """
+    questionnaire = configuration.get("questionnaire") if isinstance(configuration, dict) else None
+    questions = questionnaire.get("questions") if isinstance(questionnaire, dict) else None
+    return questions if isinstance(questions, list) else None
+
+
+def get_question_key_index(questions):
+    """Returns an index of the keys of the specified questions.
+
+    The index is built in a single pass so that every branch target and tutorial assertion
+    key can then be resolved in constant time, and duplicate keys found without comparing
+    each pair of questions.
+
+    Args:
+        questions (list|None): A list of question configurations.
+
+    Returns:
+        dict: A dictionary that maps each question key to the list of positions of the
+            questions it identifies. Questions without a string key are not indexed.
+    """
+    index = {}
+    for position, question in enumerate(questions or []):
+        key = question.get("key") if isinstance(question, dict) else None
+        if isinstance(key, basestring):
+            index.setdefault(key, []).append(position)
+    return index
+
+
+def iter_duplicate_question_key_errors(question_keys):
+    """Returns a generator of every question key in the specified index that identifies more
+    than one question.
+
+    Args:
+        question_keys (dict): An index of question keys, as returned by get_question_key_index.
+
+    Returns:
+        generator: A generator of error messages, in the order in which the duplicates appear.
+    """
+    duplicates = sorted((positions, key) for key, positions in question_keys.iteritems() if len(positions) > 1)
+    for positions, key in duplicates:
+        message = u"The question key '{}' is not unique. It is used by the questions at positions {}."
+        yield message.format(key, ", ".join(str(p + 1) for p in positions))
 
 
 def is_task_presenter_language(language):
@@ -72,34 +160,47 @@ def is_task_presenter_language(language):
     Raises:
         TypeError: If the 'language' argument is not a dictionary.
     """
-    def is_default_language(default_language):
-        if default_language not in language["available"]:
-            message = "The task presenter's default language '{}' is not listed as an available language."
-            return (False, message.format(default_language))
+    available_languages = language.get("available") if isinstance(language, dict) else None
+    return is_task_presenter_language.SCHEMA.validate(language, available_languages)
+
+
+def is_default_language(default_language, available_languages):
+    """Validates the specified default language against a list of available languages.
+
+    Args:
+        default_language (str): A default language code to validate.
+        available_languages (list): A list of available language codes.
+
+    Returns:
+        <bool, str|None>: A pair containing the value True if the default language is
+            available, False otherwise; as well as an error message in case it is not.
+    """
+    if available_languages is not None and default_language not in available_languages:
+        message = "The task presenter's default language '{}' is not listed as an available language."
+        return (False, message.format(default_language))
+
+    return (True, None)
+
 
-        return (True, None)
+def are_available_languages(available_languages):
+    """Validates the specified list of available languages.
 
-    def are_available_languages(available_languages):
-        if not isinstance(available_languages, list) or len(available_languages) < 1:
-            return (False, "The list of available languages must be a non-empty list of language codes.")
+    Args:
+        available_languages (list): A list of language codes to validate.
 
-        invalid_language_codes = [l for l in available_languages if not is_language_code(l)]
-        if invalid_language_codes:
-            message = "The task presenter's list of available languages contains the following invalid codes: '{}'."
-            return (False, message.format("', '".join(invalid_language_codes)))
+    Returns:
+        <bool, str|None>: A pair containing the value True if the specified list is
+            valid, False otherwise; as well as an error message in case it is invalid.
+    """
+    if not isinstance(available_languages, list) or len(available_languages) < 1:
+        return (False, "The list of available languages must be a non-empty list of language codes.")
 
-        return (True, None)
+    invalid_language_codes = [l for l in available_languages if not is_language_code(l)]
+    if invalid_language_codes:
+        message = "The task presenter's list of available languages contains the following invalid codes: '{}'."
+        return (False, message.format("', '".join(invalid_language_codes)))
 
-    return is_configuration(
-        language,
-        required_fields=frozenset(["default", "available"]),
-        field_validators={
-            "default": is_default_language,
-            "available": are_available_languages,
-        },
-        missing_field_message="The task presenter's language configuration is missing the following field(s): '{}'.",
-        unexpected_field_message="The task presenter's language configuration key '{}' is not recognized."
-    )
+    return (True, None)
 
 
 def is_task_presenter_subject(subject):
@@ -118,15 +219,7 @@ def is_task_presenter_subject(subject):
     Raises:
         TypeError: If the 'subject' argument is not a dictionary.
     """
-    return is_configuration(
-        subject,
-        required_fields=frozenset(["type"]),
-        field_validators={
-            "type": is_subject_type,
-        },
-        missing_field_message="The task presenter's subject configuration is missing the following field(s): '{}'.",
-        unexpected_field_message="The task presenter's subject configuration key '{}' is not recognized."
-    )
+    return is_task_presenter_subject.SCHEMA.validate(subject)
 
 
 def is_task_presenter_questionnaire(questionnaire, languages=None):
@@ -137,7 +230,7 @@ def is_task_presenter_questionnaire(questionnaire, languages=None):
 
     Args:
         questionnanire (dict): A task presenter questionnanire configuration to validate.
-        languages (list): A list of available languages.
+        languages (list|LanguageContext): A list of available languages, or a language context.
 
     Returns:
         <bool, str|None>: A pair containing the value True if the specified configuration
@@ -145,31 +238,203 @@ def is_task_presenter_questionnaire(questionnaire, languages=None):
 
     Raises:
         TypeError: If the questionnaire argument is not a dictionary or languages
-        is not a list or NoneType.
-    """
-    check_arg_type(is_task_presenter_questionnaire, "languages", languages, (list, type(None)))
-
-    def are_questions(questions):
-        check_arg_type(are_questions, "questions", questions, list)
-        if not questions:
-            return (False, "A questionnaire must be a non-empty list of questions.")
-        else:
-            from question import is_question
-            for q in questions:
-                valid, message = is_question(q, languages)
-                if not valid:
-                    return (False, message)
-            return (True, None)
-
-    return is_configuration(
-        questionnaire,
-        required_fields=frozenset(["questions"]),
-        field_validators={
-            "questions": are_questions,
-        },
-        missing_field_message="The task presenter's questionnaire configuration is missing the following field(s): '{}'.",
-        unexpected_field_message="The task presenter's questionnaire configuration key '{}' is not recognized."
-    )
+        is not a list, LanguageContext or NoneType.
+    """
+    check_arg_type(is_task_presenter_questionnaire, "languages", languages, (list, LanguageContext, type(None)))
+    return is_task_presenter_questionnaire.SCHEMA.validate(questionnaire, languages)
+
+
+def iter_task_presenter_questionnaire_errors(questionnaire, languages=None):
+    """Returns a generator of every error found in the specified questionnaire configuration.
+
+    Args:
+        questionnanire (dict): A task presenter questionnanire configuration to validate.
+        languages (list|LanguageContext): A list of available languages, or a language context.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If the questionnaire argument is not a dictionary or languages
+        is not a list, LanguageContext or NoneType.
+    """
+    check_arg_type(is_task_presenter_questionnaire, "languages", languages, (list, LanguageContext, type(None)))
+    return is_task_presenter_questionnaire.SCHEMA.iter_errors(questionnaire, languages)
+
+
+def are_questions(questions, languages=None):
+    """Returns a generator of every error found in the specified list of questions.
+
+    Once each question has been validated, duplicate keys are reported, every branch target
+    is resolved against an index of the questionnaire's keys, and the graph formed by the questions' branches is analysed.
+
+    Args:
+        questions (list): A list of question configurations to validate.
+        languages (list|LanguageContext): A list of available languages, or a language context.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If the questions argument is not a list.
+    """
+    check_arg_type(are_questions, "questions", questions, list)
+    if not questions:
+        yield "A questionnaire must be a non-empty list of questions."
+    else:
+        from question import is_question, iter_branch_target_errors
+        iter_question_errors = is_question.SCHEMA.iter_errors
+        for q in questions:
+            for message in iter_question_errors(q, languages):
+                yield message
+
+        question_keys = get_question_key_index(questions)
+        for message in iter_duplicate_question_key_errors(question_keys):
+            yield message
+
+        branches = [(q.get("key"), q.get("branch")) if isinstance(q, dict) else (None, None) for q in questions]
+        for key, branch in branches:
+            if branch is not None:
+                for message in iter_branch_target_errors(key, branch, question_keys):
+                    yield message
+
+        for message in iter_branch_graph_errors(branches):
+            yield message
+
+
+def iter_branch_graph_errors(branches):
+    """Returns a generator of every error found in the graph formed by a questionnaire's branches.
+
+    Each question is a vertex of the graph, identified by its position, and each of its branch
+    targets an edge. A question without a branch leads to the question that follows it, or to
+    the end of the questionnaire if it is the last. The graph is analysed in O(V + E) time to
+    report questions that form a cycle, questions that cannot be reached from the first question,
+    and questions from which the end of the questionnaire can never be reached.
+
+    A question whose branch has a target that does not resolve to a question or a reserved key
+    may lead anywhere: it is assumed to lead to the end of the questionnaire and, if it can be
+    reached, no question is reported as unreachable. Such targets are reported by
+    iter_branch_target_errors and is_question_branch instead.
+
+    Args:
+        branches (list): A list of pairs containing a question's key and its branch, or None if
+            the question has no branch, for every question in the order in which they appear.
+
+    Returns:
+        generator: A generator of error messages.
+    """
+    from question import get_branch_targets, is_reserved_key
+
+    # A branch target resolves to the first of any duplicate keys.
+    keys = [key if isinstance(key, basestring) else None for key, _ in branches]
+    index = {}
+    for vertex, key in enumerate(keys):
+        if key is not None:
+            index.setdefault(key, vertex)
+
+    count = len(keys)
+    end = count
+    successors, unknown = [], set()
+    for vertex, (_, branch) in enumerate(branches):
+        if branch is None:
+            successors.append([vertex + 1])
+            continue
+
+        targets = set()
+        for target in get_branch_targets(branch) or [None]:
+            if isinstance(target, basestring) and target in index:
+                targets.add(index[target])
+            elif isinstance(target, basestring) and is_reserved_key(target)[0]:
+                # A reserved key leads out of the questionnaire.
+                targets.add(end)
+            else:
+                unknown.add(vertex)
+                targets.add(end)
+        successors.append(sorted(targets))
+    successors.append([])
+
+    for component in _get_cycles(successors):
+        members = "', '".join(keys[v] for v in component if keys[v] is not None)
+        yield u"The following questions form a branch cycle: '{}'.".format(members)
+
+    reachable = _get_reachable_vertices(successors, [0] if count else [])
+    if reachable.isdisjoint(unknown):
+        for vertex in xrange(count):
+            if vertex not in reachable and keys[vertex] is not None:
+                yield u"The question '{}' cannot be reached from the first question.".format(keys[vertex])
+
+    predecessors = [[] for _ in successors]
+    for vertex, targets in enumerate(successors):
+        for target in targets:
+            predecessors[target].append(vertex)
+    terminating = _get_reachable_vertices(predecessors, [end])
+    for vertex in xrange(count):
+        if vertex not in terminating and keys[vertex] is not None:
+            yield u"The question '{}' never leads to the end of the questionnaire.".format(keys[vertex])
+
+
+def _get_cycles(successors):
+    """Returns the strongly connected components of the specified graph that contain a cycle,
+    using an iterative version of Tarjan's algorithm. Each component is a sorted list of vertices
+    and the components are sorted by their first vertex.
+    """
+    count = len(successors)
+    indices, lowlinks, on_stack = [None] * count, [0] * count, [False] * count
+    stack, components, counter = [], [], 0
+    for root in xrange(count):
+        if indices[root] is not None:
+            continue
+        indices[root] = lowlinks[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            vertex, position = work[-1]
+            targets = successors[vertex]
+            if position < len(targets):
+                work[-1] = (vertex, position + 1)
+                target = targets[position]
+                if indices[target] is None:
+                    indices[target] = lowlinks[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = True
+                    work.append((target, 0))
+                elif on_stack[target] and indices[target] < lowlinks[vertex]:
+                    lowlinks[vertex] = indices[target]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlinks[parent] = min(lowlinks[parent], lowlinks[vertex])
+            if lowlinks[vertex] == indices[vertex]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == vertex:
+                        break
+                if len(component) > 1 or vertex in targets:
+                    components.append(sorted(component))
+
+    components.sort()
+    return components
+
+
+def _get_reachable_vertices(successors, sources):
+    """Returns the set of vertices that can be reached from the specified sources.
+    """
+    reachable = set(sources)
+    pending = list(sources)
+    while pending:
+        for target in successors[pending.pop()]:
+            if target not in reachable:
+                reachable.add(target)
+                pending.append(target)
+    return reachable
 
 
 def is_subject_type(subject_type):
@@ -198,3 +463,53 @@ is_subject_type.SUPPORTED_TYPES = frozenset([
     "pdf",
 ])
 """A collection of supported subject types."""
+
+
+is_task_presenter_configuration.SCHEMA = Schema(
+    required_fields=frozenset(["questionnaire"]),
+    field_validators={
+        "language": is_task_presenter_language,
+        "subject": is_task_presenter_subject,
+        "questionnaire": iter_task_presenter_questionnaire_errors,
+    },
+    missing_field_message="The task presenter configuration is missing the following field(s): '{}'.",
+    unexpected_field_message="The task presenter configuration key '{}' is not recognized.",
+    contextual_fields=frozenset(["questionnaire"])
+)
+"""The task presenter configuration schema. Its contextual fields expect a list of available languages."""
+
+
+is_task_presenter_language.SCHEMA = Schema(
+    required_fields=frozenset(["default", "available"]),
+    field_validators={
+        "default": is_default_language,
+        "available": are_available_languages,
+    },
+    missing_field_message="The task presenter's language configuration is missing the following field(s): '{}'.",
+    unexpected_field_message="The task presenter's language configuration key '{}' is not recognized.",
+    contextual_fields=frozenset(["default"])
+)
+"""The task presenter language configuration schema. Its contextual fields expect the list of available languages."""
+
+
+is_task_presenter_subject.SCHEMA = Schema(
+    required_fields=frozenset(["type"]),
+    field_validators={
+        "type": is_subject_type,
+    },
+    missing_field_message="The task presenter's subject configuration is missing the following field(s): '{}'.",
+    unexpected_field_message="The task presenter's subject configuration key '{}' is not recognized."
+)
+"""The task presenter subject configuration schema."""
+
+
+is_task_presenter_questionnaire.SCHEMA = Schema(
+    required_fields=frozenset(["questions"]),
+    field_validators={
+        "questions": are_questions,
+    },
+    missing_field_message="The task presenter's questionnaire configuration is missing the following field(s): '{}'.",
+    unexpected_field_message="The task presenter's questionnaire configuration key '{}' is not recognized.",
+    contextual_fields=frozenset(["questions"])
+)
+"""The task presenter questionnaire configuration schema. Its contextual fields expect a list of available languages."""
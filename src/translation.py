@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains a report of the translation coverage of a project's normalized strings.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+from array import array
+
+class TranslationMatrix(object):
+    """A language × field matrix of the translations of a project's configuration strings.
+
+    Each column of the matrix is a field that holds a configuration string, e.g. a question's
+    title, and each row is a language. A cell records whether the field's translation in the
+    language is present, empty, or missing. The matrix is stored as two bitsets per language,
+    one for present and one for empty translations, each backed by an array of bytes, so that
+    a project with thousands of fields in dozens of languages only takes a few kilobytes.
+
+    A plain string is not localized, so it is considered to be written in the default language
+    and its translations into every other language are missing.
+    """
+    __slots__ = (
+        "languages",
+        "paths",
+        "__default_language",
+        "__rows",
+        "__present",
+        "__empty",
+        "__dynamic",
+    )
+
+    def __init__(self, languages=None, default_language=None):
+        """Creates an empty matrix.
+
+        Args:
+            languages (list): The languages of the matrix's rows. If set to None, a row is
+                added for each language that is found in a normalized string.
+            default_language (str): The language that plain strings are written in.
+        """
+        self.languages = []
+        self.paths = []
+        self.__default_language = default_language
+        self.__rows = {}
+        self.__present = []
+        self.__empty = []
+        self.__dynamic = languages is None
+        for language in languages or []:
+            self.__get_row(language)
+
+    def __get_row(self, language):
+        """Returns the row of the specified language, adding it to the matrix if need be. If
+        the language can not be added, None is returned.
+        """
+        row = self.__rows.get(language)
+        if row is None and (self.__dynamic or not self.paths) and isinstance(language, basestring):
+            row = self.__rows[language] = len(self.languages)
+            self.languages.append(language)
+            size = (len(self.paths) + 7) // 8
+            self.__present.append(array("B", [0]) * size)
+            self.__empty.append(array("B", [0]) * size)
+        return row
+
+    def add(self, path, string):
+        """Adds a column for the field located at the specified path.
+
+        Args:
+            path (str): The path to the field.
+            string (str|dict): The field's value, a plain or normalized string.
+        """
+        column = len(self.paths)
+        self.paths.append(path)
+        if column % 8 == 0:
+            for bitsets in (self.__present, self.__empty):
+                for bitset in bitsets:
+                    bitset.append(0)
+
+        index, bit = column >> 3, 1 << (column & 7)
+        if isinstance(string, dict):
+            translations = string.iteritems()
+        elif self.__default_language is not None:
+            translations = [(self.__default_language, string)]
+        else:
+            translations = []
+
+        for language, translation in translations:
+            row = self.__get_row(language)
+            if row is not None:
+                present = isinstance(translation, basestring) and translation and not translation.isspace()
+                bitsets = self.__present if present else self.__empty
+                bitsets[row][index] |= bit
+
+    def count(self, language):
+        """Returns the number of present, empty and missing translations in the specified language.
+
+        Args:
+            language (str): A language of the matrix.
+
+        Returns:
+            <int, int, int>: The number of present, empty and missing translations.
+
+        Raises:
+            KeyError: If the language is not a row of the matrix.
+        """
+        row = self.__rows[language]
+        popcount = TranslationMatrix.POPCOUNT
+        present = sum(popcount[b] for b in self.__present[row])
+        empty = sum(popcount[b] for b in self.__empty[row])
+        return (present, empty, len(self.paths) - present - empty)
+
+    def get_completion(self, language):
+        """Returns the percentage of the fields that are translated into the specified language.
+        A matrix without fields is complete.
+        """
+        present = self.count(language)[0]
+        return 100.0 * present / len(self.paths) if self.paths else 100.0
+
+    def iter_missing_paths(self, language):
+        """Returns a generator of the paths of the fields that are not translated into the
+        specified language, in the order in which they were added.
+        """
+        row = self.__rows[language]
+        present, empty = self.__present[row], self.__empty[row]
+        for column, path in enumerate(self.paths):
+            index, bit = column >> 3, 1 << (column & 7)
+            if not (present[index] | empty[index]) & bit:
+                yield path
+
+    def iter_empty_paths(self, language):
+        """Returns a generator of the paths of the fields whose translation into the specified
+        language is empty, in the order in which they were added.
+        """
+        empty = self.__empty[self.__rows[language]]
+        for column, path in enumerate(self.paths):
+            if empty[column >> 3] & (1 << (column & 7)):
+                yield path
+
+
+TranslationMatrix.POPCOUNT = array("B", [bin(b).count("1") for b in xrange(256)])
+"""The number of bits set in each byte."""
+
+
+def get_translation_matrix(configurations):
+    """Returns the translation matrix of the specified set of configurations. The configuration
+    strings are visited in a single pass.
+
+    Args:
+        configurations (dict): A set of configurations, as returned by
+            helper.deserialize_configuration_set.
+
+    Returns:
+        TranslationMatrix: The configurations' translation matrix. Its languages are the task
+            presenter's available languages, or every language found in a normalized string
+            if the task presenter does not list its available languages.
+    """
+    from task_presenter import get_available_languages
+
+    task_presenter = configurations.get("task_presenter")
+    language = task_presenter.get("language") if isinstance(task_presenter, dict) else None
+    default_language = language.get("default") if isinstance(language, dict) else None
+    matrix = TranslationMatrix(get_available_languages(task_presenter), default_language)
+    for path, string in iter_configuration_strings(configurations):
+        matrix.add(path, string)
+    return matrix
+
+
+def iter_configuration_strings(configurations):
+    """Returns a generator of the configuration strings in the specified set of configurations.
+
+    The strings are the questions' titles, hints, help, placeholders and option labels, as
+    well as the tutorial's messages. Fields that are neither a plain nor a normalized string
+    are skipped since they are reported by the validators. A help that is a plain string is
+    skipped too: it is usually the content of the question's help file, which replaces the
+    help field when the project is loaded and cannot be localized.
+
+    Args:
+        configurations (dict): A set of configurations.
+
+    Returns:
+        generator: A generator of pairs containing the path to a field and its value.
+    """
+    from task_presenter import get_questions
+
+    fields = []
+    questions = get_questions(configurations.get("task_presenter"))
+    for i, question in enumerate(questions or []):
+        if not isinstance(question, dict):
+            continue
+        path = u"task_presenter.questionnaire.questions[{}]".format(i)
+        for key in ["title", "hint"]:
+            fields.append((u"{}.{}".format(path, key), question.get(key)))
+        if isinstance(question.get("help"), dict):
+            fields.append((u"{}.help".format(path), question["help"]))
+
+        question_input = question.get("input")
+        if isinstance(question_input, dict):
+            fields.append((u"{}.input.placeholder".format(path), question_input.get("placeholder")))
+            options = question_input.get("options")
+            for j, option in enumerate(options if isinstance(options, list) else []):
+                if isinstance(option, dict):
+                    fields.append((u"{}.input.options[{}].label".format(path, j), option.get("label")))
+
+        for field in fields:
+            if isinstance(field[1], (basestring, dict)):
+                yield field
+        del fields[:]
+
+    tutorial = configurations.get("tutorial")
+    if not isinstance(tutorial, dict):
+        return
+
+    default_message = tutorial.get("default-message")
+    for name, message in default_message.iteritems() if isinstance(default_message, dict) else []:
+        fields.append((u"tutorial.default-message.{}".format(name), message))
+
+    subjects = tutorial.get("subjects")
+    for i, subject in enumerate(subjects if isinstance(subjects, list) else []):
+        assertions = subject.get("assertions") if isinstance(subject, dict) else None
+        for key, assertion in assertions.iteritems() if isinstance(assertions, dict) else []:
+            messages = assertion.get("messages") if isinstance(assertion, dict) else None
+            for name, message in messages.iteritems() if isinstance(messages, dict) else []:
+                fields.append((u"tutorial.subjects[{}].assertions.{}.messages.{}".format(i, key, name), message))
+
+    for field in fields:
+        if isinstance(field[1], (basestring, dict)):
+            yield field
+
+
+def merge_translation_statistics(summary, matrix):
+    """Adds the specified matrix's translation counts to a summary of a batch of projects.
+
+    Only counts are kept, so the summary's size does not depend on the number of projects.
+
+    Args:
+        summary (dict): The summary to update. It maps each language to a list containing the
+            number of projects, present, empty and missing translations, and the number of
+            projects that are fully translated into the language.
+        matrix (TranslationMatrix): The matrix to add.
+    """
+    for language in matrix.languages:
+        present, empty, missing = matrix.count(language)
+        entry = summary.setdefault(language, [0, 0, 0, 0, 0])
+        entry[0] += 1
+        entry[1] += present
+        entry[2] += empty
+        entry[3] += missing
+        entry[4] += 1 if not empty and not missing else 0
+
+
+def format_translation_matrix(matrix, title):
+    """Returns a report of the specified matrix: a table of the completion of each language,
+    followed by the paths to the fields that are missing or empty in each language.
+
+    Args:
+        matrix (TranslationMatrix): A translation matrix.
+        title (str): The report's title.
+
+    Returns:
+        str: The formatted report.
+    """
+    width = max([len(l) for l in matrix.languages] + [len("language")])
+    row = u"  {:<%d}  {:>8}  {:>8}  {:>8}  {:>11}" % width
+    lines = [title, row.format("language", "present", "empty", "missing", "completion")]
+    for language in matrix.languages:
+        present, empty, missing = matrix.count(language)
+        lines.append(row.format(language, present, empty, missing, "{:.1f}%".format(matrix.get_completion(language))))
+
+    for language in matrix.languages:
+        for state, paths in [("Missing", matrix.iter_missing_paths(language)), ("Empty", matrix.iter_empty_paths(language))]:
+            paths = list(paths)
+            if paths:
+                lines.append(u"  {} '{}' translations:".format(state, language))
+                lines.extend(u"    - {}".format(p) for p in paths)
+
+    return "\n".join(lines)
+
+
+def format_translation_summary(summary, title):
+    """Returns a table of the specified summary of a batch's translation coverage.
+
+    Args:
+        summary (dict): A summary, as built by merge_translation_statistics.
+        title (str): The table's title.
+
+    Returns:
+        str: The formatted table.
+    """
+    width = max([len(l) for l in summary] + [len("language")])
+    row = u"  {:<%d}  {:>8}  {:>10}  {:>8}  {:>8}  {:>8}  {:>11}" % width
+    lines = [title, row.format("language", "projects", "complete", "present", "empty", "missing", "completion")]
+    for language in sorted(summary):
+        projects, present, empty, missing, complete = summary[language]
+        total = present + empty + missing
+        completion = 100.0 * present / total if total else 100.0
+        lines.append(row.format(language, projects, complete, present, empty, missing, "{:.1f}%".format(completion)))
+
+    return "\n".join(lines)
@@ -25,7 +25,8 @@
 # DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
 # OR OTHER DEALINGS IN THE SOFTWARE.
-from helper import check_arg_type, is_configuration, is_empty_string, is_configuration_string
+from helper import check_arg_type, first_error, is_empty_string, is_configuration_string, LanguageContext
+from schema import Schema
 
 def is_tutorial_configuration(
     configuration,
@@ -43,6 +44,36 @@ def is_tutorial_configuration(
         <bool, str|None>: A pair containing the value True if the specified configuration
             is valid, False otherwise; and an error message in case the configuration is invalid.
 
+    Raises:
+        TypeError: If either of the configuration arguments is not a dictionary, or the
+            validate_task_presenter_configuration argument is not a boolean.
+    """
+    return first_error(iter_tutorial_configuration_errors(
+        configuration,
+        task_presenter_configuration,
+        validate_task_presenter_configuration
+    ))
+
+
+def iter_tutorial_configuration_errors(
+    configuration,
+    task_presenter_configuration,
+    validate_task_presenter_configuration=True,
+    question_keys=None
+):
+    """Returns a generator of every error found in the specified tutorial configuration.
+
+    Args:
+        configuration (dict): A tutorial configuration to validate.
+        task_presenter_configuration (dict): The task presenter configuration complemented by the tutorial configuration.
+        validate_task_presenter_configuration (bool): If set to True, the specified task presenter configuration is validated too.
+        question_keys (dict|set|None): An index of the task presenter's question keys that
+            subject assertion keys are resolved against. If set to None, the index is built
+            from the task presenter configuration.
+
+    Returns:
+        generator: A generator of error messages.
+
     Raises:
         TypeError: If either of the configuration arguments is not a dictionary, or the
             validate_task_presenter_configuration argument is not a boolean.
@@ -50,36 +81,35 @@ def is_tutorial_configuration(
     check_arg_type(is_tutorial_configuration, "task_presenter_configuration", task_presenter_configuration, dict)
     check_arg_type(is_tutorial_configuration, "validate_task_presenter_configuration", validate_task_presenter_configuration, bool)
 
-    if validate_task_presenter_configuration:
-        from task_presenter import is_task_presenter_configuration
-        valid, message = is_task_presenter_configuration(task_presenter_configuration)
-        if not valid:
-            return (False, message)
-
-    def is_default_message(message):
-        return is_tutorial_default_message(message, task_presenter_configuration["language"]["available"])
-
-    def are_subjects(subjects):
-        check_arg_type(are_subjects, "subjects", subjects, list)
-        if not subjects:
-            return (False, "A project tutorial must contain at least one subject.")
-        for subject in subjects:
-            valid, message = is_tutorial_subject(subject, task_presenter_configuration["language"]["available"])
-            if not valid:
-                return (False, message)
-        return (True, None)
-
-    return is_configuration(
-        configuration,
-        required_fields=frozenset(["subjects"]),
-        field_validators={
-            "enable-random-order": is_tutorial_enable_random_order,
-            "default-message": is_default_message,
-            "subjects": are_subjects,
-        },
-        missing_field_message="The tutorial configuration is missing the following field(s): '{}'.",
-        unexpected_field_message="The tutorial configuration key '{}' is not recognized."
+    from itertools import chain
+    from task_presenter import get_language_context, get_question_key_index, get_questions
+    if question_keys is None:
+        question_keys = get_question_key_index(get_questions(task_presenter_configuration))
+
+    errors = chain(
+        is_tutorial_configuration.SCHEMA.iter_errors(configuration, get_language_context(task_presenter_configuration)),
+        _iter_assertion_key_errors(configuration, question_keys)
     )
+    if validate_task_presenter_configuration:
+        from task_presenter import iter_task_presenter_configuration_errors
+        errors = chain(iter_task_presenter_configuration_errors(task_presenter_configuration), errors)
+
+    return errors
+
+
+def _iter_assertion_key_errors(configuration, question_keys):
+    """Generates an error for each subject assertion key that does not match a question.
+    Keys that are not valid question keys are ignored since they are reported by
+    are_subject_assertions.
+    """
+    from question import is_question_key
+
+    subjects = configuration.get("subjects") if isinstance(configuration, dict) else None
+    for subject in subjects if isinstance(subjects, list) else []:
+        assertions = subject.get("assertions") if isinstance(subject, dict) else None
+        for key in assertions if isinstance(assertions, dict) else []:
+            if isinstance(key, basestring) and key not in question_keys and is_question_key(key)[0]:
+                yield "The tutorial subject assertion key '{}' does not match any question.".format(key)
 
 
 def is_tutorial_enable_random_order(enable_random_order):
@@ -101,17 +131,17 @@ def is_tutorial_default_message(default_message, languages=None):
 
     Args:
         default_message (dict): A set of default messages.
-        languages (list): A list of available languages.
+        languages (list|LanguageContext): A list of available languages, or a language context.
 
     Returns:
         <bool, str|None>: A pair containing the value True if the specified message set
             is valid, False otherwise; and an error message in case the set is invalid.
     Raises:
         TypeError: If the default_message argument is not a dictionary, or if the
-            languages argument is not a list or NoneType.
+            languages argument is not a list, LanguageContext or NoneType.
     """
     check_arg_type(is_tutorial_default_message, "default_message", default_message, dict)
-    check_arg_type(is_tutorial_default_message, "languages", languages, (list, type(None)))
+    check_arg_type(is_tutorial_default_message, "languages", languages, (list, LanguageContext, type(None)))
 
     unexpected_fields = set(default_message.keys()) - is_tutorial_configuration.DEFAULT_MESSAGE_FIELDS
     if unexpected_fields:
@@ -132,12 +162,34 @@ is_tutorial_configuration.DEFAULT_MESSAGE_FIELDS = frozenset([
 """A set of default message fields."""
 
 
+def are_subjects(subjects, languages=None):
+    """Returns a generator of every error found in the specified list of tutorial subjects.
+
+    Args:
+        subjects (list): A list of tutorial subjects to validate.
+        languages (list|LanguageContext): A list of available languages, or a language context.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If the subjects argument is not a list.
+    """
+    check_arg_type(are_subjects, "subjects", subjects, list)
+    if not subjects:
+        yield "A project tutorial must contain at least one subject."
+    iter_subject_errors = is_tutorial_subject.SCHEMA.iter_errors
+    for subject in subjects:
+        for message in iter_subject_errors(subject, languages):
+            yield message
+
+
 def is_tutorial_subject(tutorial_subject, languages=None):
     """Validates the specified tutorial subject.
 
     Args:
         tutorial_subject (dict): A tutorial subject to validate.
-        languages (list): A list of available languages.
+        languages (list|LanguageContext): A list of available languages, or a language context.
 
     Returns:
         <bool, str|NoneType>: A pair containing the value True if the specified subject
@@ -145,46 +197,94 @@ def is_tutorial_subject(tutorial_subject, languages=None):
 
     Raises:
         TypeError: If the tutorial_subject argument is not a dictionary, or the languages
-            argument is not a list or NoneType.
-    """
-    check_arg_type(is_tutorial_subject, "languages", languages, (list, type(None)))
-
-    def is_source(subject_source):
-        message = "A tutorial subject's 'source' field must be a non-empty string."
-        return (False, message) if is_empty_string(subject_source) else (True, None)
-
-    def is_page(subject_page):
-        message = "A tutorial subject's 'page' field must be a non-empty string."
-        return (False, message) if is_empty_string(subject_page) else (True, None)
-
-    def is_attribution(subject_attribution):
-        message = "A tutorial subject's 'attribution' field must be a non-empty string."
-        return (False, message) if is_empty_string(subject_attribution) else (True, None)
-
-    def are_subject_assertions(subject_assertions):
-        check_arg_type(are_subject_assertions, "subject_assertions", subject_assertions, dict)
-        from question import is_question_key
-        for key, assertion in subject_assertions.iteritems():
-            valid, message = is_question_key(key)
-            if not valid:
-                return (False, message)
-            valid, message = is_tutorial_subject_assertion(assertion, languages)
-            if not valid:
-                return (False, message)
-        return (True, None)
-
-    return is_configuration(
-        tutorial_subject,
-        required_fields=frozenset(["source", "page", "assertions"]),
-        field_validators={
-            "source": is_source,
-            "page": is_page,
-            "attribution": is_attribution,
-            "assertions": are_subject_assertions,
-        },
-        missing_field_message="The tutorial's subject configuration is missing the following field(s): '{}'.",
-        unexpected_field_message="The tutorial's subject configuration key '{}' is not recognized."
-    )
+            argument is not a list, LanguageContext or NoneType.
+    """
+    check_arg_type(is_tutorial_subject, "languages", languages, (list, LanguageContext, type(None)))
+    return is_tutorial_subject.SCHEMA.validate(tutorial_subject, languages)
+
+
+def iter_tutorial_subject_errors(tutorial_subject, languages=None):
+    """Returns a generator of every error found in the specified tutorial subject.
+
+    Args:
+        tutorial_subject (dict): A tutorial subject to validate.
+        languages (list|LanguageContext): A list of available languages, or a language context.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If the tutorial_subject argument is not a dictionary, or the languages
+            argument is not a list, LanguageContext or NoneType.
+    """
+    check_arg_type(is_tutorial_subject, "languages", languages, (list, LanguageContext, type(None)))
+    return is_tutorial_subject.SCHEMA.iter_errors(tutorial_subject, languages)
+
+
+def __is_source(subject_source):
+    """Validates the specified tutorial subject source.
+
+    Args:
+        subject_source (str): A subject source to validate.
+
+    Returns:
+        <bool, str|NoneType>: A pair containing the value True if the specified source is a
+            non-empty string, False otherwise; and an error message in case validation failed.
+    """
+    message = "A tutorial subject's 'source' field must be a non-empty string."
+    return (False, message) if is_empty_string(subject_source) else (True, None)
+
+
+def __is_page(subject_page):
+    """Validates the specified tutorial subject page.
+
+    Args:
+        subject_page (str): A subject page to validate.
+
+    Returns:
+        <bool, str|NoneType>: A pair containing the value True if the specified page is a
+            non-empty string, False otherwise; and an error message in case validation failed.
+    """
+    message = "A tutorial subject's 'page' field must be a non-empty string."
+    return (False, message) if is_empty_string(subject_page) else (True, None)
+
+
+def __is_attribution(subject_attribution):
+    """Validates the specified tutorial subject attribution.
+
+    Args:
+        subject_attribution (str): A subject attribution to validate.
+
+    Returns:
+        <bool, str|NoneType>: A pair containing the value True if the specified attribution is a
+            non-empty string, False otherwise; and an error message in case validation failed.
+    """
+    message = "A tutorial subject's 'attribution' field must be a non-empty string."
+    return (False, message) if is_empty_string(subject_attribution) else (True, None)
+
+
+def are_subject_assertions(subject_assertions, languages=None):
+    """Returns a generator of every error found in the specified tutorial subject assertions.
+
+    Args:
+        subject_assertions (dict): A dictionary that maps question keys to assertions.
+        languages (list|LanguageContext): A list of available languages, or a language context.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If the subject_assertions argument is not a dictionary.
+    """
+    check_arg_type(are_subject_assertions, "subject_assertions", subject_assertions, dict)
+    from question import is_question_key
+    iter_assertion_errors = is_tutorial_subject_assertion.SCHEMA.iter_errors
+    for key, assertion in subject_assertions.iteritems():
+        valid, message = is_question_key(key)
+        if not valid:
+            yield message
+        for message in iter_assertion_errors(assertion, languages):
+            yield message
 
 
 def is_tutorial_subject_assertion(tutorial_subject_assertion, languages=None):
@@ -192,7 +292,7 @@ def is_tutorial_subject_assertion(tutorial_subject_assertion, languages=None):
 
     Args:
         tutorial_subject_assertion (dict): A subject assertion to validate.
-        languages (list): A list of available languages.
+        languages (list|LanguageContext): A list of available languages, or a language context.
 
     Returns:
         <bool, str|NoneType>: A pair containing the value True if the specified assertion
@@ -200,32 +300,116 @@ def is_tutorial_subject_assertion(tutorial_subject_assertion, languages=None):
 
     Raises:
         TypeError: If the tutorial_subject_assertion argument is not a dictionary, or
-            the languages argument is not a list or NoneType.
-    """
-    check_arg_type(is_tutorial_subject_assertion, "languages", languages, (list, type(None)))
-
-    def is_expects(assertion_expects):
-        message = "A tutorial subject assertion's 'expects' field must be a non-empty string."
-        return (False, message) if is_empty_string(assertion_expects) else (True, None)
-
-    def is_messages(assertion_messages):
-        check_arg_type(is_messages, "assertion_messages", assertion_messages, dict)
-        if any(not is_configuration_string(m, languages) for m in assertion_messages.itervalues()):
-            return (False, "A tutorial subject assertion message must be a non-empty or normalized string.")
-        return (True, None)
-
-    def is_autocomplete(assertion_autocomplete):
-        message = "A tutorial subject assertion's 'autocomplete' field must contain a boolean value."
-        return (True, None) if isinstance(assertion_autocomplete, bool) else (False, message)
-
-    return is_configuration(
-        tutorial_subject_assertion,
-        required_fields=frozenset(["expects"]),
-        field_validators={
-            "expects": is_expects,
-            "messages": is_messages,
-            "autocomplete": is_autocomplete,
-        },
-        missing_field_message="A tutorial subject assertion configuration is missing the following field(s): '{}'.",
-        unexpected_field_message="The tutorial subject assertion configuration key '{}' is not recognized."
-    )
+            the languages argument is not a list, LanguageContext or NoneType.
+    """
+    check_arg_type(is_tutorial_subject_assertion, "languages", languages, (list, LanguageContext, type(None)))
+    return is_tutorial_subject_assertion.SCHEMA.validate(tutorial_subject_assertion, languages)
+
+
+def iter_tutorial_subject_assertion_errors(tutorial_subject_assertion, languages=None):
+    """Returns a generator of every error found in the specified tutorial subject assertion.
+
+    Args:
+        tutorial_subject_assertion (dict): A subject assertion to validate.
+        languages (list|LanguageContext): A list of available languages, or a language context.
+
+    Returns:
+        generator: A generator of error messages.
+
+    Raises:
+        TypeError: If the tutorial_subject_assertion argument is not a dictionary, or
+            the languages argument is not a list, LanguageContext or NoneType.
+    """
+    check_arg_type(is_tutorial_subject_assertion, "languages", languages, (list, LanguageContext, type(None)))
+    return is_tutorial_subject_assertion.SCHEMA.iter_errors(tutorial_subject_assertion, languages)
+
+
+def __is_expects(assertion_expects):
+    """Validates the specified tutorial subject assertion's expected answer.
+
+    Args:
+        assertion_expects (str): An expected answer to validate.
+
+    Returns:
+        <bool, str|NoneType>: A pair containing the value True if the specified answer is a
+            non-empty string, False otherwise; and an error message in case validation failed.
+    """
+    message = "A tutorial subject assertion's 'expects' field must be a non-empty string."
+    return (False, message) if is_empty_string(assertion_expects) else (True, None)
+
+
+def __is_messages(assertion_messages, languages=None):
+    """Validates the specified tutorial subject assertion's messages.
+
+    Args:
+        assertion_messages (dict): A dictionary that maps answers to the messages to validate.
+        languages (list|LanguageContext): A list of available languages, or a language context.
+
+    Returns:
+        <bool, str|NoneType>: A pair containing the value True if every message is a non-empty
+            or normalized string, False otherwise; and an error message in case validation failed.
+
+    Raises:
+        TypeError: If the assertion_messages argument is not a dictionary.
+    """
+    check_arg_type(__is_messages, "assertion_messages", assertion_messages, dict)
+    if any(not is_configuration_string(m, languages) for m in assertion_messages.itervalues()):
+        return (False, "A tutorial subject assertion message must be a non-empty or normalized string.")
+    return (True, None)
+
+
+def __is_autocomplete(assertion_autocomplete):
+    """Validates the specified tutorial subject assertion's autocomplete flag.
+
+    Args:
+        assertion_autocomplete (bool): An autocomplete flag to validate.
+
+    Returns:
+        <bool, str|NoneType>: A pair containing the value True if the specified flag is a
+            boolean, False otherwise; and an error message in case validation failed.
+    """
+    message = "A tutorial subject assertion's 'autocomplete' field must contain a boolean value."
+    return (True, None) if isinstance(assertion_autocomplete, bool) else (False, message)
+
+
+is_tutorial_configuration.SCHEMA = Schema(
+    required_fields=frozenset(["subjects"]),
+    field_validators={
+        "enable-random-order": is_tutorial_enable_random_order,
+        "default-message": is_tutorial_default_message,
+        "subjects": are_subjects,
+    },
+    missing_field_message="The tutorial configuration is missing the following field(s): '{}'.",
+    unexpected_field_message="The tutorial configuration key '{}' is not recognized.",
+    contextual_fields=frozenset(["default-message", "subjects"])
+)
+"""The tutorial configuration schema. Its contextual fields expect a list of available languages."""
+
+
+is_tutorial_subject.SCHEMA = Schema(
+    required_fields=frozenset(["source", "page", "assertions"]),
+    field_validators={
+        "source": __is_source,
+        "page": __is_page,
+        "attribution": __is_attribution,
+        "assertions": are_subject_assertions,
+    },
+    missing_field_message="The tutorial's subject configuration is missing the following field(s): '{}'.",
+    unexpected_field_message="The tutorial's subject configuration key '{}' is not recognized.",
+    contextual_fields=frozenset(["assertions"])
+)
+"""The tutorial subject configuration schema. Its contextual fields expect a list of available languages."""
+
+
+is_tutorial_subject_assertion.SCHEMA = Schema(
+    required_fields=frozenset(["expects"]),
+    field_validators={
+        "expects": __is_expects,
+        "messages": __is_messages,
+        "autocomplete": __is_autocomplete,
+    },
+    missing_field_message="A tutorial subject assertion configuration is missing the following field(s): '{}'.",
+    unexpected_field_message="The tutorial subject assertion configuration key '{}' is not recognized.",
+    contextual_fields=frozenset(["messages"])
+)
+"""The tutorial subject assertion configuration schema. Its contextual fields expect a list of available languages."""
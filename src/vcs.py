@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains functions that find the projects modified in a git repository.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+import subprocess
+from helper import check_arg_type, is_directory, is_project_directory
+
+def get_changed_projects(paths, revision=None, staged=False):
+    """Returns the projects that contain files changed in the git repositories at the specified paths.
+
+    A file belongs to the innermost project directory that contains it, e.g. a modified help
+    file belongs to the project whose help directory it is in. Only the projects located in one
+    of the specified paths are returned.
+
+    Args:
+        paths (list): A list of paths to directories in git repositories.
+        revision (str|None): If specified, files are compared to this revision, e.g. 'HEAD~1'
+            or 'origin/master'. Otherwise they are compared to the index.
+        staged (bool): If set to True, staged files are compared instead of the working tree.
+
+    Returns:
+        list: The sorted paths of the project directories that contain changed files.
+
+    Raises:
+        TypeError: If the paths argument is not a list, revision is not a string or NoneType,
+            or staged is not a boolean.
+        IOError: If a path is not in a git repository, or git could not be run.
+    """
+    check_arg_type(get_changed_projects, "paths", paths, list)
+    check_arg_type(get_changed_projects, "revision", revision, (basestring, type(None)))
+    check_arg_type(get_changed_projects, "staged", staged, bool)
+
+    roots = [os.path.realpath(p) for p in paths]
+    filenames = set()
+    for root in set(_get_toplevel(p) for p in roots):
+        filenames.update(get_changed_files(root, revision, staged))
+
+    projects = set()
+    directories = {}
+    for filename in filenames:
+        project = _get_project_directory(os.path.dirname(filename), directories)
+        if project is not None and any(project == r or project.startswith(r + os.sep) for r in roots):
+            projects.add(project)
+
+    return sorted(projects)
+
+
+def get_changed_files(path, revision=None, staged=False):
+    """Returns the files that have changed in the git repository at the specified path.
+
+    Args:
+        path (str): A path to a directory in a git repository.
+        revision (str|None): If specified, files are compared to this revision. Otherwise they
+            are compared to the index.
+        staged (bool): If set to True, staged files are compared instead of the working tree.
+
+    Returns:
+        list: The absolute paths of the changed files, including deleted files. A renamed
+            file is reported under both its former and its new name.
+
+    Raises:
+        IOError: If the path is not in a git repository, or git could not be run.
+    """
+    arguments = ["diff", "--name-only", "--no-renames", "-z"]
+    if staged:
+        arguments.append("--cached")
+    if revision is not None:
+        arguments.append(revision)
+    arguments.append("--")
+
+    toplevel = _get_toplevel(path)
+    return [os.path.join(toplevel, f) for f in _git(path, *arguments).split("\0") if f]
+
+
+def _get_toplevel(path):
+    """Returns the root directory of the git repository at the specified path.
+    """
+    return os.path.realpath(_git(path, "rev-parse", "--show-toplevel").strip())
+
+
+def _get_project_directory(path, directories):
+    """Returns the innermost project directory that contains the specified path, or None if there is
+    none. The directories dictionary remembers which project each directory checked belongs to.
+    """
+    visited = []
+    project = None
+    while True:
+        if path in directories:
+            project = directories[path]
+            break
+        visited.append(path)
+        if is_directory(path) and is_project_directory(path, False):
+            project = path
+            break
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+
+    for directory in visited:
+        directories[directory] = project
+    return project
+
+
+def _git(path, *arguments):
+    """Runs a git command in the specified directory and returns its output.
+
+    Raises:
+        IOError: If git could not be run or the command failed.
+    """
+    try:
+        process = subprocess.Popen(["git"] + list(arguments), cwd=path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as e:
+        raise IOError("Could not run git in '{}': {}".format(path, e.strerror))
+
+    output, error = process.communicate()
+    if process.returncode != 0:
+        raise IOError("The command 'git {}' failed in '{}': {}".format(" ".join(arguments), path, error.strip()))
+    return output
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project validator tool.
+# It contains the watcher used to re-validate projects as they are being edited.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+from itertools import islice
+from core import iter_configuration_set_errors
+from helper import deserialize_json, deserialize_help, get_help_key, get_help_keys, warn_orphan_help_files
+
+class ProjectWatcher(object):
+    """Keeps the configuration set of a GeoTag-X project in memory and reloads only the files
+    that have changed whenever it is polled.
+
+    The errors found in each configuration are remembered too, so that only the configurations
+    that depend on a modified file are validated again.
+    """
+    def __init__(self, path, max_errors=1, help_cache=None):
+        """Initializes the watcher. Note that no file is loaded until the watcher is first polled.
+
+        Args:
+            path (str): A path to a GeoTag-X project directory.
+            max_errors (int): The maximum number of errors that will be requested from iter_errors,
+                or 0 if every error will be requested.
+            help_cache (cache.DiskCache): An optional cache of minified help.
+        """
+        self.path = path
+        self.max_errors = max_errors
+        self.help_cache = help_cache
+        self.configurations = {}
+        self.__stamps = {}
+        self.__help = {}
+        self.__failures = {}
+        self.__help_failure = None
+        self.__help_keys = set()
+        self.__errors = {}
+
+    def poll(self):
+        """Reloads the files that have changed since the watcher was last polled.
+
+        Returns:
+            set: The keys of the configurations that must be validated again, which is empty
+                if none of the project's files has changed.
+        """
+        reloaded = set()
+        for key in iter_configuration_set_errors.KEYS:
+            filename = os.path.join(self.path, "{}.json".format(key))
+            if self.__has_changed(filename):
+                self.__load(key, filename)
+                reloaded.add(key)
+
+        if "task_presenter" in reloaded or self.__has_help_changed():
+            self.__load_help()
+            reloaded.add("task_presenter")
+
+        stale = set(k for k, dependencies in iter_configuration_set_errors.DEPENDENCIES.iteritems() if dependencies & reloaded)
+        for key in stale:
+            self.__errors.pop(key, None)
+
+        return stale
+
+    def iter_errors(self):
+        """Returns a generator of every error found in the project's configuration set.
+
+        Returns:
+            generator: A generator of error messages.
+
+        Raises:
+            IOError: If a required configuration could not be loaded.
+            ValueError: If a configuration could not be deserialized.
+        """
+        for key in iter_configuration_set_errors.KEYS:
+            if key in self.__failures:
+                raise self.__failures[key]
+        if self.__help_failure is not None:
+            raise self.__help_failure
+
+        # This raises the same exceptions as a complete validation if the set is incomplete.
+        iter_configuration_set_errors(self.configurations, [])
+        return self.__iter_errors()
+
+    def __iter_errors(self):
+        """Generates the errors found in each configuration, validating only the configurations
+        whose errors are unknown.
+        """
+        for key in iter_configuration_set_errors.KEYS:
+            entry = self.__errors.get(key)
+            if entry is None:
+                entry = self.__validate(key)
+                self.__errors[key] = entry
+
+            messages, exception = entry
+            for message in messages:
+                yield message
+            if exception is not None:
+                raise exception
+
+    def __validate(self, key):
+        """Returns a pair containing the errors found in the configuration with the specified key,
+        and the exception raised while it was being validated, if any.
+        """
+        messages = []
+        try:
+            errors = iter_configuration_set_errors(self.configurations, [key])
+            for message in (islice(errors, self.max_errors) if self.max_errors > 0 else errors):
+                messages.append(message)
+        except Exception as e:
+            return (messages, e)
+
+        return (messages, None)
+
+    def __has_changed(self, filename):
+        """Checks if the file with the specified filename has changed since it was last loaded.
+        """
+        try:
+            status = os.stat(filename)
+            stamp = (status.st_mtime, status.st_size)
+        except OSError:
+            stamp = None
+
+        if self.__stamps.get(filename, False) == stamp:
+            return False
+
+        self.__stamps[filename] = stamp
+        return True
+
+    def __load(self, key, filename):
+        """Loads the configuration with the specified key from the file with the specified filename.
+        """
+        self.__failures.pop(key, None)
+        self.configurations.pop(key, None)
+        try:
+            self.configurations[key] = deserialize_json(filename)
+        except IOError as e:
+            # Only the tutorial configuration is optional.
+            if key != "tutorial":
+                self.__failures[key] = e
+        except Exception as e:
+            self.__failures[key] = e
+
+    def __help_filenames(self):
+        """Returns a generator of triples containing a question, the name of its help file and
+        the value True if the help file exists, False otherwise.
+        """
+        help_keys = self.__get_help_keys()
+        filepath = os.path.join(self.path, "help", "{}.html")
+        for question in self.configurations["task_presenter"]["questionnaire"]["questions"]:
+            key = get_help_key(question["key"])
+            yield (question, filepath.format(key), key in help_keys)
+
+    def __get_help_keys(self):
+        """Returns the keys of the existing help files. The help directory is only scanned
+        again when it has been modified, i.e. when a file was created, renamed or removed.
+        """
+        if self.__has_changed(os.path.join(self.path, "help")):
+            self.__help_keys = get_help_keys(self.path)
+        return self.__help_keys
+
+    def __has_help_file_changed(self, filename, exists):
+        """Checks if the specified help file has changed since it was last loaded. A help file
+        that does not exist is not accessed.
+        """
+        if exists:
+            return self.__has_changed(filename)
+
+        changed = self.__stamps.get(filename) is not None
+        self.__stamps[filename] = None
+        return changed
+
+    def __has_help_changed(self):
+        """Checks if a question's help file has changed since it was last loaded.
+        """
+        if "task_presenter" not in self.configurations:
+            return False
+
+        changed = False
+        try:
+            for _, filename, exists in self.__help_filenames():
+                changed = self.__has_help_file_changed(filename, exists) or changed
+        except Exception:
+            # The task presenter configuration is malformed, which was reported when it was loaded.
+            return False
+
+        return changed
+
+    def __load_help(self):
+        """Adds the help of each question to the task presenter configuration. Help files that
+        have not changed since they were last loaded are not read again.
+        """
+        self.__help_failure = None
+        if "task_presenter" not in self.configurations:
+            return
+
+        help = {}
+        question_keys = set()
+        try:
+            for question, filename, exists in self.__help_filenames():
+                question_keys.add(get_help_key(question["key"]))
+                self.__has_help_file_changed(filename, exists)
+                stamp = self.__stamps[filename]
+                entry = self.__help.get(filename)
+                if stamp is None:
+                    if entry is not None:
+                        # The help file was removed so the question's original help, if any, must be restored.
+                        self.__load("task_presenter", os.path.join(self.path, "task_presenter.json"))
+                        self.__help = {}
+                        return self.__load_help()
+                    continue
+                elif entry is None or entry[0] != stamp:
+                    try:
+                        entry = (stamp, deserialize_help(filename, self.help_cache))
+                    except IOError:
+                        # A help file is not always guaranteed to exist.
+                        continue
+                question["help"] = entry[1]
+                help[filename] = entry
+        except Exception as e:
+            self.__help_failure = e
+        else:
+            warn_orphan_help_files(self.path, self.__help_keys - question_keys)
+
+        self.__help = help
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the archive module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from archive import Archive, get_archive, split_archive_path
+
+class TestArchive(unittest.TestCase):
+    FILES = {
+        "demo/project.json": {"name": "Demo", "short_name": "demo", "description": "A demo."},
+        "demo/task_presenter.json": {
+            "language": {"default": "en", "available": ["en"]},
+            "subject": {"type": "image"},
+            "questionnaire": {"questions": [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}}]}
+        },
+        "demo/help/q1.html": "<p>  Help  <!-- Comment --> </p>",
+        "demo/README.md": "A demo.",
+        "other/nested/project.json": {"name": "Other", "short_name": "other", "description": "Another demo."},
+        "other/nested/task_presenter.json": {},
+        "incomplete/project.json": {},
+    }
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.zip = os.path.join(self.directory, "projects.zip")
+        self.tar = os.path.join(self.directory, "projects.tar.gz")
+
+        source = os.path.join(self.directory, "source")
+        for name, data in self.FILES.iteritems():
+            filename = os.path.join(source, *name.split("/"))
+            if not os.path.isdir(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+            with open(filename, "w") as file:
+                file.write(data if isinstance(data, str) else json.dumps(data))
+
+        with zipfile.ZipFile(self.zip, "w") as archive:
+            for name in self.FILES:
+                archive.write(os.path.join(source, *name.split("/")), name)
+        with tarfile.open(self.tar, "w:gz") as archive:
+            archive.add(source, ".")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_find_projects(self):
+        for filename in [self.zip, self.tar]:
+            archive = Archive(filename)
+            projects = [os.path.join(filename, "demo"), os.path.join(filename, "other", "nested")]
+            self.assertEqual(archive.find_projects(), projects, "Every complete project")
+            self.assertEqual(archive.find_projects("other"), projects[1:], "Projects in a directory")
+            self.assertEqual(archive.find_projects("demo"), projects[:1], "Project directory")
+            self.assertEqual(archive.find_projects("missing"), [], "Missing directory")
+            archive.close()
+
+    def test_deserialize_configuration_set(self):
+        for filename in [self.zip, self.tar]:
+            archive = Archive(filename)
+            configurations = archive.deserialize_configuration_set(os.path.join(filename, "demo"))
+            self.assertEqual(configurations["project"], self.FILES["demo/project.json"])
+            self.assertEqual(configurations["task_presenter"]["questionnaire"]["questions"][0]["help"], "<p> Help </p>", "Minified help")
+            self.assertNotIn("tutorial", configurations)
+            self.assertIsNone(archive.deserialize_configuration_set(os.path.join(filename, "incomplete")), "Incomplete project")
+            archive.close()
+
+    def test_archive_paths(self):
+        self.assertEqual(split_archive_path(self.zip), (self.zip, ""), "Archive")
+        self.assertEqual(split_archive_path(os.path.join(self.tar, "other", "nested")), (self.tar, "other/nested"), "Directory in an archive")
+        self.assertIsNone(split_archive_path(self.directory), "Directory")
+        self.assertIsNone(split_archive_path(os.path.join(self.directory, "missing.zip")), "Missing archive")
+        self.assertIs(get_archive(self.zip), get_archive(self.zip), "Archives are opened once")
+
+    def test_illegal_archives(self):
+        filename = os.path.join(self.directory, "illegal.zip")
+        with open(filename, "w") as file:
+            file.write("Not an archive.")
+        self.assertRaises(IOError, Archive, filename)
+        self.assertRaises(IOError, Archive, os.path.join(self.directory, "missing.zip"))
+        self.assertRaises(IOError, Archive(self.zip).open, "demo/missing.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
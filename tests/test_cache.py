@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the cache module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from cache import DiskCache, ValidationCache, get_rules_signature
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src", "__main__.py")
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_and_set(self):
+        cache = DiskCache(self.directory, 1024)
+        self.assertIsNone(cache.get("0123abcd"), "Missing entry")
+        cache.set("0123abcd", "data")
+        self.assertEqual(cache.get("0123abcd"), "data", "Stored entry")
+        self.assertEqual((cache.hits, cache.misses, cache.writes), (1, 1, 1))
+
+    def test_prune(self):
+        cache = DiskCache(self.directory, 10)
+        for i, key in enumerate(["aa00", "bb00", "cc00"]):
+            cache.set(key, "12345")
+            filename = os.path.join(self.directory, key[:2], key[2:])
+            os.utime(filename, (i, i))
+        self.assertEqual(cache.prune(), 1, "One entry must be evicted")
+        self.assertIsNone(cache.get("aa00"), "The least recently used entry is evicted")
+        self.assertEqual(cache.get("cc00"), "12345", "The most recently used entry is kept")
+
+    def test_help_cache(self):
+        from helper import deserialize_help
+        filename = os.path.join(self.directory, "help.html")
+        with open(filename, "w") as file:
+            file.write("<p>  Help  <!-- Comment --> </p>")
+        cache = DiskCache(os.path.join(self.directory, "cache"), 1024)
+        self.assertEqual(deserialize_help(filename, cache), u"<p> Help </p>", "Minified help")
+        self.assertEqual(deserialize_help(filename, cache), u"<p> Help </p>", "Cached help")
+        self.assertEqual(cache.hits, 1, "The minified help was found in the cache")
+
+
+class TestValidationCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.project = os.path.join(self.directory, "project")
+        os.mkdir(self.project)
+        self.write("project.json", "{}")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, filename, data):
+        with open(os.path.join(self.project, filename), "w") as file:
+            file.write(data)
+
+    def test_results(self):
+        cache = ValidationCache(os.path.join(self.directory, "cache"), 1024 * 1024)
+        content_key, result = cache.get(self.project)
+        self.assertIsNone(result, "Cold cache")
+        cache.set(content_key, False, ["First error.", "Second error."])
+        self.assertEqual(cache.get(self.project), (content_key, (False, ["First error.", "Second error."])), "Cached result")
+
+        self.write("project.json", "{\"name\": \"Demo\"}")
+        content_key, result = cache.get(self.project)
+        self.assertIsNone(result, "Modified project")
+        cache.set(content_key, True, [])
+        self.assertEqual(cache.get(self.project)[1], (True, []), "Cached valid result")
+
+    def test_salt(self):
+        cache = ValidationCache(os.path.join(self.directory, "cache"), 1024 * 1024, "a")
+        cache.set(cache.get(self.project)[0], True, [])
+        other_cache = ValidationCache(os.path.join(self.directory, "cache"), 1024 * 1024, "b")
+        self.assertIsNone(other_cache.get(self.project)[1], "Different validation options")
+
+    def test_rules_signature(self):
+        signature = get_rules_signature()
+        self.assertEqual(len(signature), 40, "SHA-1 digest")
+        cache = ValidationCache(os.path.join(self.directory, "cache"), 1024 * 1024)
+        cache.set(cache.get(self.project)[0], True, [])
+        try:
+            get_rules_signature.SIGNATURE = "other"
+            other_cache = ValidationCache(os.path.join(self.directory, "cache"), 1024 * 1024)
+            self.assertIsNone(other_cache.get(self.project)[1], "Different validation rules")
+        finally:
+            get_rules_signature.SIGNATURE = signature
+
+    def test_bypassed_cache(self):
+        directory = os.path.join(self.directory, "cache")
+        DiskCache(directory, 1024).set("aa00", "data")
+        self.write("task_presenter.json", "{}")
+        with open(os.devnull, "w") as output:
+            for option in ["--profile", "--memory-profile", "--coverage"]:
+                subprocess.call([sys.executable, MAIN, "--cache-dir", directory, "--cache-size", "0", option, self.project], stdout=output, stderr=output)
+                self.assertTrue(os.path.exists(os.path.join(directory, "aa", "00")), "The cache is not pruned with " + option)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the daemon module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import imp
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import zipfile
+from daemon import ValidationServer, ValidationClient
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src", "__main__.py")
+
+class TestValidationDaemon(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "project")
+        os.mkdir(self.path)
+        self.write("project.json", {
+            "name": "Demo",
+            "short_name": "demo",
+            "description": "A demo."
+        })
+        self.write("task_presenter.json", {
+            "language": {"default": "en", "available": ["en"]},
+            "subject": {"type": "image"},
+            "questionnaire": {"questions": [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}}]}
+        })
+
+        self.address = os.path.join(self.directory, "daemon.sock")
+        self.server = ValidationServer(self.address, max_errors=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.01})
+        self.thread.start()
+        self.client = ValidationClient(self.address)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def write(self, filename, data):
+        filename = os.path.join(self.path, filename)
+        with open(filename, "w") as file:
+            json.dump(data, file)
+        # Make sure the modification is detected even if the file system's timestamps are coarse.
+        status = os.stat(filename)
+        os.utime(filename, (status.st_atime, status.st_mtime + 1))
+
+    def test_path_requests(self):
+        response = self.client.validate_path(self.path, 0)
+        self.assertEqual(response, {"path": os.path.realpath(self.path), "valid": True, "errors": []}, "Valid project")
+        self.assertEqual(len(self.server.watchers), 1, "The project is kept in memory")
+
+        self.write("project.json", {"name": "", "short_name": "#demo"})
+        response = self.client.validate_path(self.path, 0)
+        self.assertFalse(response["valid"], "Modified project")
+        self.assertEqual(len(response["errors"]), 3, "Missing description, illegal name and short name")
+        self.assertEqual(len(self.client.validate_path(self.path, 1)["errors"]), 1, "Maximum number of errors")
+
+        response = self.client.validate_path(os.path.join(self.directory, "missing"))
+        self.assertFalse(response["valid"], "Missing project")
+        self.assertTrue(response["errors"][0].startswith("IOError"))
+
+    def test_non_ascii_keys(self):
+        self.write("task_presenter.json", {
+            "language": {"default": "en", "available": ["en"]},
+            "subject": {"type": "image"},
+            "questionnaire": {"questions": [{"key": u"et\u00e0", "title": "Is it?", "input": {"type": "polar"}}]}
+        })
+        response = self.server.respond({"path": unicode(self.path), "max_errors": 0})
+        self.assertEqual(len(response["errors"]), 1, "Illegal question key")
+        self.assertTrue(response["errors"][0].startswith("A question key must be"), response["errors"][0])
+
+    def test_configuration_requests(self):
+        configurations = {
+            "project": {"name": "Demo", "short_name": "demo", "description": "A demo."},
+            "task_presenter": {
+                "language": {"default": "en", "available": ["en"]},
+                "subject": {"type": "image"},
+                "questionnaire": {"questions": [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}}]}
+            },
+        }
+        self.assertEqual(self.client.validate_configurations(configurations), {"valid": True, "errors": []}, "Valid configurations")
+        del configurations["task_presenter"]
+        response = self.client.validate_configurations(configurations)
+        self.assertFalse(response["valid"], "Missing task presenter")
+        self.assertTrue(response["errors"][0].startswith("ValueError"))
+
+    def test_illegal_requests(self):
+        self.assertRaises(ValueError, self.client.request, [])
+        self.assertRaises(ValueError, self.client.request, {})
+        self.assertRaises(ValueError, self.client.request, {"path": 42})
+        self.assertRaises(ValueError, self.client.request, {"path": self.path, "max_errors": -1})
+        self.assertTrue(self.client.validate_path(self.path)["valid"], "The connection is still usable")
+
+    def test_connected_command_line(self):
+        archive = os.path.join(self.directory, "projects.zip")
+        with zipfile.ZipFile(archive, "w") as file:
+            for filename in ["project.json", "task_presenter.json"]:
+                file.write(os.path.join(self.path, filename), "demo/" + filename)
+
+        main = imp.load_source("geotagx_validator_main", MAIN)
+        paths = [self.path, os.path.join(archive, "demo")]
+        arguments = main.get_argparser().parse_args(["--connect", "--socket", self.address, "--no-cache"] + paths)
+        results = [result[:3] for result in main._validate_paths(paths, arguments)]
+        self.assertEqual(results, [(p, True, []) for p in paths], "Archived projects are validated in the client's process")
+        self.assertEqual(self.server.watchers.keys(), [(os.path.realpath(self.path), 1)], "Only the project directory is validated by the daemon")
+
+        for option in ["--profile", "--memory-profile", "--stream", "--coverage"]:
+            arguments = main.get_argparser().parse_args(["--connect", "--socket", self.address, "--no-cache", "--max-errors", "0", option, self.path])
+            path, valid, _, _, profiles = next(main._validate_paths([self.path], arguments))
+            self.assertTrue(valid, option)
+            self.assertEqual(len(self.server.watchers), 1, "Projects are validated in the client's process with " + option)
+            if option != "--stream":
+                self.assertIsNotNone(profiles, "Projects are profiled with " + option)
+
+    def test_concurrent_connections(self):
+        other_client = ValidationClient(self.address)
+        try:
+            self.assertTrue(other_client.validate_path(self.path)["valid"], "An open connection does not block the others")
+        finally:
+            other_client.close()
+        self.assertTrue(self.client.validate_path(self.path)["valid"], "The first connection is still usable")
+
+    def test_socket(self):
+        self.assertRaises(IOError, ValidationServer, self.address)
+        self.assertRaises(socket.error, ValidationClient, os.path.join(self.directory, "other.sock"))
+
+
+if __name__ == "__main__":
+    unittest.main()
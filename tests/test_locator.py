@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the locator module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+import shutil
+import tempfile
+import unittest
+from locator import ProjectLocator
+
+class TestProjectLocator(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.realpath(tempfile.mkdtemp())
+        for project in ["a", "b/c", "b/d/e", ".hidden/f", "a/nested"]:
+            self.create_project(project)
+        os.makedirs(self.join("b/incomplete"))
+        open(self.join("b/incomplete/project.json"), "w").close()
+        os.symlink(self.join("b"), self.join("link"))
+        os.symlink(self.path, self.join("b/d/loop"))
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def join(self, path):
+        return os.path.join(self.path, *path.split("/"))
+
+    def create_project(self, path):
+        os.makedirs(self.join(path))
+        for filename in ["project.json", "task_presenter.json"]:
+            open(os.path.join(self.join(path), filename), "w").close()
+
+    def test_recursive_discovery(self):
+        projects = [self.join(p) for p in ["a", "b/c", "b/d/e"]]
+        self.assertEqual(ProjectLocator().locate([self.path]), projects, "Projects are found once, and nested and hidden directories are not searched")
+        self.assertEqual(ProjectLocator().locate([self.join("b/c"), self.path]), [projects[1], projects[0], projects[2]], "Roots retain their order")
+        self.assertEqual(ProjectLocator().locate([self.join(".hidden")]), [self.join(".hidden/f")], "A hidden root is searched")
+        self.assertEqual(ProjectLocator().locate([self.join("a/nested")]), [self.join("a/nested")], "A nested project root")
+
+    def test_depth(self):
+        self.assertEqual(ProjectLocator(max_depth=0).locate([self.path, self.join("a")]), [self.join("a")], "Only the roots are checked")
+        self.assertEqual(ProjectLocator(max_depth=1).locate([self.path]), [self.join("a")])
+        self.assertEqual(ProjectLocator(max_depth=2).locate([self.path]), [self.join("a"), self.join("b/c")])
+
+    def test_exclusion(self):
+        self.assertEqual(ProjectLocator(exclude=["c"]).locate([self.path]), [self.join("a"), self.join("b/d/e")], "Excluded name")
+        self.assertEqual(ProjectLocator(exclude=["b/d"]).locate([self.path]), [self.join("a"), self.join("b/c")], "Excluded relative path")
+        self.assertEqual(ProjectLocator(exclude=["b", "link"]).locate([self.path]), [self.join("a")], "Excluded names")
+
+    def test_illegal_roots(self):
+        self.assertRaises(IOError, ProjectLocator().locate, [self.join("missing")])
+        self.assertRaises(IOError, ProjectLocator().locate, [self.join("a/project.json")])
+        self.assertRaises(TypeError, ProjectLocator().locate, self.path)
+        self.assertRaises(TypeError, ProjectLocator().locate, [42])
+        self.assertRaises(TypeError, ProjectLocator, "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
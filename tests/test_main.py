@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the command-line interface.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src", "__main__.py")
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create(self, name, questions, tutorial=None):
+        """Creates a project with the specified questions and optional tutorial, and returns its path.
+        """
+        path = os.path.join(self.directory, name)
+        os.mkdir(path)
+        configurations = {
+            "project": {"name": "Demo", "short_name": "demo", "description": "A demo."},
+            "task_presenter": {
+                "language": {"default": "en", "available": ["en", "fr"]},
+                "subject": {"type": "image"},
+                "questionnaire": {"questions": questions},
+            },
+        }
+        if tutorial is not None:
+            configurations["tutorial"] = tutorial
+        for key, configuration in configurations.iteritems():
+            with open(os.path.join(path, key + ".json"), "w") as file:
+                json.dump(configuration, file)
+        return path
+
+    def execute(self, *args):
+        """Runs the validator with the specified arguments, with its output piped, and returns
+        its exit code and output.
+        """
+        process = subprocess.Popen([sys.executable, MAIN, "--no-cache"] + list(args), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        output = process.communicate()[0]
+        return (process.returncode, output)
+
+    def test_non_ascii_messages(self):
+        options = [{"label": v, "value": v} for v in [u"Côte d'Ivoire", u"Côte d'Ivoire"]]
+        invalid = self.create("invalid", [
+            {"key": "q1", "title": "Where?", "input": {"type": "multiple-option", "options": options}},
+        ])
+        valid = self.create("valid", [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}}])
+        exit_code, output = self.execute("--max-errors", "0", invalid, valid)
+        self.assertEqual(exit_code, 1)
+        self.assertIn(u"  - The following option values are not unique: 'Côte d'Ivoire' (positions 1, 2).".encode("utf-8"), output.splitlines())
+        self.assertIn("The project located at '{}' is valid.".format(valid), output.splitlines(), "The batch is not interrupted")
+
+    def test_non_ascii_coverage(self):
+        tutorial = {
+            "default-message": {"on-wrong-answer": {"en": "Wrong.", "fr": "Faux."}},
+            "subjects": [{"source": "s", "page": "p", "assertions": {u"età": {"expects": "yes", "messages": {"on-wrong-answer": {"en": "No."}}}}}],
+        }
+        covered = self.create("covered", [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}}], tutorial)
+        valid = self.create("valid", [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}}])
+        exit_code, output = self.execute("--coverage", covered, valid)
+        self.assertEqual(exit_code, 1, "The assertion key does not match any question")
+        self.assertIn(u"    - tutorial.subjects[0].assertions.età.messages.on-wrong-answer".encode("utf-8"), output.splitlines())
+        self.assertIn("Translation coverage of the batch:", output.splitlines(), "The batch is not interrupted")
+
+    def create_batch(self):
+        """Creates a batch of valid and invalid projects, and returns their paths.
+        """
+        valid = [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}}]
+        invalid = [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}, "branch": "q2"}]
+        return [self.create(name, invalid if name.startswith("invalid") else valid) for name in ["valid1", "invalid1", "valid2", "invalid2", "valid3"]]
+
+    def test_jobs(self):
+        paths = self.create_batch()
+        serial = self.execute("--jobs", "1", *paths)
+        parallel = self.execute("--jobs", "2", *paths)
+        self.assertEqual(serial[0], 1)
+        self.assertEqual(parallel, serial, "Results are printed in the same order regardless of the number of jobs")
+        lines = [line for line in serial[1].splitlines() if line.startswith("The project")]
+        self.assertEqual(lines, [
+            "The project located at '{}' is {}".format(path, "invalid:" if "invalid" in path else "valid.") for path in paths
+        ], "Results are printed in the order of the paths")
+
+    def test_fail_fast(self):
+        paths = self.create_batch()
+        for jobs in ["1", "2"]:
+            exit_code, output = self.execute("--fail-fast", "--jobs", jobs, *paths)
+            self.assertEqual(exit_code, 1, "An invalid project fails the batch")
+            self.assertEqual([line for line in output.splitlines() if line.startswith("The project")], [
+                "The project located at '{}' is valid.".format(paths[0]),
+                "The project located at '{}' is invalid:".format(paths[1]),
+            ], "Validation stops after the first invalid project")
+
+        exit_code, output = self.execute("--fail-fast", "--jobs", "2", paths[0], paths[2], paths[4])
+        self.assertEqual(exit_code, 0, "A batch of valid projects succeeds")
+        self.assertEqual(len([line for line in output.splitlines() if line.endswith("is valid.")]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the profiler module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import unittest
+import question
+from profiler import Profiler, MemoryProfiler, merge_statistics, format_statistics, merge_memory_statistics, format_memory_statistics, format_memory_summary
+
+class TestProfiler(unittest.TestCase):
+    QUESTION = {
+        "key": "q1",
+        "title": "Is this a question?",
+        "input": {"type": "polar"},
+        "branch": "_end",
+    }
+
+    def setUp(self):
+        self.profiler = Profiler(["helper", "question"])
+
+    def tearDown(self):
+        self.profiler.disable()
+
+    def test_instrumentation(self):
+        is_question_key = question.is_question_key
+        schema = question.is_question.SCHEMA
+        validators = dict(schema.validators)
+
+        self.profiler.enable()
+        self.assertTrue(self.profiler.enabled)
+        self.assertIsNot(question.is_question_key, is_question_key, "Module functions are instrumented")
+        self.assertIsNot(question.is_question.SCHEMA.validators["key"][0], validators["key"][0], "Schema validators are instrumented")
+        self.assertIs(question.is_question.SCHEMA, schema, "Function attributes are shared")
+
+        self.profiler.disable()
+        self.assertFalse(self.profiler.enabled)
+        self.assertIs(question.is_question_key, is_question_key, "Module functions are restored")
+        self.assertEqual(question.is_question.SCHEMA.validators, validators, "Schema validators are restored")
+
+    def test_statistics(self):
+        self.profiler.enable()
+        self.assertTrue(question.is_question(self.QUESTION, ["en"])[0])
+        self.assertEqual(list(question.iter_question_errors(self.QUESTION, ["en"])), [])
+
+        statistics = self.profiler.reset()
+        self.assertEqual(self.profiler.statistics, {}, "Statistics are cleared")
+        self.assertEqual(statistics["question.is_question"][0], 1)
+        self.assertEqual(statistics["question.iter_question_errors"][0], 1, "A generator is counted once")
+        self.assertEqual(statistics["question.is_question_key"][0], 2)
+        self.assertEqual(statistics["helper.is_configuration_string"][0], 2)
+        for calls, cumulative, self_time in statistics.itervalues():
+            self.assertTrue(0.0 <= self_time <= cumulative)
+
+        total = {}
+        merge_statistics(total, statistics)
+        merge_statistics(total, statistics)
+        self.assertEqual(total["question.is_question_key"][0], 4)
+        self.assertIn("question.is_question_key", format_statistics(total, "Profile:"))
+
+
+
+class TestMemoryProfiler(unittest.TestCase):
+    def test_statistics(self):
+        profiler = MemoryProfiler()
+        configuration = profiler.measure("load", lambda n: {"questionnaire": [{"key": "q{}".format(i)} for i in range(n)]}, 1000)
+        self.assertEqual(len(configuration["questionnaire"]), 1000, "The stage's result is returned")
+        messages = profiler.measure("validation", lambda: [])
+        self.assertEqual(messages, [])
+
+        statistics = profiler.reset()
+        self.assertEqual(profiler.statistics, {}, "Statistics are cleared")
+        self.assertEqual(sorted(statistics.keys()), ["load", "validation"])
+        self.assertGreater(statistics["load"][1], 1000 * 100, "The loaded configuration is retained")
+        self.assertGreater(statistics["load"][1], statistics["validation"][1])
+
+        summary = {}
+        merge_memory_statistics(summary, statistics)
+        merge_memory_statistics(summary, statistics)
+        self.assertEqual(summary["load"][0], 2)
+        self.assertEqual(summary["total"][2], statistics["load"][1] + statistics["validation"][1], "The total retained memory is the sum of its stages")
+        self.assertIn("total", format_memory_summary(summary, "Summary:"))
+
+    def test_forked_peaks(self):
+        profiler = MemoryProfiler()
+        profiler.tracemalloc = None
+        profiler.measure("load", lambda: len(bytearray(64 * 1024 * 1024)))
+        profiler.measure("validation", lambda: [len(bytearray(16 * 1024 * 1024))])
+        statistics = profiler.reset()
+
+        load_peak, load_retained, load_locations = statistics["load"]
+        validation_peak, validation_retained, _ = statistics["validation"]
+        self.assertGreaterEqual(load_peak, 64 * 1024 * 1024, "A stage's peak")
+        self.assertGreaterEqual(validation_peak, 16 * 1024 * 1024, "A stage's peak below an earlier stage's peak")
+        self.assertLess(validation_peak, 64 * 1024 * 1024, "A stage's peak does not include an earlier stage's peak")
+        self.assertLess(load_retained, 1024, "The retained memory is the size of the stage's result")
+        self.assertGreater(validation_retained, load_retained, "The retained memory is the size of the stage's result")
+        self.assertIsNone(load_locations, "Allocations are not located without tracemalloc")
+
+        lines = format_memory_statistics(statistics, "Profile:").splitlines()
+        self.assertEqual(lines[1], "  (tracemalloc is not available: each peak is measured in a forked process, and the retained memory is the size of the stage's result)")
+        self.assertRegexpMatches(lines[2], r"^  load: 6\d\.\d MiB peak, \d+ B retained$")
+        self.assertRegexpMatches(lines[3], r"^  validation: 1\d\.\d MiB peak, \d+ B retained$")
+
+    def test_unknown_peaks(self):
+        statistics = {"load": (None, 100, None), "validation": (50, 10, None)}
+        self.assertIn("  load: peak unavailable, 100 B retained", format_memory_statistics(statistics, "Profile:").splitlines())
+        summary = {}
+        merge_memory_statistics(summary, statistics)
+        self.assertEqual(summary, {"load": [1, None, 100, 100], "validation": [1, 50, 10, 10], "total": [1, 150, 110, 110]})
+        self.assertIn("unavailable", format_memory_summary(summary, "Summary:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -55,6 +55,20 @@ class TestProjectValidator(unittest.TestCase):
             "unknown_key": 42
         })[0], "Unknown key")
 
+    def test_project_configuration_errors(self):
+        self.assertEqual(list(validator.iter_project_configuration_errors({
+            "name": "Demo",
+            "short_name": "demo",
+            "description": "A demo."
+        })), [], "Simple project")
+        errors = list(validator.iter_project_configuration_errors({
+            "name": "",
+            "short_name": "#demo",
+            "unknown_key": 42
+        }))
+        self.assertEqual(len(errors), 4, "Missing description, illegal name and short name, and unknown key")
+        self.assertEqual(errors[0], validator.is_project_configuration({"name": "", "short_name": "#demo", "unknown_key": 42})[1], "The first error is the one reported by is_project_configuration")
+
     def test_valid_project_names(self):
         self.assertTrue(validator.is_project_name("hello")[0], "Valid name")
         self.assertTrue(validator.is_project_name("hello   ")[0], "Valid name with trailing whitespace")
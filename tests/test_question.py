@@ -164,6 +164,18 @@ class TestQuestionValidators(unittest.TestCase):
         self.assertFalse(validator.is_question_branch("")[0], "Empty string")
         self.assertFalse(validator.is_question_branch({})[0], "Empty dictionary")
 
+    def test_branch_target_errors(self):
+        keys = {"start": 0, "stop": 1}
+        self.assertEqual(list(validator.iter_branch_target_errors("q", {"yes": "start", "no": "_end"}, keys)), [], "Question and reserved keys")
+        self.assertEqual(list(validator.iter_branch_target_errors("q", "missing", keys)), [
+            "The question 'q' branches to the unknown question 'missing'.",
+        ], "Unknown question key")
+        self.assertEqual(list(validator.iter_branch_target_errors("q", {"stop": "_stop", "on": "_on"}, keys)), [], "Any reserved key")
+        self.assertEqual(list(validator.iter_branch_target_errors(u"età", "missing", keys)), [
+            u"The question 'età' branches to the unknown question 'missing'.",
+        ], "Non-ASCII question key")
+        self.assertEqual(list(validator.iter_branch_target_errors("q", {"yes": "*", "no": 42}, keys)), [], "Malformed targets are ignored")
+
     def test_valid_question_input(self):
         pass
 
@@ -245,6 +257,14 @@ class TestQuestionValidators(unittest.TestCase):
 
     def test_illegal_multiple_option_inputs(self):
         self.assertFalse(validator.is_question_input({"type": "multiple-option"})[0], "Missing options")
+        self.assertEqual(validator.is_question_input({
+            "type": "multiple-option",
+            "options": [{"label": v, "value": v} for v in ["a", "b", "a", "c", "b", "a"]],
+        }), (False, "The following option values are not unique: 'a' (positions 1, 3, 6), 'b' (positions 2, 5)."), "Duplicate option values")
+        self.assertEqual(validator.is_question_input({
+            "type": "multiple-option",
+            "options": [{"label": v, "value": v} for v in [u"Côte d'Ivoire", u"Mali", u"Côte d'Ivoire"]],
+        }), (False, u"The following option values are not unique: 'Côte d'Ivoire' (positions 1, 3)."), "Non-ASCII duplicate option values")
         self.assertFalse(validator.is_question_input({
             "type": "multiple-option",
             "options": [],
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for schema module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import unittest
+from schema import Schema
+
+is_positive = lambda n: (n > 0, "'{}' is not positive.".format(n))
+is_below = lambda n, limit: (n < limit, "'{}' is not below {}.".format(n, limit))
+
+SCHEMA = Schema(
+    required_fields=frozenset(["a"]),
+    field_validators={
+        "a": is_positive,
+        "b": is_below,
+    },
+    missing_field_message="Missing: '{}'.",
+    unexpected_field_message="Unexpected: '{}'.",
+    contextual_fields=frozenset(["b"])
+)
+
+class TestSchema(unittest.TestCase):
+    def test_valid_configurations(self):
+        self.assertEqual(SCHEMA.validate({"a": 1}), (True, None), "Required field only")
+        self.assertEqual(SCHEMA.validate({"a": 1, "b": 2}, 3), (True, None), "Contextual field")
+        self.assertEqual(list(SCHEMA.iter_errors({"a": 1, "b": 2}, 3)), [], "No errors")
+
+    def test_illegal_configurations(self):
+        self.assertRaises(TypeError, SCHEMA.validate, None)
+        self.assertRaises(TypeError, SCHEMA.validate, [])
+        self.assertRaises(TypeError, SCHEMA.iter_errors, "")
+        self.assertEqual(SCHEMA.validate({}), (False, "Missing: 'a'."), "Missing field")
+        self.assertEqual(SCHEMA.validate({"a": None}), (False, "Missing: 'a'."), "Field set to None")
+        self.assertEqual(SCHEMA.validate({"a": -1}), (False, "'-1' is not positive."), "Invalid field")
+        self.assertEqual(SCHEMA.validate({"a": 1, "b": 4}, 3), (False, "'4' is not below 3."), "Invalid contextual field")
+        self.assertEqual(SCHEMA.validate({"a": 1, "c": 0}), (False, "Unexpected: 'c'."), "Unexpected field")
+
+    def test_configuration_errors(self):
+        self.assertEqual(sorted(SCHEMA.iter_errors({"a": None, "b": 4, "c": 0}, 3)), [
+            "'4' is not below 3.",
+            "Missing: 'a'.",
+            "Unexpected: 'c'.",
+        ])
+
+    def test_field_errors(self):
+        self.assertEqual(list(SCHEMA.iter_field_errors("a", 1)), [], "Valid field")
+        self.assertEqual(list(SCHEMA.iter_field_errors("a", None)), [], "Missing fields are not reported")
+        self.assertEqual(list(SCHEMA.iter_field_errors("b", 4, 3)), ["'4' is not below 3."], "Invalid contextual field")
+        self.assertEqual(list(SCHEMA.iter_field_errors("c", 0)), ["Unexpected: 'c'."], "Unexpected field")
+        self.assertEqual(SCHEMA.get_missing_fields_message({"a": 1}), None, "No missing fields")
+        self.assertEqual(SCHEMA.get_missing_fields_message({"b": 1}), "Missing: 'a'.", "Missing field")
+
+    def test_iterable_field_validators(self):
+        schema = Schema(field_validators={"a": lambda a: ("'{}' is invalid.".format(i) for i in a)})
+        self.assertEqual(schema.validate({"a": []}), (True, None), "Empty error stream")
+        self.assertEqual(schema.validate({"a": [1, 2]}), (False, "'1' is invalid."), "First error")
+        self.assertEqual(list(schema.iter_errors({"a": [1, 2]})), ["'1' is invalid.", "'2' is invalid."], "Every error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains tests that check the modules imported when the validator starts.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SOURCE_DIRECTORY = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+MAIN = os.path.join(SOURCE_DIRECTORY, "__main__.py")
+
+class TestStartup(unittest.TestCase):
+    VALIDATOR_MODULES = ["archive", "cache", "core", "daemon", "helper", "htmlmin", "locator", "matchers", "profiler", "project", "question", "schema", "stream", "task_presenter", "translation", "tutorial", "vcs", "watch"]
+    """The modules that are only needed to validate projects."""
+
+    HEAVY_MODULES = ["multiprocessing", "jsonschema"]
+    """The third-party and standard library modules that are slow to import, and only needed to validate projects."""
+
+    def execute(self, script, *args):
+        """Runs the specified script in a new interpreter and returns its output.
+        """
+        return subprocess.check_output([sys.executable, "-c", script] + list(args), cwd=SOURCE_DIRECTORY)
+
+    def test_registration_imports(self):
+        script = (
+            "import argparse, imp, sys\n"
+            "main = imp.load_source('geotagx_validator_main', sys.argv[1])\n"
+            "main.get_argparser(argparse.ArgumentParser().add_subparsers())\n"
+            "print ' '.join(sys.modules)\n"
+        )
+        modules = set(self.execute(script, MAIN).split())
+        self.assertFalse(modules.intersection(self.VALIDATOR_MODULES), "Registering the validate command does not import the validator")
+        self.assertFalse(modules.intersection(self.HEAVY_MODULES), "Registering the validate command does not import multiprocessing or jsonschema")
+
+    def test_usage_imports(self):
+        script = (
+            "import imp, sys\n"
+            "main = imp.load_source('geotagx_validator_main', sys.argv[1])\n"
+            "sys.argv = [sys.argv[1], '--help']\n"
+            "try:\n"
+            "    main.main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print '\\0', ' '.join(sys.modules)\n"
+        )
+        modules = set(self.execute(script, MAIN).split("\0")[-1].split())
+        self.assertIn("argparse", modules)
+        self.assertFalse(modules.intersection(self.VALIDATOR_MODULES), "The --help option does not import the validator")
+        self.assertFalse(modules.intersection(self.HEAVY_MODULES), "The --help option does not import multiprocessing or jsonschema")
+
+    def test_help_import(self):
+        path = tempfile.mkdtemp()
+        try:
+            configurations = {
+                "project.json": {"name": "Demo", "short_name": "demo", "description": "A demo."},
+                "task_presenter.json": {
+                    "language": {"default": "en", "available": ["en"]},
+                    "subject": {"type": "image"},
+                    "questionnaire": {"questions": [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}}]}
+                },
+            }
+            for filename, configuration in configurations.iteritems():
+                with open(os.path.join(path, filename), "w") as file:
+                    json.dump(configuration, file)
+
+            script = (
+                "import imp, sys\n"
+                "main = imp.load_source('geotagx_validator_main', sys.argv[1])\n"
+                "exit_code = main.run(main.get_argparser().parse_args(['--no-cache', sys.argv[2]]))\n"
+                "print exit_code, 'htmlmin' in sys.modules\n"
+            )
+            self.assertEqual(self.execute(script, MAIN, path).split()[-2:], ["0", "False"], "htmlmin is not imported if there are no help files")
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the stream module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+from StringIO import StringIO
+from core import iter_configuration_set_errors as iter_deserialized_configuration_set_errors
+from helper import deserialize_configuration_set
+from stream import JSONReader, iter_configuration_set_errors
+
+class TestJSONReader(unittest.TestCase):
+    def read(self, reader):
+        """Deserializes the value at the reader's position, one member at a time."""
+        character = reader.peek()
+        if character == "{":
+            return OrderedDict((k, self.read(reader)) for k in reader.iter_object())
+        elif character == "[":
+            return [self.read(reader) for _ in reader.iter_array()]
+        else:
+            return reader.read_value()
+
+    def test_documents(self):
+        document = ' {"a": [1, -2.5e3, true, null], "b": {"c\\"": "d\\u00e9"}, "e": [], "f": {}, "g": 123456789} '
+        for chunk_size in range(1, 8):
+            reader = JSONReader(StringIO(document), chunk_size)
+            self.assertEqual(self.read(reader), json.loads(document, object_pairs_hook=OrderedDict), "Chunk size {}".format(chunk_size))
+            reader.expect_end()
+
+    def test_illegal_documents(self):
+        for document in ['{"a" 1}', '{"a": 1 "b": 2}', '[1 2]', '{1: 2}', '{"a": tru}', '[1] 2']:
+            reader = JSONReader(StringIO(document), 2)
+            self.assertRaises(ValueError, lambda: (self.read(reader), reader.expect_end()))
+
+
+class TestStreamedValidation(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        with open(os.path.join(self.path, "project.json"), "w") as file:
+            file.write(json.dumps({"name": "Demo", "short_name": "demo", "description": "A demo."}))
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def errors(self, task_presenter):
+        with open(os.path.join(self.path, "task_presenter.json"), "w") as file:
+            file.write(task_presenter)
+        return list(iter_configuration_set_errors(self.path))
+
+    def test_valid_configurations(self):
+        self.assertEqual(self.errors('''{
+            "language": {"default": "en", "available": ["en"]},
+            "questionnaire": {"questions": [{"key": "a", "title": "A?", "input": {"type": "polar"}}]}
+        }'''), [], "Valid configuration")
+
+    def test_tutorial_assertion_keys(self):
+        with open(os.path.join(self.path, "tutorial.json"), "w") as file:
+            file.write(json.dumps({"subjects": [{"source": "s", "page": "p", "assertions": {"a": {"expects": "yes"}, "b": {"expects": "no"}}}]}))
+        self.assertEqual(self.errors('''{
+            "language": {"default": "en", "available": ["en"]},
+            "questionnaire": {"questions": [{"key": "a", "title": "A?", "input": {"type": "polar"}}]}
+        }'''), [
+            "The tutorial subject assertion key 'b' does not match any question.",
+        ], "Assertion keys are resolved against the streamed questionnaire")
+
+    def test_illegal_configurations(self):
+        question = '{"key": "a", "title": "A?", "input": {"type": "polar"}}'
+        self.assertEqual(self.errors('{"questionnaire": {"questions": [%s, {"key": "b"}, %s]}}' % (question, question)), [
+            "The question configuration is missing the following field(s): 'input', 'title'.",
+            "The question key 'a' is not unique. It is used by the questions at positions 1, 3.",
+        ], "Invalid question and duplicate key")
+        self.assertEqual(self.errors('{"subject": {"type": "video"}, "questionnaire": {"questions": []}}'), [
+            "The subject type 'video' is not recognized.",
+            "A questionnaire must be a non-empty list of questions.",
+        ], "Errors are reported in order")
+        self.assertEqual(self.errors('{"subject": {"type": "video"}}'), [
+            "The task presenter configuration is missing the following field(s): 'questionnaire'.",
+            "The subject type 'video' is not recognized.",
+        ], "Missing fields are reported first")
+        self.assertEqual(self.errors('''{
+            "questionnaire": {"questions": [{"key": "a", "title": {"en": "A?"}, "input": {"type": "polar"}}]},
+            "language": {"default": "en", "available": ["en", "fr"]}
+        }'''), [
+            "A question title must be a non-empty or normalized string.",
+        ], "Language configuration that follows the questionnaire")
+        self.assertEqual(self.errors('''{
+            "language": {"default": "en", "available": ["en"]},
+            "questionnaire": {"questions": [
+                {"key": "a", "title": "A?", "input": {"type": "polar"}, "branch": {"yes": "b", "no": "c"}},
+                {"key": "b", "title": "B?", "input": {"type": "polar"}, "branch": "_end"}
+            ]}
+        }'''), [
+            "The question 'a' branches to the unknown question 'c'.",
+        ], "Branch targets are resolved once every question has been read")
+        self.assertRaises(ValueError, self.errors, "[]")
+        self.assertRaises(ValueError, self.errors, '{"questionnaire": {"questions": [}}')
+
+    def test_unstreamable_values(self):
+        def report(iter_errors):
+            try:
+                return list(iter_errors())
+            except Exception as e:
+                return "{}: {}".format(type(e).__name__, e)
+
+        language = '"language": {"default": "en", "available": ["en"]}'
+        for value in ['"abc"', "1", "{}", '{"key": "a"}', "null"]:
+            for task_presenter in ['{%s, "questionnaire": {"questions": %s}}' % (language, value), '{%s, "questionnaire": %s}' % (language, value)]:
+                with open(os.path.join(self.path, "task_presenter.json"), "w") as file:
+                    file.write(task_presenter)
+                streamed = report(lambda: iter_configuration_set_errors(self.path))
+                expected = report(lambda: iter_deserialized_configuration_set_errors(deserialize_configuration_set(self.path)))
+                self.assertNotIn("Expecting", str(streamed), task_presenter)
+                self.assertEqual(streamed, expected, "A value that cannot be streamed is reported as it is without --stream: {}".format(task_presenter))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the task_presenter module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import unittest
+import task_presenter as validator
+
+def question(key, branch=None):
+    configuration = {"key": key, "title": "Question?", "input": {"type": "polar"}}
+    if branch is not None:
+        configuration["branch"] = branch
+    return configuration
+
+
+class TestTaskPresenterValidators(unittest.TestCase):
+    def test_question_key_index(self):
+        self.assertEqual(validator.get_question_key_index([question("a"), question("b"), question("a"), 42]), {"a": [0, 2], "b": [1]}, "Positions of each key")
+        self.assertEqual(validator.get_question_key_index(None), {}, "No questions")
+        self.assertEqual(validator.get_questions({"questionnaire": {"questions": [question("a")]}}), [question("a")], "List of questions")
+        self.assertIsNone(validator.get_questions({"questionnaire": None}), "No questionnaire")
+
+    def test_duplicate_question_keys(self):
+        self.assertEqual(list(validator.are_questions([question("a"), question("b"), question("c")])), [], "Unique keys")
+        self.assertEqual(list(validator.are_questions([question("b"), question("a"), question("b"), question("a"), question("b")])), [
+            "The question key 'b' is not unique. It is used by the questions at positions 1, 3, 5.",
+            "The question key 'a' is not unique. It is used by the questions at positions 2, 4.",
+        ], "Every duplicate is reported with its positions")
+        self.assertIn(
+            u"The question key 'età' is not unique. It is used by the questions at positions 1, 2.",
+            list(validator.are_questions([question(u"età"), question(u"età")])),
+            "Non-ASCII duplicate key"
+        )
+
+    def test_valid_branch_graphs(self):
+        self.assertEqual(list(validator.are_questions([question("a"), question("b"), question("c")])), [], "Sequential questions")
+        self.assertEqual(list(validator.are_questions([
+            question("a", {"yes": "b", "no": "c"}),
+            question("b", "_end"),
+            question("c"),
+        ])), [], "Branching questions")
+
+    def test_illegal_branch_graphs(self):
+        self.assertEqual(list(validator.are_questions([
+            question("a", {"yes": "b", "no": "c"}),
+            question("b", "a"),
+            question("c", "_end"),
+        ])), [
+            "The following questions form a branch cycle: 'a', 'b'.",
+        ], "Cycle")
+        self.assertEqual(list(validator.are_questions([
+            question("a", "_end"),
+            question("b", "b"),
+        ])), [
+            "The following questions form a branch cycle: 'b'.",
+            "The question 'b' cannot be reached from the first question.",
+            "The question 'b' never leads to the end of the questionnaire.",
+        ], "Unreachable question that branches to itself")
+        self.assertEqual(list(validator.are_questions([
+            question("a", "z"),
+            question("b"),
+        ])), [
+            "The question 'a' branches to the unknown question 'z'.",
+        ], "Unknown target")
+        self.assertEqual(list(validator.are_questions([
+            question("a"),
+            question("a", "_end"),
+            question("b"),
+        ])), [
+            "The question key 'a' is not unique. It is used by the questions at positions 1, 2.",
+            "The question 'b' cannot be reached from the first question.",
+        ], "A question leads to the question at the following position, even if its key is a duplicate")
+        errors = list(validator.are_questions([question("a"), {"title": "Question?", "input": {"type": "polar"}}, question("b", "a")]))
+        self.assertEqual(errors[-3:], [
+            "The following questions form a branch cycle: 'a', 'b'.",
+            "The question 'a' never leads to the end of the questionnaire.",
+            "The question 'b' never leads to the end of the questionnaire.",
+        ], "A question without a key is part of the graph")
+
+    def test_branch_graph_errors(self):
+        self.assertEqual(list(validator.iter_branch_graph_errors([("a", {"yes": "x", "no": "_end"}), ("b", None)])), [], "A question with an unresolved target may lead anywhere")
+        self.assertEqual(list(validator.iter_branch_graph_errors([("a", {"yes": "_stop", "no": "_end"}), ("b", None)])), [
+            "The question 'b' cannot be reached from the first question.",
+        ], "Every reserved key leads out of the questionnaire")
+        self.assertEqual(list(validator.iter_branch_graph_errors([("a", "_st*p"), ("b", None)])), [], "A malformed reserved key is unresolved")
+        self.assertEqual(list(validator.iter_branch_graph_errors([("a", "_end"), ("b", "x"), ("c", "b")])), [
+            "The question 'b' cannot be reached from the first question.",
+            "The question 'c' cannot be reached from the first question.",
+        ], "An unreachable question with an unresolved target")
+        self.assertEqual(list(validator.iter_branch_graph_errors([(u"età", u"età")])), [
+            u"The following questions form a branch cycle: 'età'.",
+            u"The question 'età' never leads to the end of the questionnaire.",
+        ], "Non-ASCII keys")
+        count = 10000
+        branches = [("q{}".format(i), "q{}".format(i + 1)) for i in xrange(count)]
+        branches[-1] = (branches[-1][0], "_end")
+        self.assertEqual(list(validator.iter_branch_graph_errors(branches)), [], "Deep chain")
+        self.assertEqual(list(validator.iter_branch_graph_errors([])), [], "No questions")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the translation module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+from translation import TranslationMatrix, get_translation_matrix, iter_configuration_strings, merge_translation_statistics, format_translation_matrix
+
+class TestTranslationMatrix(unittest.TestCase):
+    def setUp(self):
+        self.configurations = {
+            "task_presenter": {
+                "language": {"default": "en", "available": ["en", "fr"]},
+                "questionnaire": {"questions": [
+                    {"key": "a", "title": OrderedDict([("en", "A?"), ("fr", "A ?")]), "hint": "Look.", "input": {"type": "polar"}},
+                    {"key": "b", "title": {"en": "B?", "fr": " ", "de": "B?"}, "input": {
+                        "type": "multiple-option",
+                        "options": [{"label": {"en": "Yes"}, "value": "yes"}, {"label": 42, "value": "no"}],
+                    }},
+                ]},
+            },
+            "tutorial": {
+                "default-message": {"on-wrong-answer": {"en": "Wrong.", "fr": "Faux."}},
+                "subjects": [{"source": "s", "page": "p", "assertions": {"a": {"expects": "yes", "messages": {"on-wrong-answer": {"fr": "Non."}}}}}],
+            },
+        }
+
+    def test_configuration_strings(self):
+        self.assertEqual([path for path, _ in iter_configuration_strings(self.configurations)], [
+            "task_presenter.questionnaire.questions[0].title",
+            "task_presenter.questionnaire.questions[0].hint",
+            "task_presenter.questionnaire.questions[1].title",
+            "task_presenter.questionnaire.questions[1].input.options[0].label",
+            "tutorial.default-message.on-wrong-answer",
+            "tutorial.subjects[0].assertions.a.messages.on-wrong-answer",
+        ], "Fields that are not configuration strings are skipped")
+
+    def test_translation_matrix(self):
+        matrix = get_translation_matrix(self.configurations)
+        self.assertEqual(matrix.languages, ["en", "fr"], "Available languages")
+        self.assertEqual(matrix.count("en"), (5, 0, 1), "English translations")
+        self.assertEqual(matrix.count("fr"), (3, 1, 2), "French translations")
+        self.assertAlmostEqual(matrix.get_completion("fr"), 50.0)
+        self.assertEqual(list(matrix.iter_missing_paths("fr")), [
+            "task_presenter.questionnaire.questions[0].hint",
+            "task_presenter.questionnaire.questions[1].input.options[0].label",
+        ], "A plain string is only written in the default language")
+        self.assertEqual(list(matrix.iter_empty_paths("fr")), ["task_presenter.questionnaire.questions[1].title"])
+        self.assertRaises(KeyError, matrix.count, "de")
+
+    def test_discovered_languages(self):
+        matrix = TranslationMatrix()
+        for i in range(10):
+            matrix.add("p{}".format(i), {"en": "?"})
+        matrix.add("q", {"fr": "?", "en": ""})
+        self.assertEqual(matrix.languages, ["en", "fr"], "Languages are added as they are found")
+        self.assertEqual(matrix.count("en"), (10, 1, 0))
+        self.assertEqual(list(matrix.iter_missing_paths("fr")), ["p{}".format(i) for i in range(10)])
+        self.assertEqual(TranslationMatrix(["en"]).get_completion("en"), 100.0, "A matrix without fields is complete")
+
+    def test_non_ascii_paths(self):
+        self.configurations["tutorial"]["subjects"][0]["assertions"] = {u"et\u00e0": {"messages": {u"r\u00e9ponse": {"en": "No."}}}}
+        matrix = get_translation_matrix(self.configurations)
+        path = u"tutorial.subjects[0].assertions.et\u00e0.messages.r\u00e9ponse"
+        self.assertIn(path, list(matrix.iter_missing_paths("fr")), "Non-ASCII keys")
+        self.assertIn(u"    - " + path, format_translation_matrix(matrix, "Coverage:").splitlines(), "Non-ASCII report")
+
+    def test_help_files(self):
+        from helper import deserialize_configuration_set
+        directory = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(directory, "help"))
+            for key in ["project", "task_presenter"]:
+                with open(os.path.join(directory, key + ".json"), "w") as file:
+                    json.dump(self.configurations[key] if key in self.configurations else {}, file)
+            with open(os.path.join(directory, "help", "a.html"), "w") as file:
+                file.write("<p>Help</p>")
+            configurations = deserialize_configuration_set(directory)
+            self.assertEqual(configurations["task_presenter"]["questionnaire"]["questions"][0]["help"], "<p>Help</p>")
+            matrix = get_translation_matrix(configurations)
+            self.assertNotIn("task_presenter.questionnaire.questions[0].help", matrix.paths, "Help files are not localized")
+        finally:
+            shutil.rmtree(directory)
+
+        self.configurations["task_presenter"]["questionnaire"]["questions"][0]["help"] = {"en": "Help.", "fr": "Aide."}
+        self.assertEqual(get_translation_matrix(self.configurations).count("fr"), (4, 1, 2), "A normalized help is counted")
+
+    def test_batch_summary(self):
+        summary = {}
+        for _ in range(3):
+            merge_translation_statistics(summary, get_translation_matrix(self.configurations))
+        self.assertEqual(summary, {"en": [3, 15, 0, 3, 0], "fr": [3, 9, 3, 6, 0]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,4 +29,12 @@ import unittest
 import tutorial as validator
 
 class TestTutorialValidators(unittest.TestCase):
-    pass
+    def test_assertion_keys(self):
+        task_presenter = {"questionnaire": {"questions": [{"key": "ready", "title": "Ready?", "input": {"type": "polar"}}]}}
+        tutorial = {"subjects": [{"source": "s", "page": "p", "assertions": {"ready": {"expects": "yes"}}}]}
+        self.assertEqual(list(validator.iter_tutorial_configuration_errors(tutorial, task_presenter)), [], "Known question key")
+        tutorial["subjects"][0]["assertions"]["steady"] = {"expects": "no"}
+        self.assertEqual(list(validator.iter_tutorial_configuration_errors(tutorial, task_presenter)), [
+            "The tutorial subject assertion key 'steady' does not match any question.",
+        ], "Unknown question key")
+        self.assertEqual(list(validator.iter_tutorial_configuration_errors(tutorial, task_presenter, False, {"ready": 0, "steady": 1})), [], "Question key index")
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the vcs module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from distutils.spawn import find_executable
+from vcs import get_changed_projects, get_changed_files
+
+@unittest.skipUnless(find_executable("git"), "git is not installed")
+class TestChangedProjects(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.realpath(tempfile.mkdtemp())
+        self.git("init", "-q")
+        for project in ["a", "b", os.path.join("c", "d")]:
+            os.makedirs(os.path.join(self.path, project, "help"))
+            for filename in ["project.json", "task_presenter.json"]:
+                self.write(os.path.join(project, filename), "{}")
+        self.write("README.md", "Projects")
+        self.git("add", "--all")
+        self.git("commit", "-q", "-m", "Add projects")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def git(self, *arguments):
+        with open(os.devnull, "w") as devnull:
+            subprocess.check_call(["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"] + list(arguments), cwd=self.path, stdout=devnull)
+
+    def write(self, filename, data):
+        with open(os.path.join(self.path, filename), "w") as file:
+            file.write(data)
+
+    def test_changed_projects(self):
+        self.assertEqual(get_changed_projects([self.path], "HEAD"), [], "Unmodified repository")
+
+        self.write(os.path.join("a", "help", "q1.html"), "<p>Help</p>")
+        self.write(os.path.join("c", "d", "project.json"), "[]")
+        self.write("README.md", "Modified")
+        self.git("add", os.path.join("a", "help", "q1.html"))
+        self.git("add", "README.md")
+
+        projects = [os.path.join(self.path, p) for p in ["a", os.path.join("c", "d")]]
+        self.assertEqual(get_changed_projects([self.path], "HEAD"), projects, "Files that are not in a project are ignored")
+        self.assertEqual(get_changed_projects([self.path], staged=True), projects[:1], "Staged files")
+        self.assertEqual(get_changed_projects([self.path]), projects[1:], "Unstaged files")
+        self.assertEqual(get_changed_projects([os.path.join(self.path, "c")], "HEAD"), projects[1:], "Projects outside the paths are ignored")
+
+        self.git("commit", "-q", "-m", "Modify a project")
+        self.assertEqual(get_changed_projects([self.path], "HEAD~1", staged=True), projects[:1], "Commit range")
+
+    def test_changed_files(self):
+        self.git("mv", os.path.join("b", "project.json"), os.path.join("b", "help", "project.json"))
+        files = sorted(get_changed_files(os.path.join(self.path, "b"), "HEAD", True))
+        self.assertEqual(files, [os.path.join(self.path, "b", f) for f in [os.path.join("help", "project.json"), "project.json"]], "Renamed files")
+        self.assertEqual(get_changed_projects([self.path], "HEAD", True), [], "A project that is no longer complete is ignored")
+
+    def test_illegal_repositories(self):
+        directory = tempfile.mkdtemp()
+        try:
+            self.assertRaises(IOError, get_changed_projects, [directory], "HEAD")
+        finally:
+            shutil.rmtree(directory)
+        self.assertRaises(IOError, get_changed_projects, [self.path], "unknown-revision")
+        self.assertRaises(TypeError, get_changed_projects, self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# This module is part of the GeoTag-X project sanitizer tool.
+# It contains unit tests for the watch module.
+#
+# Author: Jeremy Othieno (j.othieno@gmail.com)
+#
+# Copyright (c) 2016-2017 UNITAR/UNOSAT
+#
+# The MIT License (MIT)
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from watch import ProjectWatcher
+
+class TestProjectWatcher(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.path, "help"))
+        self.write("project.json", {
+            "name": "Demo",
+            "short_name": "demo",
+            "description": "A demo."
+        })
+        self.write("task_presenter.json", {
+            "language": {"default": "en", "available": ["en"]},
+            "subject": {"type": "image"},
+            "questionnaire": {"questions": [{"key": "q1", "title": "Is it?", "input": {"type": "polar"}}]}
+        })
+        self.write("help/q1.html", "<p>  Help  <!-- Comment --> </p>")
+        self.watcher = ProjectWatcher(self.path, max_errors=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, filename, data):
+        filename = os.path.join(self.path, filename)
+        with open(filename, "w") as file:
+            file.write(data if isinstance(data, str) else json.dumps(data))
+        self.touch(filename)
+
+    def touch(self, filename):
+        # Make sure the modification is detected even if the file system's timestamps are coarse.
+        status = os.stat(filename)
+        os.utime(filename, (status.st_atime, status.st_mtime + 1))
+
+    def test_initial_poll(self):
+        self.assertEqual(self.watcher.poll(), {"project", "task_presenter", "tutorial"}, "Every configuration is validated")
+        self.assertEqual(list(self.watcher.iter_errors()), [], "Valid project")
+        self.assertEqual(self.watcher.configurations["task_presenter"]["questionnaire"]["questions"][0]["help"], "<p> Help </p>", "Minified help")
+        self.assertEqual(self.watcher.poll(), set(), "Unmodified project")
+
+    def test_modified_files(self):
+        self.watcher.poll()
+        self.write("project.json", {"name": "", "short_name": "demo", "description": "A demo."})
+        self.assertEqual(self.watcher.poll(), {"project"}, "Modified project configuration")
+        self.assertEqual(len(list(self.watcher.iter_errors())), 1, "Illegal project name")
+
+        self.write("help/q1.html", "<p>Other help</p>")
+        self.assertEqual(self.watcher.poll(), {"task_presenter", "tutorial"}, "Modified help")
+        self.assertEqual(self.watcher.configurations["task_presenter"]["questionnaire"]["questions"][0]["help"], "<p>Other help</p>", "Reloaded help")
+
+        self.write("task_presenter.json", "{")
+        self.watcher.poll()
+        self.assertRaises(ValueError, self.watcher.iter_errors)
+
+    def test_help_files(self):
+        self.watcher.poll()
+        question = lambda: self.watcher.configurations["task_presenter"]["questionnaire"]["questions"][0]
+        os.remove(os.path.join(self.path, "help", "q1.html"))
+        self.touch(os.path.join(self.path, "help"))
+        self.assertEqual(self.watcher.poll(), {"task_presenter", "tutorial"}, "Removed help")
+        self.assertNotIn("help", question(), "The help was removed")
+
+        self.write("help/q1.html", "<p>New help</p>")
+        self.touch(os.path.join(self.path, "help"))
+        self.assertEqual(self.watcher.poll(), {"task_presenter", "tutorial"}, "Created help")
+        self.assertEqual(question()["help"], "<p>New help</p>", "The help was added")
+
+    def test_non_ascii_keys(self):
+        self.write("task_presenter.json", {
+            "language": {"default": "en", "available": ["en"]},
+            "subject": {"type": "image"},
+            "questionnaire": {"questions": [{"key": u"et\u00e0", "title": "Is it?", "input": {"type": "polar"}}]}
+        })
+        self.write(u"help/et\u00e0.html".encode("utf-8"), "<p>Help</p>")
+        self.watcher.poll()
+        self.assertEqual(self.watcher.configurations["task_presenter"]["questionnaire"]["questions"][0]["help"], "<p>Help</p>", "Help of a non-ASCII key")
+        self.assertEqual(len(list(self.watcher.iter_errors())), 1, "Illegal question key")
+
+
+if __name__ == "__main__":
+    unittest.main()